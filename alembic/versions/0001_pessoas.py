@@ -0,0 +1,42 @@
+"""tabela pessoas
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18 00:00:00
+
+Schema original da tabela, o mesmo dos bancos criados antes das migrações
+(via Base.metadata.create_all): marque-os com `alembic stamp 0001` antes
+do upgrade. Os índices adicionados depois vêm na 0001a.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0001"
+down_revision: Union[str, Sequence[str], None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "pessoas",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("nome", sa.String(100), nullable=False),
+        sa.Column("celular", sa.String(20), nullable=True),
+        sa.Column("cpf", sa.String(14), nullable=True),
+        sa.Column("data_nascimento", sa.Date(), nullable=True),
+        sa.Column("flag", sa.String(1), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sqlite_autoincrement=True,
+    )
+    op.create_index("ix_pessoas_id", "pessoas", ["id"])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("pessoas")
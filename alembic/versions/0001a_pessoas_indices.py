@@ -0,0 +1,35 @@
+"""índices da paginação por cursor e do upsert por CPF
+
+Revision ID: 0001a
+Revises: 0001
+Create Date: 2026-10-18 00:00:00
+
+Ausentes nos bancos do schema original (marcados com `alembic stamp 0001`).
+Criados com IF NOT EXISTS: bancos migrados por uma versão anterior da
+0001, que já os criava, passam direto. CPFs repetidos violam o índice
+único ix_pessoas_cpf: resolva as duplicatas antes de aplicar esta migração.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0001a"
+down_revision: Union[str, Sequence[str], None] = "0001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # paginação por cursor ordenada por (created_at, id)
+    op.create_index("ix_pessoas_created_at_id", "pessoas", ["created_at", "id"], if_not_exists=True)
+    # chave do ON CONFLICT (cpf) do upsert em lote
+    op.create_index("ix_pessoas_cpf", "pessoas", ["cpf"], unique=True, if_not_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_pessoas_cpf", table_name="pessoas", if_exists=True)
+    op.drop_index("ix_pessoas_created_at_id", table_name="pessoas", if_exists=True)
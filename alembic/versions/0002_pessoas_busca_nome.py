@@ -0,0 +1,93 @@
+"""busca por nome (prefixo normalizado + trigram)
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18 00:00:00
+
+O índice trigram só é criado se a extensão pg_trgm estiver disponível e
+puder ser instalada (em Postgres gerenciados, CREATE EXTENSION pode exigir
+permissão); sem ele a busca fica só por prefixo.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from src.core.pessoas.normalization import normalize_nome
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0002"
+down_revision: Union[str, Sequence[str], None] = "0001a"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH_SIZE = 5000
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column("pessoas", sa.Column("nome_busca", sa.String(100), nullable=True))
+
+    # preenche em lotes com a mesma normalização usada pela aplicação
+    bind = op.get_bind()
+    pessoas = sa.table("pessoas", sa.column("id"), sa.column("nome"), sa.column("nome_busca"))
+    last_id = 0
+    while True:
+        rows = bind.execute(
+            sa.select(pessoas.c.id, pessoas.c.nome)
+            .where(pessoas.c.id > last_id)
+            .order_by(pessoas.c.id)
+            .limit(BATCH_SIZE)
+        ).all()
+        if not rows:
+            break
+        bind.execute(
+            pessoas.update()
+            .where(pessoas.c.id == sa.bindparam("b_id"))
+            .values(nome_busca=sa.bindparam("b_nome_busca")),
+            [{"b_id": row.id, "b_nome_busca": normalize_nome(row.nome)} for row in rows],
+        )
+        last_id = rows[-1].id
+
+    op.create_index(
+        "ix_pessoas_nome_busca",
+        "pessoas",
+        ["nome_busca"],
+        postgresql_ops={"nome_busca": "text_pattern_ops"},
+    )
+    if not _create_trgm_extension(bind):
+        # sem pg_trgm (ex.: SQLite): a busca fica só por prefixo
+        return
+    op.create_index(
+        "ix_pessoas_nome_busca_trgm",
+        "pessoas",
+        ["nome_busca"],
+        postgresql_using="gin",
+        postgresql_ops={"nome_busca": "gin_trgm_ops"},
+    )
+
+
+def _create_trgm_extension(bind) -> bool:
+    if bind.dialect.name != "postgresql":
+        return False
+    available = bind.execute(
+        sa.text("SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm'")
+    ).first()
+    if available is None:
+        return False
+    try:
+        # em um savepoint: sem permissão, a migração segue sem o índice
+        with bind.begin_nested():
+            bind.execute(sa.text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+    except sa.exc.DBAPIError:
+        return False
+    return True
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name == "postgresql":
+        op.drop_index("ix_pessoas_nome_busca_trgm", table_name="pessoas", if_exists=True)
+    op.drop_index("ix_pessoas_nome_busca", table_name="pessoas")
+    op.drop_column("pessoas", "nome_busca")
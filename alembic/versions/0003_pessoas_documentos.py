@@ -0,0 +1,40 @@
+"""cpf e celular só com dígitos, celular indexado
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18 00:00:00
+
+CPFs que ficarem repetidos depois da normalização violam o índice único
+ix_pessoas_cpf: resolva as duplicatas antes de aplicar esta migração.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0003"
+down_revision: Union[str, Sequence[str], None] = "0002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # bancos SQLite são criados já na versão atual da aplicação, que grava
+    # os documentos normalizados: só o Postgres tem dados antigos
+    if op.get_bind().dialect.name == "postgresql":
+        op.execute(
+            r"""
+            UPDATE pessoas
+            SET cpf = NULLIF(regexp_replace(cpf, '\D', '', 'g'), ''),
+                celular = NULLIF(regexp_replace(celular, '\D', '', 'g'), '')
+            WHERE cpf ~ '\D' OR celular ~ '\D'
+            """
+        )
+    op.create_index("ix_pessoas_celular", "pessoas", ["celular"])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_pessoas_celular", table_name="pessoas")
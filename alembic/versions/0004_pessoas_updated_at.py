@@ -0,0 +1,33 @@
+"""updated_at das pessoas (ETag/Last-Modified)
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0004"
+down_revision: Union[str, Sequence[str], None] = "0003"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column("pessoas", sa.Column("updated_at", sa.DateTime(), nullable=True))
+    # linhas existentes: a última versão conhecida é a da criação
+    op.execute("UPDATE pessoas SET updated_at = created_at")
+    # batch: no SQLite a tabela é recriada; no Postgres vira um ALTER comum
+    with op.batch_alter_table("pessoas", table_kwargs={"sqlite_autoincrement": True}) as batch_op:
+        batch_op.alter_column("updated_at", existing_type=sa.DateTime(), nullable=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("pessoas", "updated_at")
@@ -0,0 +1,52 @@
+"""feed de mudanças: versão das pessoas e tombstones
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18 00:00:00
+
+Linhas existentes ficam com versao 0: aparecem na primeira sincronização
+(sem token) e depois só quando forem alteradas.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0005"
+down_revision: Union[str, Sequence[str], None] = "0004"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "pessoas",
+        sa.Column("versao", sa.BigInteger(), server_default="0", nullable=False),
+    )
+    op.create_index("ix_pessoas_versao_id", "pessoas", ["versao", "id"])
+    op.create_table(
+        "pessoas_removidas",
+        sa.Column("pessoa_id", sa.Integer(), primary_key=True),
+        sa.Column("versao", sa.BigInteger(), nullable=False),
+        sa.Column("removida_em", sa.DateTime(), nullable=False),
+    )
+    op.create_index(
+        "ix_pessoas_removidas_versao_id", "pessoas_removidas", ["versao", "pessoa_id"]
+    )
+    op.create_table(
+        "pessoas_versao",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("valor", sa.BigInteger(), nullable=False),
+    )
+    op.execute("INSERT INTO pessoas_versao (id, valor) VALUES (1, 0)")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("pessoas_versao")
+    op.drop_table("pessoas_removidas")
+    op.drop_index("ix_pessoas_versao_id", table_name="pessoas")
+    op.drop_column("pessoas", "versao")
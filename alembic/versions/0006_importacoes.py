@@ -0,0 +1,60 @@
+"""jobs de importação de CSV
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-18 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0006"
+down_revision: Union[str, Sequence[str], None] = "0005"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "importacoes",
+        sa.Column("id", sa.String(32), primary_key=True),
+        sa.Column("arquivo", sa.String(255), nullable=False),
+        sa.Column("caminho", sa.String(1024), nullable=False),
+        sa.Column("on_conflict", sa.String(20), nullable=True),
+        sa.Column("status", sa.String(10), nullable=False),
+        sa.Column("total_estimado", sa.Integer(), nullable=True),
+        sa.Column("processadas", sa.Integer(), nullable=False),
+        sa.Column("criadas", sa.Integer(), nullable=False),
+        sa.Column("atualizadas", sa.Integer(), nullable=False),
+        sa.Column("rejeitadas", sa.Integer(), nullable=False),
+        sa.Column("erro", sa.String(1000), nullable=True),
+        sa.Column("worker", sa.String(64), nullable=True),
+        sa.Column("lease_until", sa.DateTime(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("started_at", sa.DateTime(), nullable=True),
+        sa.Column("finished_at", sa.DateTime(), nullable=True),
+    )
+    op.create_index("ix_importacoes_status", "importacoes", ["status"])
+    op.create_table(
+        "importacao_rejeicoes",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("importacao_id", sa.String(32), nullable=False),
+        sa.Column("linha", sa.Integer(), nullable=False),
+        sa.Column("motivo", sa.String(500), nullable=False),
+    )
+    op.create_index(
+        "ix_importacao_rejeicoes_importacao_linha",
+        "importacao_rejeicoes",
+        ["importacao_id", "linha"],
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("importacao_rejeicoes")
+    op.drop_table("importacoes")
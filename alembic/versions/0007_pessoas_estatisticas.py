@@ -0,0 +1,53 @@
+"""estatísticas de pessoas mantidas incrementalmente
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-18 00:00:00
+
+Os contadores são preenchidos a partir das linhas existentes; um lock
+SHARE na tabela de pessoas segura as escritas durante o preenchimento.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0007"
+down_revision: Union[str, Sequence[str], None] = "0006"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "pessoas_estatisticas",
+        sa.Column("dimensao", sa.String(20), primary_key=True),
+        sa.Column("chave", sa.String(20), primary_key=True),
+        sa.Column("total", sa.BigInteger(), nullable=False),
+    )
+    if op.get_bind().dialect.name == "postgresql":
+        op.execute("LOCK TABLE pessoas IN SHARE MODE")
+        mes, dia = "to_char(data_nascimento, 'YYYY-MM')", "to_char(created_at, 'YYYY-MM-DD')"
+    else:
+        # SQLite: a transação da migração já é a única escritora
+        mes, dia = "strftime('%Y-%m', data_nascimento)", "strftime('%Y-%m-%d', created_at)"
+    op.execute(
+        f"""
+        INSERT INTO pessoas_estatisticas (dimensao, chave, total)
+        SELECT 'total', '', count(*) FROM pessoas
+        UNION ALL
+        SELECT 'flag', coalesce(flag, ''), count(*) FROM pessoas GROUP BY 2
+        UNION ALL
+        SELECT 'nascimento', coalesce({mes}, ''), count(*) FROM pessoas GROUP BY 2
+        UNION ALL
+        SELECT 'criacao', {dia}, count(*) FROM pessoas GROUP BY 2
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("pessoas_estatisticas")
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Compara dois resultados de benchmarks/run.py e aponta regressões.
+
+Uso:
+    python -m benchmarks.compare antes.json depois.json [--threshold 0.10]
+
+Sai com código 1 se algum p50/p95/p99 piorar mais que o limite.
+"""
+
+import argparse
+import json
+import sys
+from typing import Dict
+
+METRICS = ("p50_ms", "p95_ms", "p99_ms")
+
+
+def load(path: str) -> Dict[str, Dict[str, float]]:
+    with open(path) as f:
+        report = json.load(f)
+    return {
+        f"{section}.{name}": values
+        for section in ("http", "micro")
+        for name, values in report.get(section, {}).items()
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("before")
+    parser.add_argument("after")
+    parser.add_argument("--threshold", type=float, default=0.10, help="piora relativa tolerada")
+    args = parser.parse_args()
+
+    before, after = load(args.before), load(args.after)
+    regressions = 0
+    print(f"{'cenário':40} {'métrica':8} {'antes':>10} {'depois':>10} {'delta':>8}")
+    for name in sorted(before.keys() & after.keys()):
+        for metric in METRICS:
+            old, new = before[name].get(metric), after[name].get(metric)
+            if not old or new is None:
+                continue
+            delta = (new - old) / old
+            flag = ""
+            if delta > args.threshold:
+                flag = "  <-- regressão"
+                regressions += 1
+            print(f"{name:40} {metric:8} {old:10.2f} {new:10.2f} {delta:+8.1%}{flag}")
+    for name in sorted(before.keys() ^ after.keys()):
+        print(f"{name:40} presente em só uma das rodadas")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,342 @@
+#!/usr/bin/env python3
+"""
+Benchmark reprodutível da API de pessoas.
+
+Executa o app de src.main.create_app no próprio processo (httpx +
+ASGITransport, sem rede), semeia o banco com o volume pedido e mede vazão e latência
+p50/p95/p99 de cada endpoint de pessoas_router.py, além de
+micro-benchmarks do PessoaRepository e de decode_access_token.
+O resultado vai para JSON; compare duas rodadas com benchmarks/compare.py.
+
+Uso:
+    BENCH_DATABASE_URL=postgresql://... python -m benchmarks.run --rows 100000
+
+ATENÇÃO: use um banco descartável; o benchmark grava e apaga pessoas.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+from datetime import date, datetime
+from typing import Any, Dict, List
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, ROOT)
+
+# Settings e caches leem o ambiente uma vez por processo: define antes de importar src.*
+if os.getenv("BENCH_DATABASE_URL"):
+    os.environ["DATABASE_URL"] = os.environ["BENCH_DATABASE_URL"]
+os.environ.setdefault("JWT_SECRET", "benchmark-secret")
+
+import httpx
+import jwt
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+from sqlalchemy import func, select
+
+from benchmarks.stats import measure, measure_sync
+from src.application.pagination import encode_change_token
+from src.application.pessoas_service import pessoas_cache
+from src.core.pessoas.entity import Pessoa
+from src.core.pessoas.model import Base, PessoaModel
+from src.infrastructure.auth import jwt_utils
+from src.infrastructure.db.repositories.pessoas import UPSERT_MAX_ROWS, PessoaRepository
+from src.infrastructure.db.session import dispose_engines, get_engine, session_factory
+from src.main import create_app
+from src.presentation.schemas.pessoas import PessoaRead
+from src.presentation.serialization import render_pessoas
+
+PRESETS = {"small": 1_000, "medium": 100_000, "large": 1_000_000}
+# linhas por transação da semeadura: um INSERT dentro do limite de parâmetros
+SEED_BATCH = UPSERT_MAX_ROWS
+CPF_BASE = 90_000_000_000
+
+
+def mint_token(user_id: int = 1, superuser: bool = False) -> str:
+    payload = {
+        "id": user_id,
+        "email": f"bench{user_id}@example.com",
+        "isSuperUser": superuser,
+        "exp": int(time.time()) + 3600,
+    }
+    return jwt.encode(payload, jwt_utils.jwt_secret(), algorithm=jwt_utils.ALGORITHM)
+
+
+def seed_pessoa(i: int) -> Pessoa:
+    return Pessoa(
+        nome=f"Pessoa Benchmark {i}",
+        cpf=str(CPF_BASE + i),
+        celular=f"1199{i:07d}",
+        data_nascimento=date(1950 + i % 60, 1 + i % 12, 1 + i % 28),
+        flag="C" if i % 2 else "F",
+    )
+
+
+async def seed(rows: int) -> Dict[str, int]:
+    """Garante pelo menos `rows` pessoas semeadas; devolve o intervalo de ids."""
+    async with get_engine().begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    async with session_factory()() as session:
+        existing = await session.scalar(select(func.count()).select_from(PessoaModel))
+        repo = PessoaRepository(session)
+        for start in range(existing, rows, SEED_BATCH):
+            batch = [seed_pessoa(i) for i in range(start, min(rows, start + SEED_BATCH))]
+            await repo.bulk_upsert(batch, batch_size=SEED_BATCH)
+            print(f"  semeadas {start + len(batch)}/{rows}", file=sys.stderr)
+        min_id, max_id, total, max_versao = (
+            await session.execute(
+                select(
+                    func.min(PessoaModel.id),
+                    func.max(PessoaModel.id),
+                    func.count(),
+                    func.max(PessoaModel.versao),
+                )
+            )
+        ).one()
+    return {"min_id": min_id, "max_id": max_id, "total": total, "max_versao": max_versao}
+
+
+async def http_benchmarks(args, ids: Dict[str, int]) -> Dict[str, Any]:
+    headers = {"Authorization": f"Bearer {mint_token()}"}
+    transport = httpx.ASGITransport(app=create_app())
+    results: Dict[str, Any] = {}
+    rnd = random.Random(args.seed)
+    total = ids["total"]
+
+    def random_id() -> int:
+        return rnd.randint(ids["min_id"], ids["max_id"])
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", headers=headers) as client:
+
+        # respostas 429/503 do controle de admissão, por cenário
+        rejected = {"total": 0}
+
+        async def check(response: httpx.Response) -> httpx.Response:
+            if response.status_code in (429, 503) and "Retry-After" in response.headers:
+                rejected["total"] += 1
+                return response
+            if response.status_code >= 500:
+                raise RuntimeError(f"{response.request.url}: {response.status_code} {response.text}")
+            return response
+
+        hot_ids = [random_id() for _ in range(10)]
+        page = {"limit": args.page_size}
+        deep_skip = max(0, total - args.page_size)
+        # cursor que aponta para a última página (mesmas linhas do deep offset)
+        previous = await client.get("/pessoas/", params={"skip": max(0, deep_skip - args.page_size), **page})
+        deep_cursor = previous.headers.get("X-Next-Cursor")
+        # ETags já conhecidos pelo cliente, para os GETs condicionais (304)
+        hot_etags = {i: (await client.get(f"/pessoas/{i}")).headers.get("ETag", "") for i in hot_ids}
+        page_etag = (await client.get("/pessoas/", params=page)).headers.get("ETag", "")
+        # token do fim da semeadura: o feed só traz o que os cenários gravaram
+        changes_token = encode_change_token(ids["max_versao"] or 0, ids["max_id"] or 0)
+
+        async def get_cold(i):
+            pessoas_cache.backend.clear()
+            await check(await client.get(f"/pessoas/{random_id()}"))
+
+        async def batch_get_50(i):
+            pessoas_cache.backend.clear()
+            await check(await client.post("/pessoas/batch-get", json={"ids": [random_id() for _ in range(50)]}))
+
+        async def batch_ops_10(i):
+            # fluxo típico de agente MCP em uma chamada: lê, atualiza, lê de novo
+            pessoa_id = random_id()
+            operations = [{"op": "get", "id": random_id()} for _ in range(7)] + [
+                {"op": "get", "id": pessoa_id},
+                {"op": "update", "id": pessoa_id, "data": {"flag": "B"}},
+                {"op": "get", "id": pessoa_id},
+            ]
+            await check(await client.post("/pessoas/batch", json={"operations": operations}))
+
+        created: list = []
+
+        async def create(i):
+            response = await check(await client.post("/pessoas/", json={"nome": f"Bench criada {i}"}))
+            if response.status_code == 201:
+                created.append(response.json()["id"])
+
+        async def delete(i):
+            if created:
+                await check(await client.delete(f"/pessoas/{created.pop()}"))
+
+        scenarios = {
+            "create": create,
+            "get_hot": lambda i: client.get(f"/pessoas/{hot_ids[i % len(hot_ids)]}"),
+            "get_cold": get_cold,
+            "get_hot_304": lambda i: client.get(
+                f"/pessoas/{hot_ids[i % len(hot_ids)]}",
+                headers={"If-None-Match": hot_etags[hot_ids[i % len(hot_ids)]]},
+            ),
+            "batch_get_50": batch_get_50,
+            "list_first_page": lambda i: client.get("/pessoas/", params=page),
+            "list_first_page_304": lambda i: client.get(
+                "/pessoas/", params=page, headers={"If-None-Match": page_etag}
+            ),
+            "list_deep_offset": lambda i: client.get("/pessoas/", params={"skip": deep_skip, **page}),
+            "list_deep_cursor": lambda i: client.get("/pessoas/", params={"cursor": deep_cursor or "", **page}),
+            "search": lambda i: client.get("/pessoas/search", params={"q": f"pessoa benchmark {rnd.randint(0, total)}"}),
+            "by_cpf": lambda i: client.get(f"/pessoas/by-cpf/{CPF_BASE + rnd.randint(0, total - 1)}"),
+            "by_celular": lambda i: client.get(f"/pessoas/by-celular/1199{rnd.randint(0, total - 1):07d}"),
+            "update": lambda i: client.put(f"/pessoas/{random_id()}", json={"flag": "U"}),
+            "bulk_100": lambda i: client.post("/pessoas/bulk", json=[{"nome": f"Bench lote {i}-{j}"} for j in range(100)]),
+            "delete": delete,
+            "changes_since_seed": lambda i: client.get("/pessoas/changes", params={"since": changes_token}),
+            "stats": lambda i: client.get("/pessoas/stats"),
+            "batch_ops_10": batch_ops_10,
+            "list_first_page_total": lambda i: client.get("/pessoas/", params={"limit": 50, "count": "exact"}),
+        }
+        for name, operation in scenarios.items():
+            if args.only and name not in args.only:
+                continue
+            async def run(i, operation=operation):
+                result = operation(i)
+                if asyncio.iscoroutine(result):
+                    result = await result
+                if isinstance(result, httpx.Response):
+                    await check(result)
+            iterations = args.requests if name != "bulk_100" else max(1, args.requests // 20)
+            rejected["total"] = 0
+            results[name] = await measure(run, iterations, args.concurrency)
+            results[name]["rejected"] = rejected["total"]
+            print(
+                f"  {name}: p50={results[name]['p50_ms']:.2f}ms p99={results[name]['p99_ms']:.2f}ms"
+                f" rejected={rejected['total']}",
+                file=sys.stderr,
+            )
+
+        if not args.only or "export" in args.only:
+            # exportação completa: tempo até o primeiro byte e total
+            start = time.perf_counter()
+            first_byte = None
+            size = 0
+            async with client.stream("GET", "/pessoas/export", params={"format": "ndjson"}) as response:
+                async for chunk in response.aiter_bytes():
+                    if first_byte is None:
+                        first_byte = time.perf_counter() - start
+                    size += len(chunk)
+            results["export_ndjson"] = {
+                "n": 1,
+                "ttfb_ms": (first_byte or 0) * 1000,
+                "total_ms": (time.perf_counter() - start) * 1000,
+                "bytes": size,
+            }
+    return results
+
+
+async def micro_benchmarks(args, ids: Dict[str, int]) -> Dict[str, Any]:
+    results: Dict[str, Any] = {}
+    rnd = random.Random(args.seed)
+    deep_skip = max(0, ids["total"] - args.page_size)
+
+    async with session_factory()() as session:
+        repo = PessoaRepository(session)
+        last = (await repo.list(skip=max(0, deep_skip - 1), limit=1))
+        after = (last[0].id,) if last else None
+
+        async def orm_list(i):
+            # referência: a mesma página de repo_list materializada como objetos ORM
+            result = await session.scalars(
+                select(PessoaModel).order_by(PessoaModel.id).limit(args.page_size)
+            )
+            return result.all()
+
+        scenarios = {
+            "repo_get_by_id": lambda i: repo.get_by_id(rnd.randint(ids["min_id"], ids["max_id"])),
+            "repo_list": lambda i: repo.list(limit=args.page_size),
+            "orm_list": orm_list,
+            "repo_list_deep_offset": lambda i: repo.list(skip=deep_skip, limit=args.page_size),
+            "repo_list_deep_keyset": lambda i: repo.list_keyset(limit=args.page_size, after=after),
+            "repo_search": lambda i: repo.search(f"pessoa benchmark {rnd.randint(0, ids['total'])}"),
+        }
+        for name, operation in scenarios.items():
+            results[name] = await measure(operation, args.requests)
+            # não deixa o identity map crescer entre as rodadas
+            session.expunge_all()
+
+    # serialização de uma página: caminho padrão do FastAPI x TypeAdapter
+    async with session_factory()() as session:
+        page = await PessoaRepository(session).list(limit=args.page_size)
+    field = create_model_field(name="Response", type_=List[PessoaRead], mode="serialization")
+
+    async def serialize_fastapi(i):
+        content = await serialize_response(field=field, response_content=page)
+        return JSONResponse(content).body
+
+    results["serialize_page_fastapi"] = await measure(serialize_fastapi, args.requests)
+    results["serialize_page_typeadapter"] = measure_sync(lambda i: render_pessoas(page), args.requests)
+
+    token = mint_token()
+
+    def decode_uncached(i):
+        jwt_utils.token_cache.clear()
+        jwt_utils.decode_access_token(token)
+
+    results["decode_access_token_uncached"] = measure_sync(decode_uncached, args.requests * 10)
+    results["decode_access_token_cached"] = measure_sync(
+        lambda i: jwt_utils.decode_access_token(token), args.requests * 10
+    )
+    return results
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "HEAD"], cwd=ROOT, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--rows", default="small", help="small|medium|large ou um número de linhas")
+    parser.add_argument("--requests", type=int, default=200, help="requisições por cenário")
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=42, help="semente dos ids sorteados")
+    parser.add_argument("--only", nargs="*", help="roda só estes cenários HTTP")
+    parser.add_argument("--skip-micro", action="store_true")
+    parser.add_argument("--output", help="arquivo JSON (padrão: benchmarks/results/<data>.json)")
+    args = parser.parse_args()
+    rows = PRESETS.get(args.rows) or int(args.rows)
+
+    print(f"Semeando {rows} pessoas...", file=sys.stderr)
+    ids = await seed(rows)
+
+    print("Endpoints HTTP:", file=sys.stderr)
+    http = await http_benchmarks(args, ids)
+    micro = {} if args.skip_micro else await micro_benchmarks(args, ids)
+    await dispose_engines()
+
+    report = {
+        "meta": {
+            "timestamp": datetime.utcnow().isoformat(),
+            "commit": git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "rows": ids["total"],
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "page_size": args.page_size,
+        },
+        "http": http,
+        "micro": micro,
+    }
+    output = args.output or os.path.join(
+        ROOT, "benchmarks", "results", datetime.utcnow().strftime("%Y%m%dT%H%M%S") + ".json"
+    )
+    os.makedirs(os.path.dirname(output), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Resultado salvo em {output}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
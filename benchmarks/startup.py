@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Relatório do tempo de partida da API: importação, create_app, startup
+(lifespan) e primeira resposta de /health, cada medida em um processo novo.
+Não precisa de banco (os engines são criados sem conectar; o worker de
+importação fica desligado).
+
+Uso:
+    python -m benchmarks.startup [--runs 5] [--top 15]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from typing import Dict, List, Tuple
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+# executado em um processo novo a cada rodada
+CHILD = r"""
+import asyncio, json, time
+t0 = time.perf_counter()
+from src.main import create_app
+from src.infrastructure.settings import Settings
+t1 = time.perf_counter()
+app = create_app(Settings(
+    database_url="postgresql://startup@localhost/startup",
+    jwt_secret="startup",
+    database_pool_prewarm=0,
+    mcp_enabled={mcp},
+    import_worker_enabled=False,
+))
+t2 = time.perf_counter()
+
+async def main():
+    import httpx
+    async with app.router.lifespan_context(app):
+        t3 = time.perf_counter()
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://startup") as client:
+            assert (await client.get("/health")).status_code == 200
+        t4 = time.perf_counter()
+    return t3, t4
+
+t3, t4 = asyncio.run(main())
+print(json.dumps({
+    "import_ms": (t1 - t0) * 1000,
+    "create_app_ms": (t2 - t1) * 1000,
+    "startup_ms": (t3 - t2) * 1000,
+    "first_request_ms": (t4 - t3) * 1000,
+    "total_ms": (t4 - t0) * 1000,
+}))
+"""
+
+
+def run_child(mcp: bool) -> Dict[str, float]:
+    output = subprocess.check_output(
+        [sys.executable, "-c", CHILD.replace("{mcp}", str(mcp))],
+        cwd=ROOT, text=True, stderr=subprocess.DEVNULL,
+    )
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def import_report(top: int) -> List[Tuple[str, float]]:
+    """Módulos de maior tempo acumulado de importação (python -X importtime)."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import src.main"],
+        cwd=ROOT, text=True, capture_output=True, check=True,
+    )
+    modules: Dict[str, float] = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        name = name.strip()
+        # módulos do projeto e pacotes de topo (fastapi, sqlalchemy...)
+        if name.startswith("src.") or "." not in name:
+            modules[name] = int(cumulative) / 1000
+    return sorted(modules.items(), key=lambda item: -item[1])[:top]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15)
+    args = parser.parse_args()
+
+    print("Importação (ms acumulados):")
+    for name, ms in import_report(args.top):
+        print(f"  {ms:9.1f}  {name}")
+
+    for mcp in (False, True):
+        runs = [run_child(mcp) for _ in range(args.runs)]
+        print(f"\nPartida com MCP {'ligado' if mcp else 'desligado'} (mediana de {args.runs}):")
+        for key in runs[0]:
+            print(f"  {key:18} {statistics.median(run[key] for run in runs):9.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+# benchmarks/stats.py
+
+import asyncio
+import statistics
+import time
+from typing import Any, Awaitable, Callable, Dict, List
+
+
+def summarize(latencies: List[float], elapsed: float) -> Dict[str, Any]:
+    """Resumo de uma rodada: vazão e percentis de latência em ms."""
+    ordered = sorted(latencies)
+
+    def pct(p: float) -> float:
+        if not ordered:
+            return 0.0
+        index = min(len(ordered) - 1, max(0, round(p / 100 * len(ordered)) - 1))
+        return ordered[index] * 1000
+
+    return {
+        "n": len(ordered),
+        "throughput_rps": len(ordered) / elapsed if elapsed else 0.0,
+        "mean_ms": statistics.fmean(ordered) * 1000 if ordered else 0.0,
+        "p50_ms": pct(50),
+        "p95_ms": pct(95),
+        "p99_ms": pct(99),
+        "max_ms": ordered[-1] * 1000 if ordered else 0.0,
+    }
+
+
+async def measure(
+    operation: Callable[[int], Awaitable[Any]],
+    iterations: int,
+    concurrency: int = 1,
+    warmup: int = 5,
+) -> Dict[str, Any]:
+    """
+    Executa `operation(i)` `iterations` vezes com até `concurrency`
+    chamadas simultâneas e devolve o resumo (ver summarize).
+    """
+    for i in range(warmup):
+        await operation(i)
+
+    latencies: List[float] = []
+    counter = iter(range(iterations))
+
+    async def worker() -> None:
+        for i in counter:
+            start = time.perf_counter()
+            await operation(i)
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return summarize(latencies, time.perf_counter() - start)
+
+
+def measure_sync(operation: Callable[[int], Any], iterations: int) -> Dict[str, Any]:
+    latencies: List[float] = []
+    start = time.perf_counter()
+    for i in range(iterations):
+        t0 = time.perf_counter()
+        operation(i)
+        latencies.append(time.perf_counter() - t0)
+    return summarize(latencies, time.perf_counter() - start)
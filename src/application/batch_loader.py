@@ -0,0 +1,76 @@
+# src/application/batch_loader.py
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional, Sequence
+
+
+class BatchLoader:
+    """
+    Carregador por chave com agrupamento (estilo DataLoader), para uma
+    requisição: chamadas de load() feitas na mesma volta do event loop
+    viram uma única chamada de `load_many`, e chaves repetidas são
+    carregadas uma vez só.
+
+    `load_many(keys)` deve devolver um valor por chave, na mesma ordem.
+    As cargas são serializadas (uma por vez), pois normalmente usam a
+    mesma AsyncSession, que não aceita consultas concorrentes.
+    """
+
+    def __init__(self, load_many: Callable[[Sequence[Hashable]], Awaitable[Sequence[Any]]]):
+        self._load_many = load_many
+        self._pending: Dict[Hashable, asyncio.Future] = {}
+        self._loaded: Dict[Hashable, asyncio.Future] = {}
+        self._lock = asyncio.Lock()
+        self.batches = 0
+
+    async def load(self, key: Hashable) -> Any:
+        future = self._loaded.get(key) or self._pending.get(key)
+        if future is None:
+            if not self._pending:
+                # despacha depois que as demais tarefas já agendadas pedirem suas chaves
+                asyncio.get_running_loop().create_task(self._dispatch())
+            future = asyncio.get_running_loop().create_future()
+            self._pending[key] = future
+        return await asyncio.shield(future)
+
+    async def load_many(self, keys: Sequence[Hashable]) -> List[Any]:
+        return list(await asyncio.gather(*(self.load(key) for key in keys)))
+
+    def clear(self, key: Optional[Hashable] = None) -> None:
+        """Esquece o valor já carregado de `key` (ou de todas as chaves)."""
+        if key is None:
+            self._loaded.clear()
+        else:
+            self._loaded.pop(key, None)
+
+    async def _dispatch(self) -> None:
+        async with self._lock:
+            batch, self._pending = self._pending, {}
+            if not batch:
+                return
+            self._loaded.update(batch)
+            self.batches += 1
+            try:
+                values = await self._load_many(list(batch))
+            except asyncio.CancelledError:
+                self._forget(batch, None)
+                raise
+            except Exception as e:
+                self._forget(batch, e)
+                return
+            for future, value in zip(batch.values(), values):
+                if not future.done():
+                    future.set_result(value)
+
+    def _forget(self, batch: Dict[Hashable, asyncio.Future], error: Optional[Exception]) -> None:
+        # uma falha não fica memorizada: a próxima load() tenta de novo
+        for key, future in batch.items():
+            self._loaded.pop(key, None)
+            if future.done():
+                continue
+            if error is None:
+                future.cancel()
+            else:
+                future.set_exception(error)
+                # evita o aviso de "exception was never retrieved"
+                future.exception()
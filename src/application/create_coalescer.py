@@ -0,0 +1,139 @@
+# src/application/create_coalescer.py
+
+import asyncio
+import logging
+import os
+from typing import Any, List, Optional, Tuple
+
+from src.core.pessoas.entity import Pessoa, PessoaRow
+from src.infrastructure.db.repositories.pessoas import PessoaRepository
+from src.infrastructure.observability.metrics import COUNT_BUCKETS, REGISTRY, Counter, Histogram
+
+logger = logging.getLogger(__name__)
+
+# Agrupamento das criações avulsas (POST /pessoas) em um commit só; desligado por padrão
+CREATE_COALESCE_ENABLED = os.getenv("PESSOAS_CREATE_COALESCE", "false").lower() == "true"
+# Quanto a primeira criação do grupo espera pelas demais (milissegundos)
+CREATE_COALESCE_WINDOW_MS = float(os.getenv("PESSOAS_CREATE_COALESCE_WINDOW_MS", "2"))
+# Máximo de pessoas por INSERT; o grupo sai antes da janela ao atingi-lo
+CREATE_COALESCE_MAX_ROWS = int(os.getenv("PESSOAS_CREATE_COALESCE_MAX_ROWS", "100"))
+
+coalesced_batch_size = REGISTRY.register(Histogram(
+    "pessoas_create_batch_size", "Criações gravadas por commit do agrupador.", (), COUNT_BUCKETS
+))
+coalesced_fallbacks = REGISTRY.register(Counter(
+    "pessoas_create_fallbacks_total", "Grupos regravados linha a linha após uma falha."
+))
+
+# (pessoa, usuário que pediu a criação, resultado)
+Pending = Tuple[Pessoa, Optional[Any], asyncio.Future]
+
+
+class CreateCoalescer:
+    """
+    Group commit das criações de pessoas: as que chegam dentro de
+    `window` segundos (ou até `max_rows`) viram um INSERT de várias linhas
+    em uma transação, com um commit (um flush do WAL) para todas. Cada
+    chamador recebe a própria linha, ou None se o CPF já existia. Os
+    usuários do grupo são marcados como escritores recentes no commit
+    (leem do primário em seguida, como se tivessem gravado na própria sessão).
+
+    Um grupo é gravado por vez: as criações que chegam durante o commit
+    formam o grupo seguinte. Se o INSERT do grupo falhar, as pessoas são
+    gravadas uma a uma, e cada chamador recebe o próprio resultado ou erro.
+    Uma criação cujo chamador desistiu antes da gravação é descartada.
+    """
+
+    def __init__(
+        self,
+        window: float = CREATE_COALESCE_WINDOW_MS / 1000,
+        max_rows: int = CREATE_COALESCE_MAX_ROWS,
+        session_factory=None,
+    ):
+        self.window = window
+        self.max_rows = max(1, max_rows)
+        self._session_factory = session_factory
+        self._pending: List[Pending] = []
+        self._full: Optional[asyncio.Future] = None
+        self._task: Optional[asyncio.Task] = None
+        self.batches = 0
+
+    @property
+    def session_factory(self):
+        if self._session_factory is None:
+            # importado só quando usado, como no worker de importações
+            from src.infrastructure.db.session import session_factory
+            self._session_factory = session_factory()
+        return self._session_factory
+
+    async def create(self, pessoa: Pessoa, user_id: Optional[Any] = None) -> Optional[PessoaRow]:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((pessoa, user_id, future))
+        if len(self._pending) >= self.max_rows and self._full is not None and not self._full.done():
+            self._full.set_result(None)
+        if self._task is None or self._task.done():
+            self._task = loop.create_task(self._run())
+        return await future
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while self._pending:
+            if len(self._pending) < self.max_rows:
+                self._full = loop.create_future()
+                await asyncio.wait([self._full], timeout=self.window)
+                self._full = None
+            batch = self._take()
+            if batch:
+                await self._flush(batch)
+
+    def _take(self) -> List[Pending]:
+        # até max_rows, sem CPF repetido: a repetição fica para o grupo
+        # seguinte e recebe "já cadastrado" como receberia sem agrupamento
+        batch: List[Pending] = []
+        rest: List[Pending] = []
+        cpfs = set()
+        for item in self._pending:
+            pessoa, _, future = item
+            if future.done():
+                continue
+            if len(batch) >= self.max_rows or (pessoa.cpf is not None and pessoa.cpf in cpfs):
+                rest.append(item)
+                continue
+            if pessoa.cpf is not None:
+                cpfs.add(pessoa.cpf)
+            batch.append(item)
+        self._pending = rest
+        return batch
+
+    async def _flush(self, batch: List[Pending]) -> None:
+        self.batches += 1
+        coalesced_batch_size.observe(len(batch))
+        user_ids = {user_id for _, user_id, _ in batch if user_id is not None}
+        try:
+            async with self.session_factory(info={"user_ids": user_ids}) as session:
+                rows = await PessoaRepository(session).create_many([p for p, _, _ in batch])
+        except Exception:
+            logger.warning("Falha no INSERT agrupado; gravando linha a linha", exc_info=True)
+            coalesced_fallbacks.inc()
+            await self._fallback(batch)
+            return
+        for (_, _, future), row in zip(batch, rows):
+            if not future.done():
+                future.set_result(row)
+
+    async def _fallback(self, batch: List[Pending]) -> None:
+        for pessoa, user_id, future in batch:
+            try:
+                async with self.session_factory(info={"user_id": user_id}) as session:
+                    rows = await PessoaRepository(session).create_many([pessoa])
+            except Exception as e:
+                if not future.done():
+                    future.set_exception(e)
+                continue
+            if not future.done():
+                future.set_result(rows[0])
+
+
+# Agrupador do processo, usado por PessoaService.create_pessoa quando ligado
+create_coalescer = CreateCoalescer()
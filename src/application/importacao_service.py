@@ -0,0 +1,403 @@
+# src/application/importacao_service.py
+
+import asyncio
+import codecs
+import contextlib
+import csv
+import logging
+import os
+import socket
+import tempfile
+import uuid
+from datetime import date, datetime
+from typing import IO, Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.application.pessoas_service import PessoaService
+from src.core.pessoas.model import ImportacaoModel
+from src.infrastructure.db.repositories.importacoes import ImportacaoRepository
+
+logger = logging.getLogger(__name__)
+
+# Onde os CSVs enviados ficam até o fim da importação (compartilhado
+# entre os workers que podem retomar os jobs)
+IMPORT_DIR = os.getenv(
+    "PESSOAS_IMPORT_DIR", os.path.join(tempfile.gettempdir(), "financeiro-imports")
+)
+# Linhas por bloco (uma transação por bloco)
+IMPORT_CHUNK_SIZE = int(os.getenv("PESSOAS_IMPORT_CHUNK_SIZE", "1000"))
+# Validade da posse de um job; renovada a cada bloco gravado
+IMPORT_LEASE_SECONDS = float(os.getenv("PESSOAS_IMPORT_LEASE_SECONDS", "60"))
+# Importações simultâneas por processo
+IMPORT_CONCURRENCY = int(os.getenv("PESSOAS_IMPORT_CONCURRENCY", "1"))
+
+# Colunas aceitas no CSV (as demais são ignoradas); só nome é obrigatória
+COLUMNS = ("nome", "celular", "cpf", "data_nascimento", "flag")
+# Codificações aceitas, na ordem de tentativa: UTF-8 e a do Excel em
+# português (Windows-1252); o arquivo é gravado sempre em UTF-8
+ENCODINGS = ("utf-8-sig", "cp1252")
+_COPY_BLOCK = 1 << 20
+
+
+class ImportacaoNotFoundError(ValueError):
+    """Job de importação inexistente (os routers respondem 404)."""
+
+
+def parse_date(value: str) -> date:
+    """Data ISO (2025-06-17) ou no formato brasileiro (17/06/2025)."""
+    try:
+        return date.fromisoformat(value)
+    except ValueError:
+        pass
+    try:
+        return datetime.strptime(value, "%d/%m/%Y").date()
+    except ValueError:
+        raise ValueError(f"Data de nascimento inválida: {value}.")
+
+
+def parse_row(row: Dict[str, Optional[str]]) -> Dict[str, Any]:
+    """Linha do CSV -> argumentos da entidade Pessoa (vazios viram None)."""
+    values: Dict[str, Any] = {}
+    for column in COLUMNS:
+        value = (row.get(column) or "").strip()
+        values[column] = value or None
+    if values["data_nascimento"]:
+        values["data_nascimento"] = parse_date(values["data_nascimento"])
+    return values
+
+
+def _delimiter(header: str) -> str:
+    # planilhas exportadas em português costumam usar ";"
+    return ";" if header.count(";") > header.count(",") else ","
+
+
+def save_upload(source: IO[bytes], path: str) -> int:
+    """
+    Copia o upload para `path` em blocos (sem carregar o arquivo na
+    memória) e devolve a quantidade estimada de linhas de dados.
+    """
+    newlines = 0
+    last = b""
+    try:
+        with open(path, "wb") as target:
+            while True:
+                block = source.read(_COPY_BLOCK)
+                if not block:
+                    break
+                target.write(block)
+                newlines += block.count(b"\n")
+                last = block
+    except BaseException:
+        # cópia interrompida: não deixa o arquivo parcial em IMPORT_DIR
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(path)
+        raise
+    if last and not last.endswith(b"\n"):
+        newlines += 1
+    return max(newlines - 1, 0)
+
+
+def _decodes(path: str, encoding: str) -> bool:
+    decoder = codecs.getincrementaldecoder(encoding)()
+    try:
+        with open(path, "rb") as f:
+            while True:
+                block = f.read(_COPY_BLOCK)
+                decoder.decode(block, final=not block)
+                if not block:
+                    return True
+    except UnicodeDecodeError:
+        return False
+
+
+def ensure_utf8(path: str) -> str:
+    """
+    Confere a codificação do arquivo inteiro antes de criar o job (senão
+    a importação falharia no meio, com blocos já gravados) e converte
+    para UTF-8 os arquivos em Windows-1252. Devolve a codificação original.
+    """
+    for encoding in ENCODINGS:
+        if _decodes(path, encoding):
+            break
+    else:
+        raise ValueError("Codificação do CSV não reconhecida: use UTF-8 ou Windows-1252.")
+    if encoding != ENCODINGS[0]:
+        convertido = path + ".utf8"
+        try:
+            with open(path, newline="", encoding=encoding) as source, \
+                    open(convertido, "w", newline="", encoding="utf-8") as target:
+                while True:
+                    block = source.read(_COPY_BLOCK)
+                    if not block:
+                        break
+                    target.write(block)
+            os.replace(convertido, path)
+        except BaseException:
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(convertido)
+            raise
+    return encoding
+
+
+def read_header(path: str) -> List[str]:
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        first = f.readline()
+    return [name.strip().lower() for name in next(csv.reader([first], delimiter=_delimiter(first)), [])]
+
+
+def iter_chunks(
+    path: str, skip: int, chunk_size: int
+) -> Iterator[List[Tuple[int, Dict[str, Optional[str]]]]]:
+    """
+    Blocos de até `chunk_size` linhas (número da linha no arquivo, valores),
+    pulando as `skip` primeiras linhas de dados (já importadas).
+    """
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        delimiter = _delimiter(f.readline())
+        f.seek(0)
+        reader = csv.reader(f, delimiter=delimiter)
+        header = [name.strip().lower() for name in next(reader, [])]
+        chunk: List[Tuple[int, Dict[str, Optional[str]]]] = []
+        for ordinal, row in enumerate(reader):
+            if ordinal < skip:
+                continue
+            chunk.append((reader.line_num, dict(zip(header, row))))
+            if len(chunk) == chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+
+class ImportacaoWorker:
+    """
+    Executa as importações em tarefas de fundo do processo. Cada job é
+    tomado com uma posse (lease) renovada a cada bloco; jobs de um
+    processo que parou voltam a ser tomados quando a posse expira, e
+    retomam do último bloco gravado.
+    """
+
+    def __init__(self, session_factory=None):
+        self._session_factory = session_factory
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._recover_task: Optional[asyncio.Task] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    @property
+    def session_factory(self):
+        if self._session_factory is None:
+            # importado só quando usado: os testes injetam a própria fábrica
+            from src.infrastructure.db.session import session_factory
+            self._session_factory = session_factory()
+        return self._session_factory
+
+    def submit(self, job_id: str) -> None:
+        if job_id in self._tasks:
+            return
+        task = asyncio.get_running_loop().create_task(self._run(job_id))
+        self._tasks[job_id] = task
+        task.add_done_callback(lambda _: self._tasks.pop(job_id, None))
+
+    async def start(self) -> None:
+        """Retoma os jobs sem dono agora e, depois, a cada IMPORT_LEASE_SECONDS."""
+        self._recover_task = asyncio.get_running_loop().create_task(self._recover_loop())
+
+    async def stop(self) -> None:
+        tasks = list(self._tasks.values())
+        if self._recover_task is not None:
+            tasks.append(self._recover_task)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def join(self) -> None:
+        """Aguarda os jobs em andamento neste processo."""
+        await asyncio.gather(*self._tasks.values(), return_exceptions=True)
+
+    async def recover(self) -> None:
+        async with self.session_factory() as session:
+            job_ids = await ImportacaoRepository(session).claimable()
+        for job_id in job_ids:
+            self.submit(job_id)
+
+    async def _recover_loop(self) -> None:
+        while True:
+            try:
+                await self.recover()
+            except Exception:
+                logger.exception("Falha ao procurar importações pendentes")
+            await asyncio.sleep(IMPORT_LEASE_SECONDS)
+
+    async def _run(self, job_id: str) -> None:
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(IMPORT_CONCURRENCY)
+        async with self._semaphore:
+            try:
+                await self.run(job_id)
+            except asyncio.CancelledError:
+                # desligamento: libera o job para ser retomado logo
+                async with self.session_factory() as session:
+                    await ImportacaoRepository(session).release(job_id, self.worker_id)
+                raise
+            except Exception as e:
+                logger.exception("Importação %s falhou", job_id)
+                async with self.session_factory() as session:
+                    await ImportacaoRepository(session).finish(
+                        job_id, self.worker_id, "failed", erro=str(e)[:1000]
+                    )
+
+    async def run(self, job_id: str) -> None:
+        """Importa o job (a partir do último bloco gravado) até o fim."""
+        async with self.session_factory() as session:
+            job = await ImportacaoRepository(session).claim(
+                job_id, self.worker_id, IMPORT_LEASE_SECONDS
+            )
+        if job is None:
+            return  # já terminou ou está com outro worker
+
+        processadas = job.processadas
+        chunks = iter_chunks(job.caminho, processadas, IMPORT_CHUNK_SIZE)
+        try:
+            while True:
+                # leitura e parsing do CSV fora do event loop
+                chunk = await asyncio.to_thread(next, chunks, None)
+                if chunk is None:
+                    break
+                if not await self._import_chunk(job, processadas, chunk):
+                    return  # perdeu a posse: outro worker continua
+                processadas += len(chunk)
+        finally:
+            chunks.close()
+
+        async with self.session_factory() as session:
+            await ImportacaoRepository(session).finish(job_id, self.worker_id, "done")
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(job.caminho)
+
+    async def _import_chunk(
+        self,
+        job: ImportacaoModel,
+        start: int,
+        chunk: List[Tuple[int, Dict[str, Optional[str]]]],
+    ) -> bool:
+        items: List[Dict[str, Any]] = []
+        linhas: List[int] = []
+        rejeicoes: List[Tuple[int, str]] = []
+        for linha, row in chunk:
+            try:
+                items.append(parse_row(row))
+                linhas.append(linha)
+            except ValueError as e:
+                rejeicoes.append((linha, str(e)))
+
+        async with self.session_factory() as session:
+            pessoas = PessoaService(session)
+            try:
+                # pessoas, rejeições e progresso na mesma transação
+                results = await pessoas.bulk_upsert(
+                    items, conflict_key=job.on_conflict, commit=False
+                )
+                rejeicoes.extend(
+                    (linhas[r["index"]], r["motivo"]) for r in results if r["status"] == "rejected"
+                )
+                rejeicoes.sort()
+                ok = await ImportacaoRepository(session).record_chunk(
+                    job.id,
+                    self.worker_id,
+                    start=start,
+                    processadas=start + len(chunk),
+                    criadas=sum(r["status"] == "created" for r in results),
+                    atualizadas=sum(r["status"] == "updated" for r in results),
+                    rejeicoes=rejeicoes,
+                    lease_seconds=IMPORT_LEASE_SECONDS,
+                )
+                if not ok:
+                    await session.rollback()
+                    return False
+                await session.commit()
+            except Exception:
+                await session.rollback()
+                raise
+            await pessoas.invalidate_results(results)
+        return True
+
+
+# Worker do processo (iniciado/parado no lifespan do app)
+importacao_worker = ImportacaoWorker()
+
+
+class ImportacaoService:
+    def __init__(self, session: AsyncSession, worker: Optional[ImportacaoWorker] = None):
+        self.repo = ImportacaoRepository(session)
+        self.worker = worker or importacao_worker
+
+    async def create_import(
+        self, arquivo: str, source: IO[bytes], on_conflict: Optional[str] = None
+    ) -> ImportacaoModel:
+        """
+        Grava o CSV em IMPORT_DIR, registra o job e agenda a importação.
+        O CSV precisa de cabeçalho com ao menos a coluna `nome`.
+        """
+        if on_conflict not in (None, "cpf"):
+            raise ValueError(f"Chave de upsert inválida: {on_conflict}.")
+        job_id = uuid.uuid4().hex
+        os.makedirs(IMPORT_DIR, exist_ok=True)
+        caminho = os.path.join(IMPORT_DIR, f"{job_id}.csv")
+        total = await asyncio.to_thread(save_upload, source, caminho)
+        try:
+            await asyncio.to_thread(ensure_utf8, caminho)
+            header = await asyncio.to_thread(read_header, caminho)
+            if "nome" not in header:
+                raise ValueError("O CSV precisa de um cabeçalho com a coluna 'nome'.")
+            job = await self.repo.create(
+                id=job_id,
+                arquivo=(arquivo or "upload.csv")[:255],
+                caminho=caminho,
+                on_conflict=on_conflict,
+                total_estimado=total,
+            )
+        except Exception:
+            os.remove(caminho)
+            raise
+        self.worker.submit(job.id)
+        return job
+
+    async def get_import(self, job_id: str, rejeicoes_limit: int = 100) -> Dict[str, Any]:
+        """Progresso do job, vazão (linhas/s) e as primeiras linhas rejeitadas."""
+        job = await self.repo.get(job_id)
+        if job is None:
+            raise ImportacaoNotFoundError(f"Importação {job_id} não encontrada.")
+        rejeicoes = await self.repo.list_rejeicoes(job_id, limit=rejeicoes_limit) if rejeicoes_limit else []
+        return describe(job, rejeicoes)
+
+
+def describe(job: ImportacaoModel, rejeicoes: Sequence[Tuple[int, str]] = ()) -> Dict[str, Any]:
+    linhas_por_segundo = None
+    if job.started_at is not None:
+        elapsed = ((job.finished_at or datetime.utcnow()) - job.started_at).total_seconds()
+        if elapsed > 0:
+            linhas_por_segundo = round(job.processadas / elapsed, 1)
+    progresso = None
+    if job.status == "done":
+        progresso = 1.0
+    elif job.total_estimado:
+        progresso = round(min(job.processadas / job.total_estimado, 1.0), 4)
+    return {
+        "id": job.id,
+        "status": job.status,
+        "arquivo": job.arquivo,
+        "total_estimado": job.total_estimado,
+        "processadas": job.processadas,
+        "criadas": job.criadas,
+        "atualizadas": job.atualizadas,
+        "rejeitadas": job.rejeitadas,
+        "progresso": progresso,
+        "linhas_por_segundo": linhas_por_segundo,
+        "erro": job.erro,
+        "created_at": job.created_at,
+        "started_at": job.started_at,
+        "finished_at": job.finished_at,
+        "rejeicoes": [{"linha": linha, "motivo": motivo} for linha, motivo in rejeicoes],
+    }
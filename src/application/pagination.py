@@ -0,0 +1,56 @@
+# src/application/pagination.py
+
+import base64
+import json
+from datetime import datetime
+from typing import Any, Tuple
+
+# Ordenações aceitas pela paginação por cursor (keyset)
+ORDER_FIELDS = ("id", "created_at")
+
+
+def encode_cursor(order_by: str, row: Any) -> str:
+    """
+    Gera um cursor opaco a partir da última linha de uma página.
+    O cursor guarda a ordenação e a chave (created_at, id) ou (id).
+    """
+    if order_by == "created_at":
+        payload = {"o": order_by, "c": row.created_at.isoformat(), "id": row.id}
+    else:
+        payload = {"o": "id", "id": row.id}
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+def decode_cursor(cursor: str) -> Tuple[str, Tuple[Any, ...]]:
+    """
+    Decodifica um cursor gerado por encode_cursor.
+    Retorna (order_by, chave) ou levanta ValueError se o cursor for inválido.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        payload = json.loads(raw)
+        order_by = payload["o"]
+        if order_by == "created_at":
+            return order_by, (datetime.fromisoformat(payload["c"]), int(payload["id"]))
+        if order_by == "id":
+            return order_by, (int(payload["id"]),)
+    except (ValueError, KeyError, TypeError):
+        pass
+    raise ValueError("Cursor de paginação inválido.")
+
+
+def encode_change_token(versao: int, pessoa_id: int) -> str:
+    """Token opaco de retomada do feed de mudanças: a chave (versao, id)."""
+    raw = json.dumps({"v": versao, "id": pessoa_id}, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+def decode_change_token(token: str) -> Tuple[int, int]:
+    """Decodifica um token de encode_change_token ou levanta ValueError."""
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        payload = json.loads(raw)
+        return int(payload["v"]), int(payload["id"])
+    except (ValueError, KeyError, TypeError):
+        raise ValueError("Token de sincronização inválido.")
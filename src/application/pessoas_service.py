@@ -1,17 +1,77 @@
 # src/application/pessoas_service.py
 
-from typing import List, Optional
-from datetime import date
+import asyncio
+import os
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence, Tuple, Union
+from datetime import date, datetime, timedelta
 
+from sqlalchemy.exc import DataError, IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.core.pessoas.entity import Pessoa
+from src.application.batch_loader import BatchLoader
+from src.application.create_coalescer import CREATE_COALESCE_ENABLED, create_coalescer
+from src.application.pagination import (
+    ORDER_FIELDS,
+    decode_change_token,
+    decode_cursor,
+    encode_change_token,
+    encode_cursor,
+)
+from src.core.pessoas.entity import Pessoa, PessoaRow, check_flag, check_nome
 from src.core.pessoas.model import PessoaModel
+from src.core.pessoas.normalization import normalize_celular, normalize_cpf, normalize_nome
+from src.infrastructure.cache.backends import MemoryLRUCache
+from src.infrastructure.cache.read_through import ReadThroughCache
 from src.infrastructure.db.repositories.pessoas import PessoaRepository
 
+# Tamanho padrão dos lotes do upsert em massa (linhas por INSERT)
+BULK_BATCH_SIZE = int(os.getenv("PESSOAS_BULK_BATCH_SIZE", "1000"))
+
+# Máximo de itens por chamada de POST /pessoas/bulk
+BULK_MAX_ITEMS = int(os.getenv("PESSOAS_BULK_MAX_ITEMS", "10000"))
+
+# Máximo de ids por chamada de get_pessoas (POST /pessoas/batch-get)
+BATCH_GET_MAX_IDS = int(os.getenv("PESSOAS_BATCH_GET_MAX_IDS", "100"))
+
+# Máximo de operações por chamada de POST /pessoas/batch
+BATCH_MAX_OPERATIONS = int(os.getenv("PESSOAS_BATCH_MAX_OPERATIONS", "100"))
+
+# Faixas etárias de get_stats: (idade limite exclusiva, rótulo)
+FAIXAS_ETARIAS = ((18, "0-17"), (30, "18-29"), (45, "30-44"), (60, "45-59"), (None, "60+"))
+
+# Cache das leituras por id, compartilhado pelo processo
+pessoas_cache = ReadThroughCache(
+    MemoryLRUCache(
+        maxsize=int(os.getenv("PESSOAS_CACHE_MAXSIZE", "10000")),
+        ttl=float(os.getenv("PESSOAS_CACHE_TTL", "30")),
+    )
+)
+
+class PessoaNotFoundError(ValueError):
+    """Pessoa inexistente (os routers respondem 404)."""
+
+class PessoaPreconditionFailedError(ValueError):
+    """A pessoa mudou desde a versão informada (os routers respondem 412)."""
+
+def _not_found(pessoa_id: int) -> PessoaNotFoundError:
+    return PessoaNotFoundError(f"Pessoa com id {pessoa_id} não encontrada.")
+
+def _faixa_etaria(ano: int, mes: int, hoje: date) -> str:
+    # idade em anos completos contando só ano e mês do nascimento
+    idade = max(0, ((hoje.year - ano) * 12 + hoje.month - mes) // 12)
+    for limite, rotulo in FAIXAS_ETARIAS:
+        if limite is None or idade < limite:
+            return rotulo
+
 class PessoaService:
-    def __init__(self, session: AsyncSession):
+    def __init__(self, session: AsyncSession, cache: Optional[ReadThroughCache] = None):
         self.repo = PessoaRepository(session)
+        self.cache = cache or pessoas_cache
+        # só o primário preenche o cache: uma réplica atrasada devolveria
+        # ao cache a versão que a última escrita acabou de invalidar
+        self.cache_fill = not session.info.get("replica", False)
+        # leituras por id desta requisição: pedidos concorrentes viram um get_many
+        self.loader = BatchLoader(self.repo.get_many)
 
     async def create_pessoa(
         self,
@@ -20,7 +80,7 @@ class PessoaService:
         cpf: Optional[str] = None,
         data_nascimento: Optional[date] = None,
         flag: Optional[str] = None,
-    ) -> PessoaModel:
+    ) -> Union[PessoaModel, PessoaRow]:
         # validação de domínio via entidade
         pessoa = Pessoa(
             nome=nome,
@@ -29,16 +89,270 @@ class PessoaService:
             data_nascimento=data_nascimento,
             flag=flag,
         )
-        return await self.repo.create(pessoa)
+        try:
+            if CREATE_COALESCE_ENABLED:
+                # gravada junto com as criações concorrentes, em outra sessão;
+                # o usuário vai junto para a leitura das próprias escritas
+                db_pessoa = await create_coalescer.create(
+                    pessoa, user_id=self.repo.session.info.get("user_id")
+                )
+                if db_pessoa is None:
+                    raise ValueError("CPF já cadastrado.")
+            else:
+                db_pessoa = await self.repo.create(pessoa)
+        except IntegrityError:
+            raise ValueError("CPF já cadastrado.")
+        except DataError:
+            # valor que a entidade aceitou mas o banco recusou
+            raise ValueError("Dados da pessoa recusados pelo banco.")
+        await self._invalidate(db_pessoa.id)
+        return db_pessoa
+
+    async def bulk_upsert(
+        self,
+        items: List[Dict[str, Any]],
+        conflict_key: Optional[str] = None,
+        batch_size: Optional[int] = None,
+        commit: bool = True,
+    ) -> List[Dict[str, Any]]:
+        """
+        Valida cada item pela entidade e grava os válidos em uma transação.
+        Retorna um resultado por item, na ordem de entrada:
+        {index, status: created|updated|rejected, id, motivo}.
+        Com commit=False a transação fica aberta; depois do commit, quem
+        chamou deve passar os resultados para invalidate_results.
+        """
+        if conflict_key not in (None, "cpf"):
+            raise ValueError(f"Chave de upsert inválida: {conflict_key}.")
+
+        results: List[Dict[str, Any]] = []
+        validas: List[Pessoa] = []
+        posicoes: List[int] = []
+        cpfs = set()
+        for index, item in enumerate(items):
+            result = {"index": index, "status": "rejected", "id": None, "motivo": None}
+            results.append(result)
+            try:
+                pessoa = Pessoa(**item)
+            except (TypeError, ValueError) as e:
+                result["motivo"] = str(e)
+                continue
+            if pessoa.cpf is not None:
+                if pessoa.cpf in cpfs:
+                    result["motivo"] = "CPF duplicado no lote."
+                    continue
+                cpfs.add(pessoa.cpf)
+            validas.append(pessoa)
+            posicoes.append(index)
+
+        gravadas = await self.repo.bulk_upsert(
+            validas,
+            conflict_key=conflict_key,
+            batch_size=batch_size or BULK_BATCH_SIZE,
+            commit=commit,
+        )
+        for index, gravada in zip(posicoes, gravadas):
+            result = results[index]
+            if gravada is None:
+                result["motivo"] = "CPF já cadastrado."
+                continue
+            result["id"], criada = gravada
+            result["status"] = "created" if criada else "updated"
+        if commit:
+            await self.invalidate_results(results)
+        return results
+
+    async def invalidate_results(self, results: List[Dict[str, Any]]) -> None:
+        """Invalida o cache das pessoas gravadas por bulk_upsert."""
+        for result in results:
+            if result["id"] is not None:
+                await self._invalidate(result["id"])
 
-    async def get_pessoa(self, pessoa_id: int) -> PessoaModel:
-        db_pessoa = await self.repo.get_by_id(pessoa_id)
+    async def get_pessoa(self, pessoa_id: int) -> PessoaRow:
+        # PessoaRow é imutável e não pertence a sessão alguma: pode ficar
+        # no cache e ser compartilhada entre requisições
+        pessoa = await self.cache.get_or_load(pessoa_id, self.loader.load, store=self.cache_fill)
+        if not pessoa:
+            raise _not_found(pessoa_id)
+        return pessoa
+
+    async def get_pessoas(self, pessoa_ids: List[int]) -> List[Optional[PessoaRow]]:
+        """
+        Várias pessoas por id, na ordem pedida (None para as inexistentes).
+        Os ids fora do cache são lidos juntos, em uma única consulta.
+        """
+        if len(pessoa_ids) > BATCH_GET_MAX_IDS:
+            raise ValueError(f"No máximo {BATCH_GET_MAX_IDS} ids por consulta.")
+        return list(await asyncio.gather(*(
+            self.cache.get_or_load(pessoa_id, self.loader.load, store=self.cache_fill)
+            for pessoa_id in pessoa_ids
+        )))
+
+    async def get_pessoa_version(self, pessoa_id: int) -> Optional[datetime]:
+        """
+        Versão (updated_at) atual da pessoa, para GETs condicionais: vem do
+        cache quando a pessoa está nele, senão de uma consulta só da coluna.
+        """
+        cached = await self.cache.peek(pessoa_id)
+        if cached is not None:
+            return cached.updated_at
+        return await self.repo.get_version(pessoa_id)
+
+    async def get_pessoa_by_cpf(self, cpf: str) -> PessoaRow:
+        """Busca pelo CPF em qualquer formatação (uma consulta no índice)."""
+        cpf = normalize_cpf(cpf)
+        if not cpf:
+            raise ValueError("Informe o CPF.")
+        db_pessoa = await self.repo.get_by_cpf(cpf)
         if not db_pessoa:
-            raise ValueError(f"Pessoa com id {pessoa_id} não encontrada.")
+            raise PessoaNotFoundError(f"Pessoa com CPF {cpf} não encontrada.")
         return db_pessoa
 
-    async def list_pessoas(self, skip: int = 0, limit: int = 100) -> List[PessoaModel]:
-        return await self.repo.list(skip=skip, limit=limit)
+    async def list_pessoas_by_celular(self, celular: str, limit: int = 100) -> List[PessoaRow]:
+        """Pessoas com o celular informado, em qualquer formatação."""
+        celular = normalize_celular(celular)
+        if not celular:
+            raise ValueError("Celular inválido.")
+        return await self.repo.list_by_celular(celular, limit=limit)
+
+    async def list_pessoas(
+        self, skip: int = 0, limit: int = 100, order_by: str = "id"
+    ) -> List[PessoaRow]:
+        return await self.repo.list(skip=skip, limit=limit, order_by=order_by)
+
+    async def list_pessoas_page(
+        self,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        skip: int = 0,
+        order_by: str = "id",
+    ) -> Tuple[List[PessoaRow], Optional[str]]:
+        """
+        Lista uma página e devolve também o cursor da próxima página.
+        Com `cursor` usa keyset (a ordenação vem do cursor); sem ele
+        mantém o skip/limit dos clientes antigos.
+        """
+        after = self._page_after(cursor, order_by)
+        if after is not None:
+            pessoas = await self.repo.list_keyset(limit=limit, after=after, order_by=order_by)
+        else:
+            pessoas = await self.repo.list(skip=skip, limit=limit, order_by=order_by)
+
+        next_cursor = None
+        if pessoas and len(pessoas) == limit:
+            next_cursor = encode_cursor(order_by, pessoas[-1])
+        return pessoas, next_cursor
+
+    async def list_pessoas_versions(
+        self,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        skip: int = 0,
+        order_by: str = "id",
+    ) -> List[Tuple[int, datetime]]:
+        """(id, updated_at) da mesma página de list_pessoas_page."""
+        after = self._page_after(cursor, order_by)
+        return await self.repo.list_versions(
+            limit=limit, skip=0 if after is not None else skip, after=after, order_by=order_by
+        )
+
+    @staticmethod
+    def _page_after(cursor: Optional[str], order_by: str) -> Optional[Tuple[Any, ...]]:
+        if order_by not in ORDER_FIELDS:
+            raise ValueError(f"Ordenação inválida: {order_by}.")
+        if not cursor:
+            return None
+        cursor_order, after = decode_cursor(cursor)
+        if cursor_order != order_by:
+            raise ValueError("O cursor não corresponde à ordenação pedida.")
+        return after
+
+    async def list_changes(
+        self, since: Optional[str] = None, limit: int = 1000
+    ) -> Dict[str, Any]:
+        """
+        Feed de mudanças para sincronização incremental: pessoas criadas,
+        alteradas ou removidas depois do token `since` (sem token, desde o
+        início), na ordem em que foram gravadas. Devolve
+        {changes: [{op: upsert|delete, id, pessoa}], next_token, has_more};
+        next_token retoma do ponto em que esta página parou.
+        """
+        after = decode_change_token(since) if since else (0, 0)
+        changes = await self.repo.list_changes(after=after, limit=limit + 1)
+        has_more = len(changes) > limit
+        changes = changes[:limit]
+        if changes:
+            after = changes[-1][:2]
+        return {
+            "changes": [
+                {"op": "upsert" if pessoa else "delete", "id": pessoa_id, "pessoa": pessoa}
+                for _, pessoa_id, pessoa in changes
+            ],
+            "next_token": encode_change_token(*after),
+            "has_more": has_more,
+        }
+
+    async def get_stats(self, dias: int = 30, hoje: Optional[date] = None) -> Dict[str, Any]:
+        """
+        Estatísticas das pessoas a partir dos contadores mantidos nas
+        escritas (sem varrer a tabela): total, por flag, por mês de
+        nascimento, por faixa etária (precisão de mês) e criadas por dia
+        nos últimos `dias` dias.
+        """
+        hoje = hoje or datetime.utcnow().date()
+        desde = hoje - timedelta(days=dias - 1)
+        rows = await self.repo.stats_rows(criacao_desde=desde.isoformat())
+
+        total = 0
+        por_flag: Dict[str, int] = {}
+        por_mes = {f"{mes:02d}": 0 for mes in range(1, 13)}
+        por_mes["sem_data"] = 0
+        por_faixa = {rotulo: 0 for _, rotulo in FAIXAS_ETARIAS}
+        por_faixa["sem_data"] = 0
+        por_dia: Dict[str, int] = {}
+        for dimensao, chave, quantidade in rows:
+            if dimensao == "total":
+                total = quantidade
+            elif dimensao == "flag":
+                rotulo = chave or "sem_flag"
+                por_flag[rotulo] = por_flag.get(rotulo, 0) + quantidade
+            elif dimensao == "nascimento" and not chave:
+                por_mes["sem_data"] += quantidade
+                por_faixa["sem_data"] += quantidade
+            elif dimensao == "nascimento":
+                ano, mes = int(chave[:4]), int(chave[5:7])
+                por_mes[chave[5:7]] += quantidade
+                por_faixa[_faixa_etaria(ano, mes, hoje)] += quantidade
+            elif dimensao == "criacao":
+                por_dia[chave] = quantidade
+
+        return {
+            "total": total,
+            "por_flag": por_flag,
+            "por_mes_nascimento": por_mes,
+            "por_faixa_etaria": por_faixa,
+            "criadas_por_dia": [
+                {"dia": dia, "total": por_dia.get(dia.isoformat(), 0)}
+                for dia in (desde + timedelta(days=n) for n in range(dias))
+            ],
+        }
+
+    async def count_pessoas(self, mode: str = "exact") -> int:
+        """Total de pessoas: exato (contador) ou estimado (estatísticas do planner)."""
+        if mode == "estimated":
+            return await self.repo.estimated_count()
+        return await self.repo.count()
+
+    async def search_pessoas(self, q: str, limit: int = 20) -> List[PessoaRow]:
+        """Busca por nome, sem diferenciar acentos nem maiúsculas."""
+        termo = normalize_nome(q)
+        if not termo:
+            raise ValueError("O termo de busca não pode ser vazio.")
+        return await self.repo.search(termo, limit=limit)
+
+    def stream_pessoas(self, chunk_size: int = 1000) -> AsyncIterator[Sequence[Any]]:
+        """Blocos de linhas da tabela inteira, para exportação."""
+        return self.repo.stream(chunk_size=chunk_size)
 
     async def update_pessoa(
         self,
@@ -48,24 +362,51 @@ class PessoaService:
         cpf: Optional[str] = None,
         data_nascimento: Optional[date] = None,
         flag: Optional[str] = None,
-    ) -> PessoaModel:
-        # usa entidade para validação parcial (nome não vazio se fornecido)
-        if nome is not None and not nome.strip():
-            raise ValueError("O nome da pessoa não pode ser vazio.")
-        pessoa = Pessoa(
-            id=pessoa_id,
-            nome=nome or "",
-            celular=celular,
-            cpf=cpf,
-            data_nascimento=data_nascimento,
-            flag=flag,
-        )
-        updated = await self.repo.update(pessoa_id, pessoa)
+        expected: Optional[Sequence[datetime]] = None,
+    ) -> PessoaRow:
+        # validação parcial com as mesmas regras da entidade: só os
+        # campos informados são validados, normalizados e gravados
+        if nome is not None:
+            check_nome(nome)
+        check_flag(flag)
+        changes = {
+            "nome": nome,
+            "celular": normalize_celular(celular),
+            "cpf": normalize_cpf(cpf),
+            "data_nascimento": data_nascimento,
+            "flag": flag,
+        }
+        try:
+            updated = await self.repo.update_fields(
+                pessoa_id,
+                {attr: val for attr, val in changes.items() if val is not None},
+                expected=expected,
+            )
+        except IntegrityError:
+            raise ValueError("CPF já cadastrado.")
+        await self._invalidate(pessoa_id)
         if not updated:
-            raise ValueError(f"Pessoa com id {pessoa_id} não encontrada.")
+            raise await self._missing_or_changed(pessoa_id, expected)
         return updated
 
-    async def delete_pessoa(self, pessoa_id: int) -> None:
-        deleted = await self.repo.delete(pessoa_id)
+    async def delete_pessoa(
+        self, pessoa_id: int, expected: Optional[Sequence[datetime]] = None
+    ) -> None:
+        deleted = await self.repo.delete(pessoa_id, expected=expected)
+        await self._invalidate(pessoa_id)
         if not deleted:
-            raise ValueError(f"Pessoa com id {pessoa_id} não encontrada.")
+            raise await self._missing_or_changed(pessoa_id, expected)
+
+    async def _invalidate(self, pessoa_id: int) -> None:
+        await self.cache.invalidate(pessoa_id)
+        self.loader.clear(pessoa_id)
+
+    async def _missing_or_changed(
+        self, pessoa_id: int, expected: Optional[Sequence[datetime]]
+    ) -> ValueError:
+        # escrita condicional sem efeito: a pessoa sumiu ou mudou de versão
+        if expected is not None and await self.repo.get_version(pessoa_id) is not None:
+            return PessoaPreconditionFailedError(
+                f"Pessoa com id {pessoa_id} foi alterada desde a versão informada."
+            )
+        return _not_found(pessoa_id)
@@ -2,9 +2,25 @@
 
 from dataclasses import dataclass, field
 from datetime import date, datetime
-from typing import Optional
+from typing import NamedTuple, Optional
 
-@dataclass
+from src.core.pessoas.normalization import normalize_celular, normalize_cpf
+
+# Tamanhos das colunas (PessoaModel): acima deles o banco recusa a linha
+NOME_MAX_LENGTH = 100
+FLAG_MAX_LENGTH = 1
+
+def check_nome(nome: Optional[str]) -> None:
+    if not nome or not nome.strip():
+        raise ValueError("O nome da pessoa não pode ser vazio.")
+    if len(nome) > NOME_MAX_LENGTH:
+        raise ValueError(f"O nome da pessoa deve ter no máximo {NOME_MAX_LENGTH} caracteres.")
+
+def check_flag(flag: Optional[str]) -> None:
+    if flag is not None and len(flag) > FLAG_MAX_LENGTH:
+        raise ValueError(f"A flag deve ter no máximo {FLAG_MAX_LENGTH} caractere.")
+
+@dataclass(slots=True)
 class Pessoa:
     nome: str  # único campo obrigatório
     id: Optional[int] = field(default=None)
@@ -15,5 +31,22 @@ class Pessoa:
     created_at: datetime = field(default_factory=datetime.utcnow)
 
     def __post_init__(self):
-        if not self.nome or not self.nome.strip():
-            raise ValueError("O nome da pessoa não pode ser vazio.")
+        check_nome(self.nome)
+        check_flag(self.flag)
+        # documentos guardados só com dígitos, para bater com os índices
+        self.cpf = normalize_cpf(self.cpf)
+        self.celular = normalize_celular(self.celular)
+
+class PessoaRow(NamedTuple):
+    """
+    Pessoa lida do banco, imutável e sem estado de ORM (tupla compacta).
+    Usada em todas as leituras; os objetos ORM ficam só para as escritas.
+    """
+    id: int
+    nome: str
+    celular: Optional[str]
+    cpf: Optional[str]
+    data_nascimento: Optional[date]
+    flag: Optional[str]
+    created_at: datetime
+    updated_at: datetime
@@ -1,7 +1,7 @@
 # src/core/pessoas/model.py
 
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, Date, Boolean, DateTime
+from sqlalchemy import BigInteger, Column, Integer, String, Date, Boolean, DateTime, Index
 from sqlalchemy.orm import declarative_base
 
 Base = declarative_base()
@@ -11,8 +11,122 @@ class PessoaModel(Base):
 
     id = Column(Integer, primary_key=True, index=True)
     nome = Column(String(100), nullable=False)
+    # nome normalizado (normalize_nome) para a busca; mantido pelo repositório
+    nome_busca = Column(String(100), nullable=True)
+    # cpf e celular guardados só com dígitos (ver Pessoa.__post_init__)
     celular = Column(String(20), nullable=True)
     cpf = Column(String(14), nullable=True)
     data_nascimento = Column(Date, nullable=True)
     flag = Column(String(1), nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    # atualizado em toda escrita pelo repositório; base do ETag/Last-Modified
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+    # versão da última escrita (ver PessoaVersaoModel); feed de mudanças
+    versao = Column(BigInteger, default=0, server_default="0", nullable=False)
+
+    __table_args__ = (
+        # suporta a paginação por cursor ordenada por (created_at, id)
+        Index("ix_pessoas_created_at_id", "created_at", "id"),
+        # chave do upsert em lote (ON CONFLICT (cpf)); NULLs não conflitam
+        Index("ix_pessoas_cpf", "cpf", unique=True),
+        Index("ix_pessoas_celular", "celular"),
+        # feed de mudanças: linhas após o token (versao, id)
+        Index("ix_pessoas_versao_id", "versao", "id"),
+        # busca por prefixo (LIKE 'x%'); o índice trigram (pg_trgm) da
+        # busca por similaridade é criado pela migração 0002
+        Index(
+            "ix_pessoas_nome_busca",
+            "nome_busca",
+            postgresql_ops={"nome_busca": "text_pattern_ops"},
+        ),
+        # SQLite: ids nunca reaproveitados (como a sequence do Postgres);
+        # o feed de mudanças e os ETags contam com isso
+        {"sqlite_autoincrement": True},
+    )
+
+
+class PessoaRemovidaModel(Base):
+    """Tombstone de uma pessoa removida, para o feed de mudanças."""
+    __tablename__ = "pessoas_removidas"
+
+    pessoa_id = Column(Integer, primary_key=True)
+    versao = Column(BigInteger, nullable=False)
+    removida_em = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    __table_args__ = (
+        Index("ix_pessoas_removidas_versao_id", "versao", "pessoa_id"),
+    )
+
+
+class PessoaVersaoModel(Base):
+    """
+    Contador (uma linha só) das versões de pessoas. No SQLite cada escrita
+    o incrementa na própria transação (um escritor por vez). No Postgres
+    ele não muda mais: a versão é o id da transação somado a este valor,
+    que fica acima de todas as versões gravadas pelo contador antes.
+    """
+    __tablename__ = "pessoas_versao"
+
+    id = Column(Integer, primary_key=True)
+    valor = Column(BigInteger, nullable=False)
+
+
+class PessoaEstatisticaModel(Base):
+    """
+    Contadores de pessoas por dimensão, mantidos pelo repositório na mesma
+    transação de cada escrita, com upserts aditivos logo antes do commit.
+    Dimensões e chaves:
+    total ("") | flag (a flag, "" sem flag) | nascimento ("AAAA-MM", ""
+    sem data) | criacao ("AAAA-MM-DD" do created_at).
+    """
+    __tablename__ = "pessoas_estatisticas"
+
+    dimensao = Column(String(20), primary_key=True)
+    chave = Column(String(20), primary_key=True)
+    total = Column(BigInteger, nullable=False, default=0)
+
+
+class ImportacaoModel(Base):
+    """
+    Job de importação de pessoas a partir de um CSV. `processadas` é o
+    número de linhas de dados já gravadas (o ponto de retomada) e avança
+    na mesma transação de cada bloco importado.
+    """
+    __tablename__ = "importacoes"
+
+    id = Column(String(32), primary_key=True)
+    arquivo = Column(String(255), nullable=False)
+    caminho = Column(String(1024), nullable=False)
+    on_conflict = Column(String(20), nullable=True)
+    # pending | running | done | failed
+    status = Column(String(10), nullable=False, default="pending")
+    total_estimado = Column(Integer, nullable=True)
+    processadas = Column(Integer, nullable=False, default=0)
+    criadas = Column(Integer, nullable=False, default=0)
+    atualizadas = Column(Integer, nullable=False, default=0)
+    rejeitadas = Column(Integer, nullable=False, default=0)
+    erro = Column(String(1000), nullable=True)
+    # worker que está processando e até quando a posse vale
+    worker = Column(String(64), nullable=True)
+    lease_until = Column(DateTime, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    started_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
+
+    __table_args__ = (
+        Index("ix_importacoes_status", "status"),
+    )
+
+
+class ImportacaoRejeicaoModel(Base):
+    """Linha rejeitada de uma importação."""
+    __tablename__ = "importacao_rejeicoes"
+
+    id = Column(Integer, primary_key=True)
+    importacao_id = Column(String(32), nullable=False)
+    linha = Column(Integer, nullable=False)
+    motivo = Column(String(500), nullable=False)
+
+    __table_args__ = (
+        Index("ix_importacao_rejeicoes_importacao_linha", "importacao_id", "linha"),
+    )
@@ -0,0 +1,44 @@
+# src/core/pessoas/normalization.py
+
+import unicodedata
+from typing import Optional
+
+
+def normalize_nome(nome: str) -> str:
+    """
+    Forma usada na busca por nome: sem acentos, minúscula e com
+    espaços simples (ex.: "  João  da Silva" -> "joao da silva").
+    """
+    decomposed = unicodedata.normalize("NFKD", nome)
+    sem_acentos = "".join(c for c in decomposed if not unicodedata.combining(c))
+    return " ".join(sem_acentos.casefold().split())
+
+
+def only_digits(value: str) -> str:
+    return "".join(c for c in value if c.isdigit())
+
+
+def normalize_cpf(cpf: Optional[str]) -> Optional[str]:
+    """
+    CPF canônico: só os 11 dígitos (ex.: "123.456.789-00" -> "12345678900").
+    Vazio vira None; qualquer outra quantidade de dígitos é inválida.
+    """
+    if cpf is None or not cpf.strip():
+        return None
+    digits = only_digits(cpf)
+    if len(digits) != 11:
+        raise ValueError("CPF inválido: deve conter 11 dígitos.")
+    return digits
+
+
+def normalize_celular(celular: Optional[str]) -> Optional[str]:
+    """
+    Celular canônico: só dígitos (ex.: "(11) 98765-4321" -> "11987654321").
+    Vazio vira None.
+    """
+    if celular is None or not celular.strip():
+        return None
+    digits = only_digits(celular)
+    if not 8 <= len(digits) <= 15:
+        raise ValueError("Celular inválido: deve conter de 8 a 15 dígitos.")
+    return digits
@@ -0,0 +1,296 @@
+# src/infrastructure/admission.py
+
+import asyncio
+import math
+import time
+from collections import OrderedDict, deque
+from typing import Any, AsyncGenerator, Deque, Dict, Hashable, Optional, Tuple
+
+from fastapi import Depends, HTTPException, Request, status
+from fastapi.responses import StreamingResponse
+from starlette.types import Receive, Scope, Send
+
+from src.infrastructure.auth.jwt_utils import get_current_user
+from src.infrastructure.db.session import pool_capacity
+from src.infrastructure.observability.metrics import REGISTRY, Counter, Gauge, Histogram
+from src.infrastructure.settings import Settings, get_settings
+
+# Controle de admissão das rotas autenticadas, por classe de rota
+# (read/write): um limite de requisições simultâneas com fila limitada
+# (503 quando a fila enche ou a espera passa do tempo) e, opcionalmente,
+# um token bucket por usuário (429). Tudo por processo; os limites vêm das
+# Settings (ADMISSION_*), aplicadas por configure_admission em create_app.
+
+# Rotas POST que só leem; as demais seguem o método (GET/HEAD = read)
+READ_ROUTES = {"/pessoas/batch-get"}
+
+
+class AdmissionRejected(Exception):
+    """Requisição recusada; `outcome` vai para as métricas (shed, timeout, rate_limited)."""
+
+    def __init__(self, outcome: str, retry_after: int):
+        super().__init__(outcome)
+        self.outcome = outcome
+        self.retry_after = retry_after
+
+
+class ConcurrencyLimiter:
+    """
+    Até `limit` requisições ao mesmo tempo; as excedentes esperam em uma
+    fila FIFO de até `queue_size` posições, por no máximo `timeout`
+    segundos. Fila cheia ou espera esgotada rejeitam na hora, em vez de
+    deixar todo mundo esperando pelo pool de conexões.
+    """
+
+    def __init__(self, limit: int, queue_size: int, timeout: float, retry_after: int = 1):
+        self.limit = limit
+        self.queue_size = queue_size
+        self.timeout = timeout
+        self.retry_after = retry_after
+        self.active = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+
+    @property
+    def queued(self) -> int:
+        return len(self._waiters)
+
+    async def acquire(self) -> bool:
+        """Ocupa uma vaga. True se precisou esperar na fila."""
+        if self.active < self.limit and not self._waiters:
+            self.active += 1
+            return False
+        if len(self._waiters) >= self.queue_size:
+            raise AdmissionRejected("shed", self.retry_after)
+        future = asyncio.get_running_loop().create_future()
+        self._waiters.append(future)
+        try:
+            await asyncio.wait_for(future, self.timeout)
+        except asyncio.TimeoutError:
+            if future.done() and not future.cancelled():
+                # a vaga chegou junto com o fim da espera: devolve
+                self.release()
+            self._discard(future)
+            raise AdmissionRejected("timeout", self.retry_after)
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # a vaga chegou junto com o cancelamento: devolve
+                self.release()
+            self._discard(future)
+            raise
+        return True
+
+    def release(self) -> None:
+        # passa a vaga direto para o primeiro da fila (active não muda)
+        while self._waiters:
+            future = self._waiters.popleft()
+            if not future.done():
+                future.set_result(None)
+                return
+        self.active -= 1
+
+    def _discard(self, future: asyncio.Future) -> None:
+        try:
+            self._waiters.remove(future)
+        except ValueError:
+            pass
+
+
+class TokenBuckets:
+    """
+    Um token bucket por chave (usuário): `rate` requisições por segundo,
+    com rajadas de até `burst`. rate <= 0 desliga o limite.
+    """
+
+    def __init__(self, rate: float, burst: float, max_keys: int = 10000):
+        self.rate = rate
+        self.burst = max(burst, 1.0)
+        self.max_keys = max_keys
+        self._buckets: "OrderedDict[Hashable, Tuple[float, float]]" = OrderedDict()
+
+    def take(self, key: Hashable, now: Optional[float] = None) -> None:
+        if self.rate <= 0:
+            return
+        now = time.monotonic() if now is None else now
+        tokens, last = self._buckets.pop(key, (self.burst, now))
+        tokens = min(self.burst, tokens + (now - last) * self.rate)
+        if tokens < 1:
+            self._buckets[key] = (tokens, now)
+            raise AdmissionRejected("rate_limited", math.ceil((1 - tokens) / self.rate))
+        self._buckets[key] = (tokens - 1, now)
+        if len(self._buckets) > self.max_keys:
+            # o mais antigo já estaria cheio de novo ou perto disso
+            self._buckets.popitem(last=False)
+
+
+class RouteClass:
+    def __init__(
+        self,
+        name: str,
+        concurrency: int,
+        queue_size: int,
+        timeout: float,
+        rate: float,
+        burst: float,
+        retry_after: int = 1,
+        max_users: int = 10000,
+    ):
+        self.name = name
+        self.limiter = ConcurrencyLimiter(concurrency, queue_size, timeout, retry_after)
+        self.buckets = TokenBuckets(rate, burst, max_users)
+
+
+def _route_class(settings: Settings, name: str, default_concurrency: int) -> RouteClass:
+    def option(field: str) -> Any:
+        return getattr(settings, f"admission_{name}_{field}")
+
+    concurrency = option("concurrency")
+    if concurrency is None:
+        concurrency = default_concurrency
+    queue_size = option("queue")
+    return RouteClass(
+        name,
+        concurrency=concurrency,
+        queue_size=concurrency * 2 if queue_size is None else queue_size,
+        timeout=option("queue_timeout"),
+        rate=option("user_rate"),
+        burst=option("user_burst"),
+        retry_after=settings.admission_retry_after,
+        max_users=settings.admission_max_users,
+    )
+
+
+# Classes de rota do processo e se a admissão está ligada (configure_admission)
+ROUTE_CLASSES: Dict[str, RouteClass] = {}
+_enabled = True
+
+
+def configure_admission(settings: Settings) -> None:
+    """
+    Monta as classes de rota a partir das Settings. Padrão: as escritas
+    (que seguram a conexão enquanto esperam locks de linhas e dos
+    contadores) ficam com um terço do pool do primário; as leituras, com o
+    resto, ou o pool inteiro quando vão para réplicas.
+    """
+    global _enabled
+    _enabled = settings.admission_enabled
+    capacity = pool_capacity(settings)
+    write_default = max(1, capacity // 3)
+    read_default = capacity if settings.read_urls() else max(1, capacity - write_default)
+    ROUTE_CLASSES.update(
+        read=_route_class(settings, "read", read_default),
+        write=_route_class(settings, "write", write_default),
+    )
+
+
+admission_requests = REGISTRY.register(Counter(
+    "admission_requests_total",
+    "Requisições por classe de rota e resultado da admissão "
+    "(admitted, queued, shed, timeout, rate_limited).",
+    ("class", "outcome"),
+))
+admission_wait = REGISTRY.register(Histogram(
+    "admission_wait_seconds", "Espera na fila de admissão.", ("class",)
+))
+REGISTRY.register(Gauge(
+    "admission_active", "Requisições admitidas em andamento.", ("class",),
+    lambda: {(name,): float(rc.limiter.active) for name, rc in ROUTE_CLASSES.items()},
+))
+REGISTRY.register(Gauge(
+    "admission_queued", "Requisições esperando na fila de admissão.", ("class",),
+    lambda: {(name,): float(rc.limiter.queued) for name, rc in ROUTE_CLASSES.items()},
+))
+
+
+class AdmissionSlot:
+    """
+    Vaga admitida de uma requisição. A dependência `admission` a devolve
+    no fim do endpoint, a menos que uma resposta em streaming a tenha
+    tomado (StreamingAdmissionResponse): aí ela sai só no fim do envio.
+    """
+
+    def __init__(self, limiter: ConcurrencyLimiter):
+        self._limiter = limiter
+        self._held = True
+        self.detached = False
+
+    def detach(self) -> "AdmissionSlot":
+        self.detached = True
+        return self
+
+    def release(self) -> None:
+        if self._held:
+            self._held = False
+            self._limiter.release()
+
+
+class StreamingAdmissionResponse(StreamingResponse):
+    """
+    StreamingResponse que segura a vaga de admissão até o corpo terminar
+    de ser enviado: o gerador usa conexão do pool depois que o endpoint
+    (e a dependência de admissão) já retornou.
+    """
+
+    def __init__(self, content: Any, slot: Optional[AdmissionSlot], **kwargs: Any):
+        super().__init__(content, **kwargs)
+        self.slot = slot.detach() if slot is not None else None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            if self.slot is not None:
+                self.slot.release()
+
+
+def route_class_of(request: Request) -> str:
+    route = request.scope.get("route")
+    if getattr(route, "path", None) in READ_ROUTES or request.method in ("GET", "HEAD"):
+        return "read"
+    return "write"
+
+
+async def admission(
+    request: Request,
+    current_user: Dict[str, Any] = Depends(get_current_user),
+) -> AsyncGenerator[Optional[AdmissionSlot], None]:
+    """
+    Dependência FastAPI: admite a requisição (ou responde 429/503 com
+    Retry-After) e segura a vaga até o fim do endpoint. Devolve a vaga
+    (None com a admissão desligada), para as respostas em streaming.
+    """
+    if not ROUTE_CLASSES:
+        configure_admission(get_settings())
+    if not _enabled:
+        yield None
+        return
+    route_class = ROUTE_CLASSES[route_class_of(request)]
+    try:
+        route_class.buckets.take(current_user["id"])
+    except AdmissionRejected as e:
+        admission_requests.inc((route_class.name, e.outcome))
+        raise HTTPException(
+            status.HTTP_429_TOO_MANY_REQUESTS,
+            "Muitas requisições; tente novamente mais tarde.",
+            headers={"Retry-After": str(e.retry_after)},
+        )
+
+    start = time.perf_counter()
+    try:
+        queued = await route_class.limiter.acquire()
+    except AdmissionRejected as e:
+        admission_requests.inc((route_class.name, e.outcome))
+        raise HTTPException(
+            status.HTTP_503_SERVICE_UNAVAILABLE,
+            "Servidor sobrecarregado; tente novamente mais tarde.",
+            headers={"Retry-After": str(e.retry_after)},
+        )
+    if queued:
+        admission_requests.inc((route_class.name, "queued"))
+        admission_wait.observe(time.perf_counter() - start, (route_class.name,))
+    admission_requests.inc((route_class.name, "admitted"))
+    slot = AdmissionSlot(route_class.limiter)
+    try:
+        yield slot
+    finally:
+        if not slot.detached:
+            slot.release()
@@ -1,26 +1,57 @@
 # src/infrastructure/auth/jwt_utils.py
 
+import hashlib
 import os
+import time
 from datetime import datetime, timedelta
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Tuple
 
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 import jwt
 from dotenv import load_dotenv
 
+from src.infrastructure.cache.backends import MISSING, MemoryLRUCache
+from src.infrastructure.settings import get_settings
+
 # 1) Carrega .env
 load_dotenv()
 
-# 2) Segredo e configurações HS256
-JWT_SECRET = os.getenv("JWT_SECRET")
-if not JWT_SECRET:
-    raise RuntimeError("JWT_SECRET não definido no .env")
+# 2) Segredo e configurações HS256. O segredo é lido no primeiro uso
+# (ou definido por configure_jwt no create_app), não na importação.
+_jwt_secret: Optional[str] = None
 ALGORITHM = "HS256"
 
+def configure_jwt(secret: Optional[str]) -> None:
+    global _jwt_secret
+    _jwt_secret = secret
+    # tokens verificados (ou recusados) com o segredo anterior
+    token_cache.clear()
+
+def jwt_secret() -> str:
+    global _jwt_secret
+    if not _jwt_secret:
+        _jwt_secret = get_settings().jwt_secret
+        if not _jwt_secret:
+            raise RuntimeError("JWT_SECRET não definido no .env")
+    return _jwt_secret
+
 # Esquema Bearer simples
 security = HTTPBearer()
 
+# 3) Cache de tokens já verificados, chaveado pelo hash do token.
+# Entradas válidas expiram junto com o `exp` do token (limitadas por
+# JWT_CACHE_MAX_TTL); tokens inválidos ficam em cache negativo curto.
+JWT_CACHE_MAX_TTL = float(os.getenv("JWT_CACHE_MAX_TTL", "300"))
+JWT_CACHE_NEGATIVE_TTL = float(os.getenv("JWT_CACHE_NEGATIVE_TTL", "5"))
+token_cache = MemoryLRUCache(
+    maxsize=int(os.getenv("JWT_CACHE_MAXSIZE", "10000")),
+    ttl=JWT_CACHE_MAX_TTL,
+)
+
+def token_cache_stats() -> Dict[str, int]:
+    return token_cache.stats()
+
 def decode_access_token(token: str) -> Dict[str, Any]:
     """
     Decodifica o JWT e retorna um dict com campos essenciais.
@@ -28,9 +59,34 @@ def decode_access_token(token: str) -> Dict[str, Any]:
       - id: int
       - email: str
       - isSuperUser: bool
+    Tokens já verificados são servidos do cache até o seu `exp`.
     """
+    key = hashlib.sha256(token.encode()).digest()
+    cached = token_cache.get_nowait(key)
+    if cached is not MISSING:
+        if isinstance(cached, str):
+            # cache negativo: guarda só o detalhe do 401
+            raise HTTPException(status.HTTP_401_UNAUTHORIZED, cached)
+        user, exp = cached
+        # nunca aceita do cache um token já expirado
+        if exp is not None and exp <= time.time():
+            token_cache.delete_nowait(key)
+            raise HTTPException(status.HTTP_401_UNAUTHORIZED, "Token expirado")
+        return dict(user)
+
     try:
-        payload = jwt.decode(token, JWT_SECRET, algorithms=[ALGORITHM])
+        user, exp = _verify_token(token)
+    except HTTPException as e:
+        token_cache.set_nowait(key, e.detail, ttl=JWT_CACHE_NEGATIVE_TTL)
+        raise
+
+    ttl = JWT_CACHE_MAX_TTL if exp is None else min(exp - time.time(), JWT_CACHE_MAX_TTL)
+    token_cache.set_nowait(key, (user, exp), ttl=ttl)
+    return dict(user)
+
+def _verify_token(token: str) -> Tuple[Dict[str, Any], Optional[float]]:
+    try:
+        payload = jwt.decode(token, jwt_secret(), algorithms=[ALGORITHM])
     except jwt.ExpiredSignatureError:
         raise HTTPException(status.HTTP_401_UNAUTHORIZED, "Token expirado")
     except jwt.PyJWTError:
@@ -43,11 +99,13 @@ def decode_access_token(token: str) -> Dict[str, Any]:
     if user_id is None or email is None or is_superuser is None:
         raise HTTPException(status.HTTP_401_UNAUTHORIZED, "Token inválido")
 
-    return {
+    user = {
         "id": user_id,
         "email": email,
         "is_superuser": is_superuser
     }
+    exp = payload.get("exp")
+    return user, float(exp) if exp is not None else None
 
 async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security)
@@ -58,3 +116,25 @@ async def get_current_user(
     """
     token = credentials.credentials
     return decode_access_token(token)
+
+async def require_superuser(
+    current_user: Dict[str, Any] = Depends(get_current_user),
+) -> Dict[str, Any]:
+    """Dependência das rotas administrativas: só superusuários (403)."""
+    if not current_user.get("is_superuser"):
+        raise HTTPException(status.HTTP_403_FORBIDDEN, "Acesso restrito a superusuários.")
+    return current_user
+
+def peek_superuser(authorization: Optional[str]) -> bool:
+    """
+    O header Authorization traz um token válido de superusuário? Verifica
+    sem passar pelo cache de tokens (não altera o que a requisição mede).
+    """
+    scheme, _, token = (authorization or "").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return False
+    try:
+        user, _ = _verify_token(token)
+    except HTTPException:
+        return False
+    return bool(user["is_superuser"])
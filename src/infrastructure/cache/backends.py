@@ -0,0 +1,99 @@
+# src/infrastructure/cache/backends.py
+
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional
+
+# Marca "não encontrado" (None pode ser um valor válido em cache)
+MISSING = object()
+
+
+class CacheBackend(ABC):
+    """
+    Interface dos backends de cache. É assíncrona para que um cache
+    compartilhado (ex.: Redis) possa ser plugado sem mudar quem usa.
+    """
+
+    @abstractmethod
+    async def get(self, key: Hashable) -> Any:
+        """Retorna o valor ou MISSING."""
+
+    @abstractmethod
+    async def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """Grava o valor; `ttl` (segundos) sobrepõe o TTL padrão."""
+
+    @abstractmethod
+    async def delete(self, key: Hashable) -> None:
+        ...
+
+    @abstractmethod
+    def stats(self) -> Dict[str, int]:
+        ...
+
+
+class MemoryLRUCache(CacheBackend):
+    """
+    Cache em memória do processo, limitado por tamanho (LRU) e por TTL.
+    """
+
+    def __init__(self, maxsize: int = 10000, ttl: float = 30.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, tuple[float, Any]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get_nowait(self, key: Hashable) -> Any:
+        entry = self._data.get(key)
+        if entry is None:
+            self.misses += 1
+            return MISSING
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._data[key]
+            self.expirations += 1
+            self.misses += 1
+            return MISSING
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set_nowait(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        if self.maxsize <= 0:
+            return
+        ttl = self.ttl if ttl is None else ttl
+        if ttl <= 0:
+            self._data.pop(key, None)
+            return
+        self._data[key] = (time.monotonic() + ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def delete_nowait(self, key: Hashable) -> None:
+        self._data.pop(key, None)
+
+    async def get(self, key: Hashable) -> Any:
+        return self.get_nowait(key)
+
+    async def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        self.set_nowait(key, value, ttl)
+
+    async def delete(self, key: Hashable) -> None:
+        self.delete_nowait(key)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "size": len(self._data),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
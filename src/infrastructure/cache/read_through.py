@@ -0,0 +1,89 @@
+# src/infrastructure/cache/read_through.py
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple
+
+from src.infrastructure.cache.backends import MISSING, CacheBackend
+
+
+class _Flight:
+    """Carga em andamento para uma chave (single-flight)."""
+
+    __slots__ = ("future", "stale")
+
+    def __init__(self, future: asyncio.Future):
+        self.future = future
+        self.stale = False
+
+
+class ReadThroughCache:
+    """
+    Cache read-through sobre um CacheBackend.
+    Misses concorrentes da mesma chave são coalescidos em uma única
+    carga; uma invalidação durante a carga impede que o valor lido
+    (possivelmente antigo) seja gravado no cache.
+    Valores None (não encontrado) não são guardados, nem os lidos com
+    store=False (de uma réplica, possivelmente atrasada); essas cargas não
+    se juntam às que gravam no cache, e vice-versa.
+    """
+
+    def __init__(self, backend: CacheBackend):
+        self.backend = backend
+        # (chave, store) -> carga em andamento
+        self._inflight: Dict[Tuple[Hashable, bool], _Flight] = {}
+        self.coalesced = 0
+
+    async def get_or_load(
+        self, key: Hashable, loader: Callable[[Hashable], Awaitable[Any]], store: bool = True
+    ) -> Any:
+        value = await self.backend.get(key)
+        if value is not MISSING:
+            return value
+
+        flight_key = (key, store)
+        flight = self._inflight.get(flight_key)
+        if flight is not None:
+            self.coalesced += 1
+            try:
+                return await asyncio.shield(flight.future)
+            except asyncio.CancelledError:
+                # só segue carregando se quem foi cancelado foi o líder
+                if not flight.future.cancelled():
+                    raise
+
+        flight = _Flight(asyncio.get_running_loop().create_future())
+        # evita o aviso de "exception was never retrieved" sem seguidores
+        flight.future.add_done_callback(lambda f: f.cancelled() or f.exception())
+        self._inflight[flight_key] = flight
+        try:
+            value = await loader(key)
+        except asyncio.CancelledError:
+            flight.future.cancel()
+            raise
+        except Exception as e:
+            flight.future.set_exception(e)
+            raise
+        finally:
+            if self._inflight.get(flight_key) is flight:
+                del self._inflight[flight_key]
+
+        flight.future.set_result(value)
+        if value is not None and store and not flight.stale:
+            await self.backend.set(key, value)
+        return value
+
+    async def peek(self, key: Hashable) -> Any:
+        """Valor em cache, sem carregar (None se ausente)."""
+        value = await self.backend.get(key)
+        return None if value is MISSING else value
+
+    async def invalidate(self, key: Hashable) -> None:
+        await self.backend.delete(key)
+        # leitores que chegarem depois da escrita não reaproveitam a carga antiga
+        for store in (True, False):
+            flight = self._inflight.pop((key, store), None)
+            if flight is not None:
+                flight.stale = True
+
+    def stats(self) -> Dict[str, int]:
+        return {**self.backend.stats(), "coalesced": self.coalesced}
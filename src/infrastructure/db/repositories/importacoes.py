@@ -0,0 +1,157 @@
+# src/infrastructure/db/repositories/importacoes.py
+
+from datetime import datetime, timedelta
+from typing import Any, List, Optional, Sequence, Tuple
+
+from sqlalchemy import func, insert, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.pessoas.model import ImportacaoModel, ImportacaoRejeicaoModel
+
+# status em que o job ainda tem trabalho
+ATIVOS = ("pending", "running")
+
+
+class ImportacaoRepository:
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def create(self, **values) -> ImportacaoModel:
+        try:
+            result = await self.session.execute(
+                insert(ImportacaoModel).values(**values).returning(ImportacaoModel)
+            )
+            job = result.scalar_one()
+            await self.session.commit()
+        except Exception:
+            await self.session.rollback()
+            raise
+        return job
+
+    async def get(self, job_id: str) -> Optional[Any]:
+        # linha do Core (sem identity map): sempre o estado atual do job
+        result = await self.session.execute(
+            select(*ImportacaoModel.__table__.c).where(ImportacaoModel.id == job_id)
+        )
+        return result.first()
+
+    async def list_rejeicoes(self, job_id: str, limit: int = 100) -> List[Tuple[int, str]]:
+        result = await self.session.execute(
+            select(ImportacaoRejeicaoModel.linha, ImportacaoRejeicaoModel.motivo)
+            .where(ImportacaoRejeicaoModel.importacao_id == job_id)
+            .order_by(ImportacaoRejeicaoModel.linha)
+            .limit(limit)
+        )
+        return [tuple(row) for row in result]
+
+    async def claimable(self) -> List[str]:
+        """Jobs com trabalho pendente e sem dono (posse expirada ou liberada)."""
+        result = await self.session.execute(
+            select(ImportacaoModel.id)
+            .where(
+                ImportacaoModel.status.in_(ATIVOS),
+                or_(
+                    ImportacaoModel.lease_until.is_(None),
+                    ImportacaoModel.lease_until < datetime.utcnow(),
+                ),
+            )
+            .order_by(ImportacaoModel.created_at)
+        )
+        return list(result.scalars())
+
+    async def claim(self, job_id: str, worker: str, lease_seconds: float) -> Optional[ImportacaoModel]:
+        """
+        Toma posse do job por `lease_seconds` (renovada a cada bloco).
+        None se o job já terminou ou outro worker está com ele.
+        """
+        now = datetime.utcnow()
+        try:
+            result = await self.session.execute(
+                update(ImportacaoModel)
+                .where(
+                    ImportacaoModel.id == job_id,
+                    ImportacaoModel.status.in_(ATIVOS),
+                    or_(
+                        ImportacaoModel.lease_until.is_(None),
+                        ImportacaoModel.lease_until < now,
+                        ImportacaoModel.worker == worker,
+                    ),
+                )
+                .values(
+                    status="running",
+                    worker=worker,
+                    lease_until=now + timedelta(seconds=lease_seconds),
+                    started_at=func.coalesce(ImportacaoModel.started_at, now),
+                )
+                .returning(ImportacaoModel)
+            )
+            job = result.scalars().first()
+            await self.session.commit()
+        except Exception:
+            await self.session.rollback()
+            raise
+        return job
+
+    async def record_chunk(
+        self,
+        job_id: str,
+        worker: str,
+        start: int,
+        processadas: int,
+        criadas: int,
+        atualizadas: int,
+        rejeicoes: Sequence[Tuple[int, str]],
+        lease_seconds: float,
+    ) -> bool:
+        """
+        Avança o progresso de `start` para `processadas` e grava as
+        rejeições do bloco, sem commit: vai na mesma transação das pessoas.
+        False se o job não está mais com este worker nesse ponto (a
+        transação deve ser desfeita).
+        """
+        result = await self.session.execute(
+            update(ImportacaoModel)
+            .where(
+                ImportacaoModel.id == job_id,
+                ImportacaoModel.worker == worker,
+                ImportacaoModel.processadas == start,
+            )
+            .values(
+                processadas=processadas,
+                criadas=ImportacaoModel.criadas + criadas,
+                atualizadas=ImportacaoModel.atualizadas + atualizadas,
+                rejeitadas=ImportacaoModel.rejeitadas + len(rejeicoes),
+                lease_until=datetime.utcnow() + timedelta(seconds=lease_seconds),
+            )
+            .returning(ImportacaoModel.id)
+        )
+        if result.first() is None:
+            return False
+        if rejeicoes:
+            await self.session.execute(
+                insert(ImportacaoRejeicaoModel),
+                [
+                    {"importacao_id": job_id, "linha": linha, "motivo": motivo[:500]}
+                    for linha, motivo in rejeicoes
+                ],
+            )
+        return True
+
+    async def finish(self, job_id: str, worker: str, status: str, erro: Optional[str] = None) -> None:
+        await self._release(job_id, worker, status=status, erro=erro, finished_at=datetime.utcnow())
+
+    async def release(self, job_id: str, worker: str) -> None:
+        """Devolve o job (ex.: no desligamento) para outro worker retomar já."""
+        await self._release(job_id, worker)
+
+    async def _release(self, job_id: str, worker: str, **values) -> None:
+        try:
+            await self.session.execute(
+                update(ImportacaoModel)
+                .where(ImportacaoModel.id == job_id, ImportacaoModel.worker == worker)
+                .values(worker=None, lease_until=None, **values)
+            )
+            await self.session.commit()
+        except Exception:
+            await self.session.rollback()
+            raise
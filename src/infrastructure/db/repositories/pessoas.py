@@ -1,59 +1,649 @@
 # src/infrastructure/db/repositories/pessoas.py
 
-from typing import List, Optional
-from sqlalchemy import select
+from collections import Counter
+from datetime import date, datetime
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence, Tuple
+from sqlalchemy import ARRAY, BigInteger, Integer, Text, any_, bindparam, cast, delete, func, insert, literal, literal_column, or_, select, text, tuple_, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.core.pessoas.entity import Pessoa
-from src.core.pessoas.model import PessoaModel
+from src.core.pessoas.entity import Pessoa, PessoaRow
+from src.core.pessoas.model import (
+    PessoaEstatisticaModel,
+    PessoaModel,
+    PessoaRemovidaModel,
+    PessoaVersaoModel,
+)
+from src.core.pessoas.normalization import normalize_nome
+
+# Campos graváveis da pessoa (tudo menos id e created_at)
+FIELDS = ("nome", "celular", "cpf", "data_nascimento", "flag")
+
+# Colunas expostas na leitura (mesmos campos de PessoaRead)
+READ_COLUMNS = (
+    PessoaModel.id,
+    PessoaModel.nome,
+    PessoaModel.celular,
+    PessoaModel.cpf,
+    PessoaModel.data_nascimento,
+    PessoaModel.flag,
+    PessoaModel.created_at,
+)
+
+# Colunas da PessoaRow: as de leitura mais a versão (updated_at)
+ROW_COLUMNS = READ_COLUMNS + (PessoaModel.updated_at,)
+
+# Parâmetros por comando: o asyncpg recusa mais de 32767 (e o SQLite, a
+# partir da 3.32, mais de 32766); folga para os parâmetros fixos
+MAX_QUERY_PARAMETERS = 32000
+# Parâmetros por linha do INSERT em lote: os campos, nome_busca, created_at,
+# updated_at e versao, mais o CPF da checagem de inserida sem xmax (SQLite)
+UPSERT_PARAMETERS_PER_ROW = len(FIELDS) + 5
+# Linhas por INSERT em lote, qualquer que seja o batch_size pedido
+UPSERT_MAX_ROWS = MAX_QUERY_PARAMETERS // UPSERT_PARAMETERS_PER_ROW
+
+# pg_trgm instalado? (verificado uma vez por processo)
+_trgm_available: Optional[bool] = None
+
+def _write_values(pessoa: Pessoa) -> Dict[str, Any]:
+    return _with_nome_busca({attr: getattr(pessoa, attr) for attr in FIELDS})
+
+def _with_nome_busca(values: Dict[str, Any]) -> Dict[str, Any]:
+    if values.get("nome") is not None:
+        values["nome_busca"] = normalize_nome(values["nome"])
+    return values
+
+def _rows(result) -> List[PessoaRow]:
+    # linhas do Core (SELECT de ROW_COLUMNS) -> PessoaRow, sem identity map
+    return [PessoaRow._make(row) for row in result]
+
+def _row(result) -> Optional[PessoaRow]:
+    row = result.first()
+    return PessoaRow._make(row) if row is not None else None
+
+def _stat_keys(
+    flag: Optional[str], data_nascimento: Optional[date], created_at: datetime
+) -> Tuple[Tuple[str, str], ...]:
+    # (dimensao, chave) de PessoaEstatisticaModel em que a pessoa é contada
+    nascimento = (
+        f"{data_nascimento.year:04d}-{data_nascimento.month:02d}" if data_nascimento else ""
+    )
+    return (
+        ("total", ""),
+        ("flag", flag or ""),
+        ("nascimento", nascimento),
+        ("criacao", f"{created_at.year:04d}-{created_at.month:02d}-{created_at.day:02d}"),
+    )
+
+def _count(deltas: Counter, row, sign: int) -> None:
+    for key in _stat_keys(row.flag, row.data_nascimento, row.created_at):
+        deltas[key] += sign
+
+def _xid_version(xid) -> Any:
+    # id de transação (xid8) -> versão: somado ao último valor do contador
+    # de versões, para ficar acima das versões gravadas antes dele
+    base = select(PessoaVersaoModel.valor).where(PessoaVersaoModel.id == 1).scalar_subquery()
+    return cast(cast(xid, Text), BigInteger) + func.coalesce(base, 0)
+
+def _escape_like(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
 
 class PessoaRepository:
+    """
+    Acesso às pessoas no Postgres (asyncpg) ou no SQLite (aiosqlite). As
+    diferenças de dialeto (upsert, ANY(array), xmax, pg_trgm,
+    estatísticas do planner) ficam aqui dentro.
+    """
+
     def __init__(self, session: AsyncSession):
         self.session = session
 
+    @property
+    def dialect(self) -> str:
+        return self.session.get_bind().dialect.name
+
+    def _insert(self, model):
+        # INSERT com ON CONFLICT (mesma API nos dois dialetos)
+        return (sqlite_insert if self.dialect == "sqlite" else pg_insert)(model)
+
+    def _in(self, column, name: str, values: Sequence[Any], type_):
+        # Postgres: = ANY(:array), um só parâmetro (statement preparado
+        # reaproveitado para qualquer quantidade); SQLite: IN expandido
+        if self.dialect == "postgresql":
+            return column == any_(bindparam(name, values, type_=ARRAY(type_)))
+        return column.in_(bindparam(name, values, expanding=True))
+
+    async def _next_version(self) -> int:
+        """
+        Versão das escritas da transação corrente. No Postgres vem do id da
+        transação (pg_current_xact_id), sem lock: escritas concorrentes não
+        esperam umas pelas outras, e list_changes só entrega as versões
+        abaixo da transação ativa mais antiga. No SQLite (um escritor por
+        vez) incrementa o contador; o comando já toma o lock de escrita.
+        """
+        if self.dialect == "postgresql":
+            return await self.session.scalar(select(_xid_version(func.pg_current_xact_id())))
+        stmt = self._insert(PessoaVersaoModel).values(id=1, valor=1)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[PessoaVersaoModel.id],
+            set_={"valor": PessoaVersaoModel.valor + 1},
+        )
+        return await self.session.scalar(stmt.returning(PessoaVersaoModel.valor))
+
     async def create(self, pessoa: Pessoa) -> PessoaModel:
-        db_pessoa = PessoaModel(
-            nome=pessoa.nome,
-            celular=pessoa.celular,
-            cpf=pessoa.cpf,
-            data_nascimento=pessoa.data_nascimento,
-            flag=pessoa.flag
-        )
-        self.session.add(db_pessoa)
-        await self.session.commit()
-        await self.session.refresh(db_pessoa)
+        # INSERT ... RETURNING: dispensa o refresh depois do commit
+        try:
+            versao = await self._next_version()
+            result = await self.session.execute(
+                insert(PessoaModel)
+                .values(**_write_values(pessoa), versao=versao)
+                .returning(PessoaModel)
+            )
+            db_pessoa = result.scalar_one()
+            deltas: Counter = Counter()
+            _count(deltas, db_pessoa, 1)
+            await self._apply_stats(deltas)
+            await self.session.commit()
+        except Exception:
+            await self.session.rollback()
+            raise
         return db_pessoa
 
-    async def get_by_id(self, pessoa_id: int) -> Optional[PessoaModel]:
+    async def create_many(self, pessoas: List[Pessoa]) -> List[Optional[PessoaRow]]:
+        """
+        Cria as pessoas com um único INSERT de várias linhas, em uma
+        transação (um commit para todas). Retorna, na ordem de entrada, a
+        linha criada ou None se o CPF já estava cadastrado. Os CPFs não
+        podem se repetir dentro de `pessoas`. Acima de UPSERT_MAX_ROWS
+        linhas o INSERT é dividido, ainda na mesma transação.
+        """
+        if not pessoas:
+            return []
+        try:
+            versao = await self._next_version()
+            now = datetime.utcnow()
+            rows: List[PessoaRow] = []
+            for start in range(0, len(pessoas), UPSERT_MAX_ROWS):
+                stmt = self._insert(PessoaModel).values([
+                    {**_write_values(p), "created_at": now, "updated_at": now, "versao": versao}
+                    for p in pessoas[start:start + UPSERT_MAX_ROWS]
+                ])
+                result = await self.session.execute(
+                    stmt.on_conflict_do_nothing(index_elements=[PessoaModel.cpf]).returning(*ROW_COLUMNS)
+                )
+                rows.extend(_rows(result))
+            deltas: Counter = Counter()
+            for row in rows:
+                _count(deltas, row, 1)
+            await self._apply_stats(deltas)
+            await self.session.commit()
+        except Exception:
+            await self.session.rollback()
+            raise
+        created: List[Optional[PessoaRow]] = [None] * len(pessoas)
+        # mesma associação de _match_rows: pelo CPF, senão pela ordem
+        by_cpf = {p.cpf: pos for pos, p in enumerate(pessoas) if p.cpf is not None}
+        sem_cpf = iter([pos for pos, p in enumerate(pessoas) if p.cpf is None])
+        for row in rows:
+            created[by_cpf[row.cpf] if row.cpf is not None else next(sem_cpf)] = row
+        return created
+
+    async def bulk_upsert(
+        self,
+        pessoas: List[Pessoa],
+        conflict_key: Optional[str] = None,
+        batch_size: int = 1000,
+        commit: bool = True,
+    ) -> List[Optional[Tuple[int, bool]]]:
+        """
+        Grava as pessoas com INSERTs de várias linhas, em uma única transação.
+        Com conflict_key="cpf" faz upsert (atualiza os campos não nulos da
+        pessoa já cadastrada); sem ele, CPFs já existentes são ignorados.
+        Retorna, na ordem de entrada, (id, criado) ou None se ignorada.
+        Os CPFs não podem se repetir dentro de `pessoas`.
+        Com commit=False a transação fica aberta (commit/rollback por conta
+        de quem chamou), para gravar mais coisas junto com as pessoas.
+        O batch_size é limitado a UPSERT_MAX_ROWS (limite de parâmetros).
+        """
+        results: List[Optional[Tuple[int, bool]]] = [None] * len(pessoas)
+        if not pessoas:
+            return results
+        batch_size = min(batch_size, UPSERT_MAX_ROWS)
+        try:
+            versao = await self._next_version()
+            deltas: Counter = Counter()
+            for start in range(0, len(pessoas), batch_size):
+                pendentes = list(range(start, min(start + batch_size, len(pessoas))))
+                while pendentes:
+                    chunk = [pessoas[index] for index in pendentes]
+                    # estado anterior das que vão ser atualizadas (travadas
+                    # até o commit), para as estatísticas
+                    old = await self._current_by_cpf(chunk) if conflict_key == "cpf" else {}
+                    rows = await self._execute_upsert(chunk, conflict_key, versao, old)
+                    for row in rows:
+                        if not row.inserted:
+                            _count(deltas, old[row.cpf], -1)
+                        _count(deltas, row, 1)
+                    gravadas = set()
+                    for pos, row in self._match_rows(chunk, rows):
+                        results[pendentes[pos]] = row
+                        gravadas.add(pos)
+                    if conflict_key != "cpf" or self.dialect != "postgresql":
+                        break
+                    # CPFs inseridos por outra transação depois da leitura
+                    # ficaram de fora do upsert: de novo, com o estado deles
+                    pendentes = [index for pos, index in enumerate(pendentes) if pos not in gravadas]
+            await self._apply_stats(deltas)
+            if commit:
+                await self.session.commit()
+        except Exception:
+            if commit:
+                await self.session.rollback()
+            raise
+        return results
+
+    async def _execute_upsert(
+        self, chunk: List[Pessoa], conflict_key: Optional[str], versao: int, old: Dict[str, Any]
+    ):
+        now = datetime.utcnow()
+        stmt = self._insert(PessoaModel).values([
+            {**_write_values(p), "created_at": p.created_at, "updated_at": now, "versao": versao}
+            for p in chunk
+        ])
+        if conflict_key == "cpf":
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[PessoaModel.cpf],
+                set_={
+                    **{
+                        attr: func.coalesce(stmt.excluded[attr], PessoaModel.__table__.c[attr])
+                        for attr in FIELDS + ("nome_busca",)
+                    },
+                    "updated_at": now,
+                    "versao": versao,
+                },
+                # Postgres: só as lidas (e travadas) em `old`, cujo estado
+                # anterior as estatísticas conhecem; as demais não voltam
+                where=(
+                    self._in(PessoaModel.cpf, "travados", list(old), PessoaModel.cpf.type)
+                    if self.dialect == "postgresql" else None
+                ),
+            )
+        else:
+            stmt = stmt.on_conflict_do_nothing(index_elements=[PessoaModel.cpf])
+        if self.dialect == "postgresql":
+            # xmax = 0 só é verdadeiro para linhas recém-inseridas
+            inserted = literal_column("xmax = 0")
+        elif old:
+            # sem xmax: atualizadas são as que já existiam (lidas na
+            # mesma transação, depois do lock de escrita do contador de versões)
+            inserted = PessoaModel.cpf.is_(None) | PessoaModel.cpf.not_in(list(old))
+        else:
+            inserted = literal(True)
+        stmt = stmt.returning(
+            PessoaModel.id,
+            PessoaModel.cpf,
+            PessoaModel.flag,
+            PessoaModel.data_nascimento,
+            PessoaModel.created_at,
+            inserted.label("inserted"),
+        )
+        result = await self.session.execute(stmt)
+        return result.all()
+
+    async def _current_by_cpf(self, chunk: List[Pessoa]) -> Dict[str, Any]:
+        cpfs = [p.cpf for p in chunk if p.cpf is not None]
+        if not cpfs:
+            return {}
         result = await self.session.execute(
-            select(PessoaModel).where(PessoaModel.id == pessoa_id)
+            select(
+                PessoaModel.cpf, PessoaModel.flag, PessoaModel.data_nascimento, PessoaModel.created_at
+            )
+            .where(self._in(PessoaModel.cpf, "cpfs", cpfs, PessoaModel.cpf.type))
+            # trava até o commit (em ordem, contra deadlocks): ninguém muda
+            # o estado anterior antes do upsert
+            .order_by(PessoaModel.cpf)
+            .with_for_update()
+        )
+        return {row.cpf: row for row in result}
+
+    async def _apply_stats(self, deltas: Counter) -> None:
+        """
+        Soma `deltas` ({(dimensao, chave): n}) aos contadores de
+        PessoaEstatisticaModel, com um único upsert atômico, como último
+        comando antes do commit: as linhas dos contadores ficam travadas só
+        durante o commit (e em ordem de chave, sem deadlock entre escritas).
+        """
+        values = [
+            {"dimensao": dimensao, "chave": chave, "total": total}
+            for (dimensao, chave), total in sorted(deltas.items())
+            if total
+        ]
+        if not values:
+            return
+        stmt = self._insert(PessoaEstatisticaModel).values(values)
+        await self.session.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[PessoaEstatisticaModel.dimensao, PessoaEstatisticaModel.chave],
+                set_={"total": PessoaEstatisticaModel.total + stmt.excluded.total},
+            )
         )
-        return result.scalars().first()
 
-    async def list(self, skip: int = 0, limit: int = 100) -> List[PessoaModel]:
+    async def stats_rows(self, criacao_desde: str) -> List[Tuple[str, str, int]]:
+        """
+        Contadores (dimensao, chave, total) não zerados, com os dias de
+        criação a partir de `criacao_desde` ("AAAA-MM-DD"). O tamanho não
+        depende do número de pessoas.
+        """
         result = await self.session.execute(
-            select(PessoaModel).offset(skip).limit(limit)
+            select(
+                PessoaEstatisticaModel.dimensao,
+                PessoaEstatisticaModel.chave,
+                PessoaEstatisticaModel.total,
+            ).where(
+                PessoaEstatisticaModel.total != 0,
+                or_(
+                    PessoaEstatisticaModel.dimensao != "criacao",
+                    PessoaEstatisticaModel.chave >= criacao_desde,
+                ),
+            )
         )
-        return result.scalars().all()
+        return [tuple(row) for row in result]
 
-    async def update(self, pessoa_id: int, pessoa: Pessoa) -> Optional[PessoaModel]:
-        db_pessoa = await self.get_by_id(pessoa_id)
-        if not db_pessoa:
-            return None
-        # Atualiza apenas campos não None
-        for attr in ("nome", "celular", "cpf", "data_nascimento", "flag"):
-            val = getattr(pessoa, attr)
-            if val is not None:
-                setattr(db_pessoa, attr, val)
-        self.session.add(db_pessoa)
-        await self.session.commit()
-        await self.session.refresh(db_pessoa)
-        return db_pessoa
+    async def count(self) -> int:
+        """Total exato de pessoas, lido do contador (sem COUNT(*))."""
+        total = await self.session.scalar(
+            select(PessoaEstatisticaModel.total).where(
+                PessoaEstatisticaModel.dimensao == "total", PessoaEstatisticaModel.chave == ""
+            )
+        )
+        return total or 0
+
+    async def estimated_count(self) -> int:
+        """
+        Total aproximado pelas estatísticas do planner (pg_class.reltuples,
+        atualizado por VACUUM/ANALYZE). Sem estatísticas ainda (-1) ou fora
+        do Postgres, cai no contador exato.
+        """
+        if self.dialect == "postgresql":
+            estimated = await self.session.scalar(
+                text("SELECT reltuples::bigint FROM pg_class WHERE oid = 'pessoas'::regclass")
+            )
+            if estimated is not None and estimated >= 0:
+                return estimated
+        return await self.count()
+
+    @staticmethod
+    def _match_rows(chunk: List[Pessoa], rows) -> List[Tuple[int, Tuple[int, bool]]]:
+        # associa cada linha retornada à posição de entrada: pelo CPF quando
+        # houver, senão pela ordem das pessoas sem CPF (que nunca conflitam)
+        by_cpf: Dict[str, int] = {p.cpf: pos for pos, p in enumerate(chunk) if p.cpf is not None}
+        sem_cpf = iter([pos for pos, p in enumerate(chunk) if p.cpf is None])
+        matched = []
+        for row in rows:
+            pos = by_cpf[row.cpf] if row.cpf is not None else next(sem_cpf)
+            matched.append((pos, (row.id, bool(row.inserted))))
+        return matched
+
+    async def get_by_id(self, pessoa_id: int) -> Optional[PessoaRow]:
+        result = await self.session.execute(
+            select(*ROW_COLUMNS).where(PessoaModel.id == pessoa_id)
+        )
+        return _row(result)
 
-    async def delete(self, pessoa_id: int) -> bool:
-        db_pessoa = await self.get_by_id(pessoa_id)
-        if not db_pessoa:
+    async def list(
+        self, skip: int = 0, limit: int = 100, order_by: str = "id"
+    ) -> List[PessoaRow]:
+        result = await self.session.execute(
+            self._page(ROW_COLUMNS, limit, skip=skip, order_by=order_by)
+        )
+        return _rows(result)
+
+    async def list_keyset(
+        self,
+        limit: int = 100,
+        after: Optional[Tuple[Any, ...]] = None,
+        order_by: str = "id",
+    ) -> List[PessoaRow]:
+        """
+        Paginação por cursor: busca as linhas após a chave `after`
+        usando o índice da ordenação, sem descartar linhas como o OFFSET.
+        """
+        result = await self.session.execute(
+            self._page(ROW_COLUMNS, limit, after=after, order_by=order_by)
+        )
+        return _rows(result)
+
+    async def list_versions(
+        self,
+        limit: int = 100,
+        skip: int = 0,
+        after: Optional[Tuple[Any, ...]] = None,
+        order_by: str = "id",
+    ) -> List[Tuple[int, datetime]]:
+        """(id, updated_at) da mesma página de list/list_keyset, sem os demais campos."""
+        result = await self.session.execute(
+            self._page(
+                (PessoaModel.id, PessoaModel.updated_at),
+                limit, skip=skip, after=after, order_by=order_by,
+            )
+        )
+        return [tuple(row) for row in result]
+
+    def _page(self, columns, limit: int, skip: int = 0, after=None, order_by: str = "id"):
+        order = self._order_columns(order_by)
+        stmt = select(*columns).order_by(*order).limit(limit)
+        if after is not None:
+            stmt = stmt.where(tuple_(*order) > tuple_(*after))
+        if skip:
+            stmt = stmt.offset(skip)
+        return stmt
+
+    @staticmethod
+    def _order_columns(order_by: str):
+        if order_by == "created_at":
+            return (PessoaModel.created_at, PessoaModel.id)
+        return (PessoaModel.id,)
+
+    async def get_many(self, pessoa_ids: Sequence[int]) -> List[Optional[PessoaRow]]:
+        """
+        Várias pessoas em uma consulta (no Postgres, id = ANY(:ids), um
+        único parâmetro array, então o statement preparado é o mesmo para
+        qualquer quantidade). Devolve na ordem de `pessoa_ids`, com None para os
+        ids inexistentes.
+        """
+        if not pessoa_ids:
+            return []
+        result = await self.session.execute(
+            select(*ROW_COLUMNS).where(
+                self._in(PessoaModel.id, "ids", list(set(pessoa_ids)), Integer)
+            )
+        )
+        found = {row.id: row for row in _rows(result)}
+        return [found.get(pessoa_id) for pessoa_id in pessoa_ids]
+
+    async def get_version(self, pessoa_id: int) -> Optional[datetime]:
+        """Só o updated_at da pessoa (None se não existir)."""
+        return await self.session.scalar(
+            select(PessoaModel.updated_at).where(PessoaModel.id == pessoa_id)
+        )
+
+    async def get_by_cpf(self, cpf: str) -> Optional[PessoaRow]:
+        # cpf já normalizado (só dígitos): uma busca no índice único
+        result = await self.session.execute(
+            select(*ROW_COLUMNS).where(PessoaModel.cpf == cpf)
+        )
+        return _row(result)
+
+    async def list_by_celular(self, celular: str, limit: int = 100) -> List[PessoaRow]:
+        result = await self.session.execute(
+            select(*ROW_COLUMNS)
+            .where(PessoaModel.celular == celular)
+            .order_by(PessoaModel.id)
+            .limit(limit)
+        )
+        return _rows(result)
+
+    async def search(self, termo: str, limit: int = 20) -> List[PessoaRow]:
+        """
+        Busca pelo nome normalizado (`termo` já passou por normalize_nome).
+        Prefixos vêm primeiro; com pg_trgm, nomes com palavras parecidas
+        também entram, ordenados por word_similarity. Sem pg_trgm (ou fora
+        do Postgres) a busca fica só por prefixo.
+        """
+        is_prefix = PessoaModel.nome_busca.like(_escape_like(termo) + "%", escape="\\")
+        stmt = select(*ROW_COLUMNS)
+        if await self._has_trgm():
+            score = func.word_similarity(termo, PessoaModel.nome_busca)
+            stmt = stmt.where(
+                or_(is_prefix, PessoaModel.nome_busca.op("%>")(termo))
+            ).order_by(is_prefix.desc(), score.desc(), PessoaModel.id)
+        else:
+            stmt = stmt.where(is_prefix).order_by(PessoaModel.nome_busca, PessoaModel.id)
+        result = await self.session.execute(stmt.limit(limit))
+        return _rows(result)
+
+    async def _has_trgm(self) -> bool:
+        global _trgm_available
+        if self.dialect != "postgresql":
             return False
-        await self.session.delete(db_pessoa)
-        await self.session.commit()
-        return True
+        if _trgm_available is None:
+            result = await self.session.execute(
+                text("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")
+            )
+            _trgm_available = result.first() is not None
+        return _trgm_available
+
+    async def stream(self, chunk_size: int = 1000) -> AsyncIterator[Sequence[Any]]:
+        """
+        Percorre a tabela inteira com um cursor no servidor, entregando
+        blocos de até `chunk_size` linhas (Row, sem objetos ORM).
+        """
+        result = await self.session.stream(
+            select(*READ_COLUMNS)
+            .order_by(PessoaModel.id)
+            .execution_options(yield_per=chunk_size)
+        )
+        async for partition in result.partitions(chunk_size):
+            yield partition
+
+    async def update(self, pessoa_id: int, pessoa: Pessoa) -> Optional[PessoaRow]:
+        # Atualiza apenas campos não None
+        values = {
+            attr: getattr(pessoa, attr)
+            for attr in FIELDS
+            if getattr(pessoa, attr) is not None
+        }
+        return await self.update_fields(pessoa_id, values)
+
+    async def update_fields(
+        self,
+        pessoa_id: int,
+        values: Dict[str, Any],
+        expected: Optional[Sequence[datetime]] = None,
+    ) -> Optional[PessoaRow]:
+        """
+        Grava `values` (campos já validados) com um único UPDATE ... RETURNING
+        e devolve a linha atualizada como PessoaRow.
+        Com `expected`, só atualiza se o updated_at atual estiver entre as
+        versões esperadas (If-Match); senão devolve None, como se não existisse.
+        """
+        values = _with_nome_busca(dict(values))
+        if not values:
+            row = await self.get_by_id(pessoa_id)
+            if row is not None and expected is not None and row.updated_at not in expected:
+                return None
+            return row
+        values["updated_at"] = datetime.utcnow()
+        stmt = update(PessoaModel).where(PessoaModel.id == pessoa_id)
+        if expected is not None:
+            stmt = stmt.where(PessoaModel.updated_at.in_(expected))
+        try:
+            values["versao"] = await self._next_version()
+            old = None
+            if "flag" in values or "data_nascimento" in values:
+                # estado anterior (travado até o commit), para mover a
+                # pessoa entre os contadores
+                old = _row(await self.session.execute(
+                    select(*ROW_COLUMNS).where(PessoaModel.id == pessoa_id).with_for_update()
+                ))
+            result = await self.session.execute(
+                stmt.values(**values).returning(*ROW_COLUMNS)
+            )
+            row = _row(result)
+            if row is not None and old is not None:
+                deltas: Counter = Counter()
+                _count(deltas, old, -1)
+                _count(deltas, row, 1)
+                await self._apply_stats(deltas)
+            await self.session.commit()
+        except Exception:
+            await self.session.rollback()
+            raise
+        return row
+
+    async def delete(
+        self, pessoa_id: int, expected: Optional[Sequence[datetime]] = None
+    ) -> bool:
+        """Remove a pessoa e deixa um tombstone para o feed de mudanças."""
+        stmt = delete(PessoaModel).where(PessoaModel.id == pessoa_id)
+        if expected is not None:
+            stmt = stmt.where(PessoaModel.updated_at.in_(expected))
+        try:
+            versao = await self._next_version()
+            result = await self.session.execute(
+                stmt.returning(PessoaModel.flag, PessoaModel.data_nascimento, PessoaModel.created_at)
+            )
+            removida = result.first()
+            deleted = removida is not None
+            if deleted:
+                await self.session.execute(
+                    insert(PessoaRemovidaModel).values(pessoa_id=pessoa_id, versao=versao)
+                )
+                deltas: Counter = Counter()
+                _count(deltas, removida, -1)
+                await self._apply_stats(deltas)
+            await self.session.commit()
+        except Exception:
+            await self.session.rollback()
+            raise
+        return deleted
+
+    async def list_changes(
+        self, after: Tuple[int, int] = (0, 0), limit: int = 1000
+    ) -> List[Tuple[int, int, Optional[PessoaRow]]]:
+        """
+        Mudanças com chave (versao, id) após `after`, em ordem: tuplas
+        (versao, id, PessoaRow) para pessoas criadas/alteradas e
+        (versao, id, None) para removidas. Usa só os índices (versao, id)
+        das duas tabelas, então o custo acompanha o número de mudanças.
+        No Postgres, só versões abaixo da transação ativa mais antiga
+        (pg_snapshot_xmin): uma escrita ainda aberta, com versão menor, não
+        pode aparecer depois que o cliente já passou por ela.
+        """
+        pessoas_where = [tuple_(PessoaModel.versao, PessoaModel.id) > tuple_(*after)]
+        removidas_where = [
+            tuple_(PessoaRemovidaModel.versao, PessoaRemovidaModel.pessoa_id) > tuple_(*after)
+        ]
+        if self.dialect == "postgresql":
+            visivel = await self.session.scalar(
+                select(_xid_version(func.pg_snapshot_xmin(func.pg_current_snapshot())))
+            )
+            pessoas_where.append(PessoaModel.versao < visivel)
+            removidas_where.append(PessoaRemovidaModel.versao < visivel)
+        rows = await self.session.execute(
+            select(PessoaModel.versao, *ROW_COLUMNS)
+            .where(*pessoas_where)
+            .order_by(PessoaModel.versao, PessoaModel.id)
+            .limit(limit)
+        )
+        removidas = await self.session.execute(
+            select(PessoaRemovidaModel.versao, PessoaRemovidaModel.pessoa_id)
+            .where(*removidas_where)
+            .order_by(PessoaRemovidaModel.versao, PessoaRemovidaModel.pessoa_id)
+            .limit(limit)
+        )
+        changes = [(row[0], row[1], PessoaRow._make(row[1:])) for row in rows]
+        changes.extend((versao, pessoa_id, None) for versao, pessoa_id in removidas)
+        changes.sort(key=lambda change: change[:2])
+        return changes[:limit]
@@ -1,33 +1,300 @@
+import asyncio
+import itertools
 import os
-from typing import AsyncGenerator
+import time
+from typing import Any, AsyncGenerator, Dict, List, Optional
+
 from dotenv import load_dotenv
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
-from sqlalchemy.orm import sessionmaker
+from fastapi import Depends
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncConnection, AsyncEngine, AsyncSession
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from src.core.pessoas.model import Base
+from src.infrastructure.auth.jwt_utils import get_current_user
+from src.infrastructure.observability.metrics import InstrumentedPool, instrument_engine
+from src.infrastructure.observability.slow_queries import slow_query_log
+from src.infrastructure.settings import Settings, get_settings
 
 # Carrega variáveis do .env
 load_dotenv()
 
-# Lê URL do banco e ajusta para driver asyncpg se necessário
-DATABASE_URL = os.getenv("DATABASE_URL")
-if DATABASE_URL is None:
-    raise RuntimeError("DATABASE_URL não está definido no .env")
-if DATABASE_URL.startswith("postgresql://"):
-    DATABASE_URL = DATABASE_URL.replace("postgresql://", "postgresql+asyncpg://", 1)
-
-# Cria AsyncEngine usando asyncpg
-engine = create_async_engine(
-    DATABASE_URL,
-    echo=True,
-)
-
-# Configura a fábrica de sessões assíncronas
-AsyncSessionLocal = sessionmaker(
-    bind=engine,
-    class_=AsyncSession,
-    expire_on_commit=False,
-)
-
-# Dependência FastAPI para injetar sessão
-async def get_session() -> AsyncGenerator[AsyncSession, None]:
-    async with AsyncSessionLocal() as session:
+
+def _async_url(url: str) -> str:
+    # ajusta para o driver assíncrono (asyncpg ou aiosqlite) se necessário
+    if url.startswith("postgresql://"):
+        return url.replace("postgresql://", "postgresql+asyncpg://", 1)
+    if url.startswith("sqlite://"):
+        return url.replace("sqlite://", "sqlite+aiosqlite://", 1)
+    return url
+
+
+def _is_sqlite(url: str) -> bool:
+    return make_url(url).get_backend_name() == "sqlite"
+
+
+def _is_memory(url: str) -> bool:
+    # sqlite+aiosqlite:// ou :memory: (ou file:...?mode=memory)
+    parsed = make_url(url)
+    return parsed.database in (None, "", ":memory:") or parsed.query.get("mode") == "memory"
+
+
+def _sqlite_pragmas(settings: Settings) -> Dict[str, Any]:
+    # WAL (leitores não bloqueiam o escritor), fsync só nos checkpoints
+    # (synchronous=NORMAL; seguro com WAL) e espera pelo lock de escrita
+    # em vez de falhar na hora com "database is locked"
+    return {
+        "journal_mode": "WAL",
+        "synchronous": settings.database_sqlite_synchronous,
+        "busy_timeout": settings.database_sqlite_busy_timeout,
+        "foreign_keys": "ON",
+        "temp_store": "MEMORY",
+        "cache_size": settings.database_sqlite_cache_size,
+        "mmap_size": settings.database_sqlite_mmap_size,
+    }
+
+
+def _sqlite_pragmas_listener(settings: Settings):
+    """Listener de "connect" que aplica os PRAGMAs das Settings a cada conexão SQLite."""
+    pragmas = _sqlite_pragmas(settings)
+
+    def set_sqlite_pragmas(dbapi_connection, connection_record) -> None:
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in pragmas.items():
+                cursor.execute(f"PRAGMA {name} = {value}")
+        finally:
+            cursor.close()
+
+    return set_sqlite_pragmas
+
+
+def _option(settings: Settings, prefix: str, name: str) -> Any:
+    # database_read_pool_size sem valor cai para database_pool_size
+    value = getattr(settings, f"{prefix}_{name}")
+    return getattr(settings, f"database_{name}") if value is None else value
+
+
+def pool_capacity(settings: Settings, url: Optional[str] = None, prefix: str = "database") -> int:
+    """Conexões que o pool do engine pode abrir (pool_size + max_overflow)."""
+    options = _engine_options(settings, url if url is not None else settings.database_url or "", prefix)
+    if options.get("poolclass") is StaticPool:
+        return 1
+    return options["pool_size"] + options["max_overflow"]
+
+
+def _engine_options(settings: Settings, url: str = "", prefix: str = "database") -> Dict[str, Any]:
+    """
+    Opções do engine a partir das Settings, com prefixo database (primário)
+    ou database_read (réplicas, caindo para as do primário): pool_size,
+    max_overflow, pool_timeout, pool_recycle, pool_pre_ping,
+    statement_cache_size e echo. SQLite em memória usa uma conexão só
+    (StaticPool): cada conexão nova seria um banco vazio.
+    """
+    def option(name: str) -> Any:
+        return _option(settings, prefix, name)
+
+    echo = option("echo")
+    if url and _is_sqlite(url) and _is_memory(url):
+        return {"echo": echo, "poolclass": StaticPool}
+    options: Dict[str, Any] = {
+        "echo": echo,
+        "poolclass": InstrumentedPool,
+        "pool_size": option("pool_size"),
+        "max_overflow": option("max_overflow"),
+        "pool_timeout": option("pool_timeout"),
+        "pool_recycle": option("pool_recycle"),
+        "pool_pre_ping": option("pool_pre_ping"),
+    }
+    statement_cache_size = option("statement_cache_size")
+    if statement_cache_size is not None and not (url and _is_sqlite(url)):
+        # 0 desliga os prepared statements (necessário atrás de pgbouncer)
+        options["connect_args"] = {
+            "statement_cache_size": statement_cache_size,
+            "prepared_statement_cache_size": statement_cache_size,
+        }
+    return options
+
+
+# Engines criados sob demanda (init_engines, chamado no startup da app ou
+# no primeiro uso): importar este módulo não abre pool nem lê DATABASE_URL
+engine: Optional[AsyncEngine] = None
+read_engines: List[AsyncEngine] = []
+# processo que criou os engines: um filho de fork cria os seus
+_engine_pid: Optional[int] = None
+
+# Fábricas de sessões assíncronas; ganham o bind em init_engines
+AsyncSessionLocal = sessionmaker(class_=AsyncSession, expire_on_commit=False)
+ReadSessionLocals: List[sessionmaker] = []
+_next_replica = itertools.cycle(())
+
+# ajustado por init_engines (DATABASE_READ_YOUR_WRITES_SECONDS)
+READ_YOUR_WRITES_SECONDS = 5.0
+
+
+def init_engines(settings: Optional[Settings] = None) -> AsyncEngine:
+    """
+    Cria os engines do primário e das réplicas e liga as fábricas de
+    sessão a eles. Idempotente: sem engines ainda, usa `settings` (ou as
+    do ambiente).
+    """
+    global engine, read_engines, _next_replica, _engine_pid, READ_YOUR_WRITES_SECONDS
+    if engine is not None and _engine_pid == os.getpid():
+        return engine
+    if engine is not None:
+        # herdados do pai: larga as conexões dele sem fechá-las
+        for inherited in [engine] + read_engines:
+            inherited.sync_engine.dispose(close=False)
+    settings = settings or get_settings()
+    if settings.database_url is None:
+        raise RuntimeError("DATABASE_URL não está definido no .env")
+    READ_YOUR_WRITES_SECONDS = settings.database_read_your_writes_seconds
+
+    primary = _create_engine(settings, settings.database_url, "database")
+    read_engines = [_create_engine(settings, url, "database_read") for url in settings.read_urls()]
+    instrument_engine(primary, "primary")
+    slow_query_log.watch(primary, "primary")
+    for index, read_engine in enumerate(read_engines):
+        instrument_engine(read_engine, f"replica{index}")
+        slow_query_log.watch(read_engine, f"replica{index}")
+
+    AsyncSessionLocal.configure(bind=primary)
+    ReadSessionLocals[:] = [
+        # info["replica"]: o que for lido nelas não vai para os caches compartilhados
+        sessionmaker(bind=read_engine, class_=AsyncSession, expire_on_commit=False, info={"replica": True})
+        for read_engine in read_engines
+    ]
+    _next_replica = itertools.cycle(range(len(ReadSessionLocals)))
+    engine, _engine_pid = primary, os.getpid()
+    return engine
+
+
+def _create_engine(settings: Settings, url: str, prefix: str) -> AsyncEngine:
+    url = _async_url(url)
+    created = create_async_engine(url, **_engine_options(settings, url, prefix))
+    if _is_sqlite(url):
+        event.listen(created.sync_engine, "connect", _sqlite_pragmas_listener(settings))
+    return created
+
+
+async def create_schema() -> None:
+    """
+    Cria as tabelas que faltarem a partir dos modelos (DATABASE_CREATE_SCHEMA),
+    para bancos SQLite locais ou em memória; em produção, use o Alembic.
+    """
+    async with get_engine().begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+
+def get_engine() -> AsyncEngine:
+    return engine if engine is not None else init_engines()
+
+
+def session_factory() -> sessionmaker:
+    """AsyncSessionLocal, criando os engines se ainda não existirem."""
+    if engine is None:
+        init_engines()
+    return AsyncSessionLocal
+
+
+async def prewarm_pool(connections: Optional[int] = None) -> int:
+    """
+    Abre `connections` conexões em cada engine (padrão: o pool_size) e
+    as devolve ao pool, para as primeiras requisições não pagarem o
+    connect. Devolve quantas foram abertas no primário.
+    """
+    async def checkout(target: AsyncEngine) -> AsyncConnection:
+        conn = await target.connect()
+        try:
+            await conn.exec_driver_sql("SELECT 1")
+        except BaseException:
+            await conn.close()
+            raise
+        return conn
+
+    async def warm(target: AsyncEngine) -> int:
+        pool = target.sync_engine.pool
+        if isinstance(pool, StaticPool):
+            # conexão única (SQLite em memória): abre uma vez
+            count = min(1, connections if connections is not None else 1)
+        else:
+            count = connections if connections is not None else pool.size()
+        # todas abertas ao mesmo tempo (senão o pool reusaria a mesma)
+        results = await asyncio.gather(
+            *(checkout(target) for _ in range(count)), return_exceptions=True
+        )
+        held = [conn for conn in results if isinstance(conn, AsyncConnection)]
+        for conn in held:
+            await conn.close()
+        for error in results:
+            if isinstance(error, BaseException):
+                raise error
+        return len(held)
+
+    opened = await warm(get_engine())
+    for read_engine in read_engines:
+        await warm(read_engine)
+    return opened
+
+
+async def dispose_engines() -> None:
+    """Fecha os pools (shutdown da app); um novo uso cria os engines de novo."""
+    global engine, read_engines
+    engines = ([engine] if engine is not None else []) + read_engines
+    engine, read_engines = None, []
+    ReadSessionLocals.clear()
+    for item in engines:
+        await item.dispose()
+
+
+# usuário -> instante (monotônico) até o qual lê do primário
+_recent_writers: Dict[Any, float] = {}
+
+
+@event.listens_for(Session, "after_commit")
+def _mark_recent_writer(session: Session) -> None:
+    # "user_ids": sessão que grava por vários usuários (criações agrupadas)
+    user_ids = session.info.get("user_ids") or ()
+    if session.info.get("user_id") is not None:
+        user_ids = (*user_ids, session.info["user_id"])
+    if not user_ids:
+        return
+    now = time.monotonic()
+    if len(_recent_writers) > 10000:
+        for key, until in list(_recent_writers.items()):
+            if until <= now:
+                del _recent_writers[key]
+    for user_id in user_ids:
+        _recent_writers[user_id] = now + READ_YOUR_WRITES_SECONDS
+
+
+def read_sessionmaker(user_id: Optional[Any] = None) -> sessionmaker:
+    """
+    Fábrica de sessões para leituras: uma réplica (round-robin), ou o
+    primário se não houver réplicas ou se o usuário escreveu há pouco.
+    """
+    if engine is None:
+        init_engines()
+    if not ReadSessionLocals:
+        return AsyncSessionLocal
+    if user_id is not None and _recent_writers.get(user_id, 0) > time.monotonic():
+        return AsyncSessionLocal
+    return ReadSessionLocals[next(_next_replica)]
+
+
+# Dependência FastAPI para injetar sessão (primário)
+async def get_session(
+    current_user: Dict[str, Any] = Depends(get_current_user),
+) -> AsyncGenerator[AsyncSession, None]:
+    async with session_factory()(info={"user_id": current_user["id"]}) as session:
+        yield session
+
+
+# Dependência FastAPI para sessões somente leitura (réplica, se houver)
+async def get_read_session(
+    current_user: Dict[str, Any] = Depends(get_current_user),
+) -> AsyncGenerator[AsyncSession, None]:
+    async with read_sessionmaker(current_user["id"])() as session:
         yield session
@@ -0,0 +1,238 @@
+# src/infrastructure/observability/metrics.py
+
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+# Buckets padrão de latência (segundos)
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+COUNT_BUCKETS = (0, 1, 2, 5, 10, 25, 50, 100, 250, 1000, 10000)
+
+LabelValues = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class Counter:
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, labels: LabelValues = (), amount: float = 1.0) -> None:
+        self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def collect(self) -> Iterable[str]:
+        yield f"# HELP {self.name} {self.help}"
+        yield f"# TYPE {self.name} counter"
+        for labels, value in self._values.items():
+            yield f"{self.name}{_labels(self.labelnames, labels)} {value}"
+
+
+class Histogram:
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets)
+        # labels -> [contagem por bucket..., +Inf, soma]
+        self._values: Dict[LabelValues, List[float]] = {}
+
+    def observe(self, value: float, labels: LabelValues = ()) -> None:
+        series = self._values.get(labels)
+        if series is None:
+            series = self._values[labels] = [0.0] * (len(self.buckets) + 2)
+        series[bisect_left(self.buckets, value)] += 1
+        series[-1] += value
+
+    def collect(self) -> Iterable[str]:
+        yield f"# HELP {self.name} {self.help}"
+        yield f"# TYPE {self.name} histogram"
+        for labels, series in self._values.items():
+            cumulative = 0.0
+            for bound, count in zip(self.buckets + (float("inf"),), series):
+                cumulative += count
+                le = 'le="+Inf"' if bound == float("inf") else f'le="{bound}"'
+                yield f"{self.name}_bucket{_labels(self.labelnames, labels, le)} {cumulative}"
+            yield f"{self.name}_sum{_labels(self.labelnames, labels)} {series[-1]}"
+            yield f"{self.name}_count{_labels(self.labelnames, labels)} {cumulative}"
+
+
+class Gauge:
+    """Gauge lida na hora da coleta a partir de uma função."""
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labelnames: Sequence[str] = (),
+        callback: Optional[Callable[[], Dict[LabelValues, float]]] = None,
+    ):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self.callback = callback or dict
+
+    def collect(self) -> Iterable[str]:
+        yield f"# HELP {self.name} {self.help}"
+        yield f"# TYPE {self.name} gauge"
+        for labels, value in self.callback().items():
+            yield f"{self.name}{_labels(self.labelnames, labels)} {value}"
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: Dict[str, object] = {}
+
+    def register(self, metric):
+        self._metrics[metric.name] = metric
+        return metric
+
+    def render(self) -> str:
+        """Formato de exposição em texto do Prometheus."""
+        lines: List[str] = []
+        for metric in self._metrics.values():
+            lines.extend(metric.collect())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+http_requests = REGISTRY.register(Counter(
+    "http_requests_total", "Requisições HTTP por rota e status.", ("method", "route", "status")
+))
+http_latency = REGISTRY.register(Histogram(
+    "http_request_duration_seconds", "Latência das requisições HTTP.", ("method", "route")
+))
+db_query_latency = REGISTRY.register(Histogram(
+    "db_query_duration_seconds", "Latência de cada comando SQL.", ("engine",)
+))
+db_queries_per_request = REGISTRY.register(Histogram(
+    "db_queries_per_request", "Comandos SQL por requisição.", ("route",), COUNT_BUCKETS
+))
+db_time_per_request = REGISTRY.register(Histogram(
+    "db_query_seconds_per_request", "Tempo total em SQL por requisição.", ("route",)
+))
+db_rows_per_request = REGISTRY.register(Histogram(
+    "db_rows_per_request", "Linhas retornadas/afetadas por requisição.", ("route",), COUNT_BUCKETS
+))
+db_pool_wait = REGISTRY.register(Histogram(
+    "db_pool_wait_seconds", "Espera por uma conexão do pool.", ("engine",)
+))
+mcp_tool_calls = REGISTRY.register(Counter(
+    "mcp_tool_calls_total", "Chamadas de ferramentas MCP por resultado.", ("tool", "status")
+))
+mcp_tool_latency = REGISTRY.register(Histogram(
+    "mcp_tool_duration_seconds", "Latência das ferramentas MCP.", ("tool",)
+))
+
+
+class RequestQueryStats:
+    """Totais de SQL da requisição corrente (e o scope ASGI, para a rota)."""
+
+    __slots__ = ("queries", "seconds", "rows", "scope")
+
+    def __init__(self, scope: Optional[dict] = None):
+        self.queries = 0
+        self.seconds = 0.0
+        self.rows = 0
+        self.scope = scope
+
+
+# estatísticas da requisição em andamento (None fora de requisições)
+current_query_stats: ContextVar[Optional[RequestQueryStats]] = ContextVar(
+    "current_query_stats", default=None
+)
+
+
+class InstrumentedPool(AsyncAdaptedQueuePool):
+    """Pool que mede quanto tempo cada checkout espera por uma conexão."""
+
+    metrics_name = "default"
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            db_pool_wait.observe(time.perf_counter() - start, (self.metrics_name,))
+
+
+_engines: Dict[str, AsyncEngine] = {}
+
+
+def _pool_gauge(read: Callable) -> Callable[[], Dict[LabelValues, float]]:
+    def collect() -> Dict[LabelValues, float]:
+        values = {}
+        for name, engine in _engines.items():
+            try:
+                values[(name,)] = float(read(engine.sync_engine.pool))
+            except AttributeError:  # pools sem essa estatística
+                continue
+        return values
+    return collect
+
+
+REGISTRY.register(Gauge(
+    "db_pool_checked_out", "Conexões em uso.", ("engine",), _pool_gauge(lambda p: p.checkedout())
+))
+REGISTRY.register(Gauge(
+    "db_pool_overflow", "Conexões acima do pool_size.", ("engine",), _pool_gauge(lambda p: max(p.overflow(), 0))
+))
+REGISTRY.register(Gauge(
+    "db_pool_size", "Tamanho configurado do pool.", ("engine",), _pool_gauge(lambda p: p.size())
+))
+
+
+def instrument_engine(engine: AsyncEngine, name: str) -> None:
+    """Registra os hooks de métricas de SQL e pool em um engine."""
+    _engines[name] = engine
+    if isinstance(engine.sync_engine.pool, InstrumentedPool):
+        engine.sync_engine.pool.metrics_name = name
+    labels = (name,)
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        context._metrics_start = time.perf_counter()
+
+    @event.listens_for(engine.sync_engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - context._metrics_start
+        db_query_latency.observe(elapsed, labels)
+        stats = current_query_stats.get()
+        if stats is not None:
+            stats.queries += 1
+            stats.seconds += elapsed
+            if cursor.rowcount and cursor.rowcount > 0:
+                stats.rows += cursor.rowcount
+
+
+def register_cache(name: str, stats: Callable[[], Dict[str, int]]) -> None:
+    """Expõe os contadores de um cache (hits, misses, evictions...)."""
+    REGISTRY.register(Gauge(
+        f"cache_{name}",
+        f"Contadores do cache {name}.",
+        ("stat",),
+        lambda: {(key,): float(value) for key, value in stats().items()},
+    ))
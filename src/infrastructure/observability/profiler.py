@@ -0,0 +1,135 @@
+# src/infrastructure/observability/profiler.py
+
+import asyncio
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Any, Dict, List, Optional
+
+# Intervalo entre amostras da pilha (milissegundos)
+PROFILE_INTERVAL_MS = float(os.getenv("PROFILE_INTERVAL_MS", "1"))
+# Pilhas mais frequentes devolvidas no perfil
+PROFILE_TOP_STACKS = int(os.getenv("PROFILE_TOP_STACKS", "50"))
+
+_ASYNCIO_EVENTS = asyncio.events.__file__
+
+# perfis em andamento e o switch interval original do interpretador
+_active = 0
+_switch_interval = sys.getswitchinterval()
+_lock = threading.Lock()
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    filename = code.co_filename
+    for prefix in sys.path:
+        if prefix and filename.startswith(prefix + os.sep):
+            filename = filename[len(prefix) + 1:]
+            break
+    return f"{code.co_name} ({filename}:{frame.f_lineno})"
+
+
+def _stack(frame) -> List[str]:
+    # da raiz para a folha, a partir do callback que o event loop executa
+    # (Handle._run do asyncio); com uvloop a pilha já começa na corrotina
+    frames = []
+    while frame is not None:
+        frames.append(frame)
+        frame = frame.f_back
+    frames.reverse()
+    start = 0
+    for index, f in enumerate(frames):
+        if f.f_code.co_name == "_run" and f.f_code.co_filename == _ASYNCIO_EVENTS:
+            start = index + 1
+            break
+    return [_frame_label(f) for f in frames[start:]]
+
+
+class RequestProfiler:
+    """
+    Profiler por amostragem de uma requisição: uma thread lê a pilha da
+    thread do event loop a cada `interval` segundos (sys._current_frames).
+    Cada amostra é atribuída à task da requisição (com a pilha), a outra
+    task (requisições concorrentes, tarefas de fundo) ou ao loop sem task
+    ("idle": esperando I/O, como o banco, ou em callbacks dos drivers).
+    As pilhas são só as da requisição; a espera pelo SQL não tem pilha.
+    """
+
+    def __init__(self, interval: float = PROFILE_INTERVAL_MS / 1000):
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self.breakdown: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        global _active, _switch_interval
+        with _lock:
+            if _active == 0:
+                _switch_interval = sys.getswitchinterval()
+            _active += 1
+            # a thread de amostragem só roda quando a do loop solta o GIL
+            # (a cada switch interval, 5 ms por padrão): baixa enquanto houver perfis
+            sys.setswitchinterval(min(_switch_interval, self.interval))
+        self._loop = asyncio.get_running_loop()
+        self._task = asyncio.current_task()
+        self._thread_id = threading.get_ident()
+        self._started = time.perf_counter()
+        self._thread = threading.Thread(target=self._run, name="request-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self.elapsed = time.perf_counter() - self._started
+        global _active
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        with _lock:
+            _active -= 1
+            if _active == 0:
+                sys.setswitchinterval(_switch_interval)
+
+    def _current_task(self) -> Optional[asyncio.Task]:
+        # lido de outra thread: só uma consulta ao dict de tasks correntes
+        current_tasks = getattr(asyncio.tasks, "_current_tasks", None)
+        if current_tasks is None:
+            return self._task
+        return current_tasks.get(self._loop)
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self._thread_id)
+            task = self._current_task()
+            if task is None:
+                self.breakdown["idle"] += 1
+            elif task is not self._task:
+                self.breakdown["other_tasks"] += 1
+            else:
+                self.breakdown["request"] += 1
+                if frame is not None:
+                    self.stacks[";".join(_stack(frame))] += 1
+
+    def report(self, top: int = PROFILE_TOP_STACKS) -> Dict[str, Any]:
+        """
+        Resumo do perfil: amostras por destino, funções com mais amostras
+        (próprias e acumuladas) e as pilhas mais frequentes no formato
+        "collapsed" (raiz;...;folha), que os geradores de flamegraph leem.
+        """
+        own: Counter = Counter()
+        total: Counter = Counter()
+        for stack, count in self.stacks.items():
+            frames = stack.split(";") if stack else []
+            if frames:
+                own[frames[-1]] += count
+            for label in set(frames):
+                total[label] += count
+        return {
+            "duration_ms": self.elapsed * 1000,
+            "interval_ms": self.interval * 1000,
+            "samples": dict(self.breakdown),
+            "functions_self": [{"function": f, "samples": n} for f, n in own.most_common(top)],
+            "functions_total": [{"function": f, "samples": n} for f, n in total.most_common(top)],
+            "stacks": [{"stack": s, "samples": n} for s, n in self.stacks.most_common(top)],
+        }
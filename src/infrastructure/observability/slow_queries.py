@@ -0,0 +1,189 @@
+# src/infrastructure/observability/slow_queries.py
+
+import asyncio
+import itertools
+import logging
+import os
+import re
+import time
+from collections import deque
+from contextvars import ContextVar
+from datetime import datetime
+from typing import Any, Deque, Dict, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import StaticPool
+
+from src.infrastructure.observability.metrics import REGISTRY, Counter, current_query_stats
+
+logger = logging.getLogger(__name__)
+
+# Comandos acima deste tempo entram no log (milissegundos; 0 desliga)
+SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", "200"))
+# Quantos comandos lentos ficam guardados (os mais antigos saem)
+SLOW_QUERY_BUFFER = int(os.getenv("SLOW_QUERY_BUFFER", "100"))
+# Plano de execução dos comandos lentos (EXPLAIN em outra conexão)
+SLOW_QUERY_EXPLAIN = os.getenv("SLOW_QUERY_EXPLAIN", "true").lower() == "true"
+# O mesmo SQL é explicado no máximo uma vez por intervalo (segundos)
+SLOW_QUERY_EXPLAIN_INTERVAL = float(os.getenv("SLOW_QUERY_EXPLAIN_INTERVAL", "60"))
+SLOW_QUERY_EXPLAIN_TIMEOUT = float(os.getenv("SLOW_QUERY_EXPLAIN_TIMEOUT", "10"))
+# Tamanho máximo do SQL guardado
+STATEMENT_MAX_CHARS = 10000
+
+db_slow_queries = REGISTRY.register(Counter(
+    "db_slow_queries_total", "Comandos SQL acima de SLOW_QUERY_MS.", ("engine",)
+))
+
+_WRITE_KEYWORDS = re.compile(r"\b(INSERT|UPDATE|DELETE)\b", re.IGNORECASE)
+
+# verdadeiro dentro do próprio EXPLAIN (que não deve ser registrado)
+_explaining: ContextVar[bool] = ContextVar("slow_query_explaining", default=False)
+
+
+def parameters_shape(parameters: Any, executemany: bool = False) -> Any:
+    """Tipos dos parâmetros, sem os valores (que podem ter dados pessoais)."""
+    if executemany:
+        rows = list(parameters or ())
+        return {"executemany": len(rows), "row": parameters_shape(rows[0]) if rows else None}
+    if isinstance(parameters, dict):
+        return {key: _type_name(value) for key, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        return [_type_name(value) for value in parameters]
+    return None
+
+
+def _type_name(value: Any) -> str:
+    if isinstance(value, (list, tuple)):
+        return f"{type(value).__name__}[{len(value)}]"
+    return type(value).__name__
+
+
+def _explain_prefix(dialect: str, statement: str) -> Optional[str]:
+    if dialect == "sqlite":
+        return "EXPLAIN QUERY PLAN "
+    if dialect != "postgresql":
+        return None
+    read_only = (
+        statement.lstrip().upper().startswith(("SELECT", "WITH"))
+        and not _WRITE_KEYWORDS.search(statement)
+    )
+    # ANALYZE executa o comando de novo: só para leituras; escritas (e
+    # SELECT ... FOR UPDATE) ganham só o plano estimado
+    return "EXPLAIN (ANALYZE, BUFFERS) " if read_only else "EXPLAIN "
+
+
+class SlowQueryLog:
+    """
+    Buffer circular dos comandos SQL lentos: SQL, formato dos parâmetros,
+    duração, engine e rota, mais o plano (EXPLAIN) obtido em segundo plano
+    em outra conexão do pool. Um EXPLAIN por vez e, para o mesmo SQL, no
+    máximo um por `explain_interval`, para não piorar um banco já lento.
+    """
+
+    def __init__(
+        self,
+        threshold_ms: float = SLOW_QUERY_MS,
+        maxlen: int = SLOW_QUERY_BUFFER,
+        explain: bool = SLOW_QUERY_EXPLAIN,
+        explain_interval: float = SLOW_QUERY_EXPLAIN_INTERVAL,
+    ):
+        self.threshold_ms = threshold_ms
+        self.explain = explain
+        self.explain_interval = explain_interval
+        self._entries: Deque[Dict[str, Any]] = deque(maxlen=max(1, maxlen))
+        self._ids = itertools.count(1)
+        self._explained_at: Dict[str, float] = {}
+        self._explain_task: Optional[asyncio.Task] = None
+
+    def entries(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Os comandos lentos, do mais recente para o mais antigo."""
+        items = list(reversed(self._entries))
+        return items[:limit] if limit is not None else items
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._explained_at.clear()
+
+    def watch(self, engine: AsyncEngine, name: str) -> None:
+        """Registra os hooks do log em um engine."""
+
+        @event.listens_for(engine.sync_engine, "before_cursor_execute")
+        def _before(conn, cursor, statement, parameters, context, executemany):
+            context._slow_query_start = time.perf_counter()
+
+        @event.listens_for(engine.sync_engine, "after_cursor_execute")
+        def _after(conn, cursor, statement, parameters, context, executemany):
+            if self.threshold_ms <= 0 or _explaining.get():
+                return
+            elapsed = time.perf_counter() - context._slow_query_start
+            if elapsed * 1000 < self.threshold_ms:
+                return
+            entry = self.record(name, statement, parameters, executemany, elapsed)
+            if self.explain and not executemany:
+                self._schedule_explain(engine, entry, statement, parameters)
+
+    def record(
+        self, engine_name: str, statement: str, parameters: Any, executemany: bool, elapsed: float
+    ) -> Dict[str, Any]:
+        stats = current_query_stats.get()
+        route = getattr(stats.scope.get("route"), "path", None) if stats and stats.scope else None
+        entry = {
+            "id": next(self._ids),
+            "at": datetime.utcnow().isoformat(),
+            "engine": engine_name,
+            "route": route,
+            "duration_ms": elapsed * 1000,
+            "statement": statement[:STATEMENT_MAX_CHARS],
+            "parameters": parameters_shape(parameters, executemany),
+            "plan": None,
+            "plan_error": None,
+        }
+        self._entries.append(entry)
+        db_slow_queries.inc((engine_name,))
+        return entry
+
+    def _schedule_explain(self, engine: AsyncEngine, entry: Dict[str, Any], statement: str, parameters: Any) -> None:
+        prefix = _explain_prefix(engine.dialect.name, statement)
+        if prefix is None:
+            return
+        if isinstance(engine.pool, StaticPool):
+            # conexão única (SQLite em memória): é a mesma da requisição, e o
+            # rollback do EXPLAIN desfaria a transação dela
+            entry["plan_error"] = "EXPLAIN indisponível: o engine tem uma conexão só."
+            return
+        if self._explain_task is not None and not self._explain_task.done():
+            entry["plan_error"] = "EXPLAIN de outro comando em andamento."
+            return
+        now = time.monotonic()
+        if now - self._explained_at.get(statement, float("-inf")) < self.explain_interval:
+            entry["plan_error"] = "Mesmo SQL explicado há pouco; veja as entradas anteriores."
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:  # engine usado fora do event loop
+            return
+        if len(self._explained_at) > 1000:
+            self._explained_at.clear()
+        self._explained_at[statement] = now
+        self._explain_task = loop.create_task(self._explain(engine, entry, prefix + statement, parameters))
+
+    async def _explain(self, engine: AsyncEngine, entry: Dict[str, Any], statement: str, parameters: Any) -> None:
+        _explaining.set(True)
+        # a task herda o contexto da requisição: não soma nas estatísticas dela
+        current_query_stats.set(None)
+        try:
+            async with engine.connect() as conn:
+                result = await asyncio.wait_for(
+                    conn.exec_driver_sql(statement, parameters), SLOW_QUERY_EXPLAIN_TIMEOUT
+                )
+                # Postgres: uma coluna por linha; SQLite: o detalhe é a última
+                entry["plan"] = "\n".join(str(row[-1]) for row in result)
+                await conn.rollback()
+        except Exception as e:
+            logger.debug("Falha no EXPLAIN do comando lento", exc_info=True)
+            entry["plan_error"] = str(e)
+
+
+# Log do processo, ligado aos engines em init_engines
+slow_query_log = SlowQueryLog()
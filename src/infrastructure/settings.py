@@ -0,0 +1,95 @@
+# src/infrastructure/settings.py
+
+from functools import lru_cache
+from typing import List, Optional
+
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+
+class Settings(BaseSettings):
+    """
+    Configuração da aplicação, lida do ambiente (e do .env) só quando
+    pedida: importar os módulos não exige nenhuma variável definida.
+    Os nomes dos campos são os das variáveis de ambiente (DATABASE_URL,
+    JWT_SECRET...).
+    """
+    model_config = SettingsConfigDict(env_file=".env", extra="ignore")
+
+    # primário: escritas e leituras que precisam do dado recente
+    database_url: Optional[str] = None
+    # réplicas de leitura opcionais, separadas por vírgula
+    database_read_urls: str = ""
+    # por quantos segundos, depois de uma escrita, as leituras do mesmo
+    # usuário continuam no primário (read-your-writes)
+    database_read_your_writes_seconds: float = 5.0
+    # conexões abertas no startup de cada processo (padrão: DATABASE_POOL_SIZE)
+    database_pool_prewarm: Optional[int] = None
+    # pool do primário (por processo)
+    database_pool_size: int = 5
+    database_max_overflow: int = 10
+    database_pool_timeout: float = 30.0
+    database_pool_recycle: int = 1800
+    database_pool_pre_ping: bool = True
+    # prepared statements do asyncpg; 0 desliga (necessário atrás de pgbouncer)
+    database_statement_cache_size: Optional[int] = None
+    database_echo: bool = False
+    # pool das réplicas; sem valor, o mesmo do primário
+    database_read_pool_size: Optional[int] = None
+    database_read_max_overflow: Optional[int] = None
+    database_read_pool_timeout: Optional[float] = None
+    database_read_pool_recycle: Optional[int] = None
+    database_read_pool_pre_ping: Optional[bool] = None
+    database_read_statement_cache_size: Optional[int] = None
+    database_read_echo: Optional[bool] = None
+    # PRAGMAs de cada conexão SQLite (busy_timeout em ms; cache_size
+    # negativo = KiB: 64 MiB de cache de páginas por conexão)
+    database_sqlite_synchronous: str = "NORMAL"
+    database_sqlite_busy_timeout: int = 5000
+    database_sqlite_cache_size: int = -65536
+    database_sqlite_mmap_size: int = 268435456
+    # cria as tabelas dos modelos no startup (SQLite local ou em memória;
+    # com Postgres, use as migrações do Alembic)
+    database_create_schema: bool = False
+    jwt_secret: Optional[str] = None
+    # servidor MCP em /mcp (montado no startup, com import tardio)
+    mcp_enabled: bool = True
+    # worker das importações de CSV em segundo plano
+    import_worker_enabled: bool = True
+
+    # servidor de produção (python -m src.serve)
+    server_host: str = "0.0.0.0"
+    server_port: int = 8000
+    # processos; padrão: CPUs disponíveis para o container
+    web_concurrency: Optional[int] = None
+    # segundos para terminar as requisições em andamento no desligamento
+    server_graceful_timeout: float = 30.0
+    server_access_log: bool = True
+
+    # controle de admissão por processo (src/infrastructure/admission.py);
+    # concorrência sem valor: dividida a partir do pool do primário
+    admission_enabled: bool = True
+    # Retry-After das respostas 503
+    admission_retry_after: int = 1
+    # usuários com token bucket em memória (os mais antigos saem primeiro)
+    admission_max_users: int = 10000
+    admission_read_concurrency: Optional[int] = None
+    # fila de espera; sem valor: o dobro da concorrência
+    admission_read_queue: Optional[int] = None
+    admission_read_queue_timeout: float = 2.0
+    # requisições/s por usuário (0 = sem limite) e rajada
+    admission_read_user_rate: float = 0.0
+    admission_read_user_burst: float = 20.0
+    admission_write_concurrency: Optional[int] = None
+    admission_write_queue: Optional[int] = None
+    admission_write_queue_timeout: float = 2.0
+    admission_write_user_rate: float = 0.0
+    admission_write_user_burst: float = 20.0
+
+    def read_urls(self) -> List[str]:
+        return [url.strip() for url in self.database_read_urls.split(",") if url.strip()]
+
+
+@lru_cache
+def get_settings() -> Settings:
+    """Settings do ambiente, lidas uma vez por processo."""
+    return Settings()
@@ -1,33 +1,134 @@
+import logging
+from contextlib import asynccontextmanager
+from typing import Optional
+
 from fastapi import FastAPI, Depends
-from fastapi_mcp import FastApiMCP
+from fastapi.responses import PlainTextResponse
 
+from src.presentation.admin_router import router as admin_router
+from src.presentation.middleware import MetricsMiddleware, ProfilingMiddleware
+from src.presentation.importacao_router import router as importacao_router
 from src.presentation.pessoas_router import router as pessoas_router
-from src.infrastructure.db.session import get_session
-from src.infrastructure.auth.jwt_utils import get_current_user
-
-app = FastAPI(
-    title="API Financeiro",
-    version="0.1.0",
-    docs_url="/docs",
-    openapi_url="/openapi.json",
+from src.application.importacao_service import importacao_worker
+from src.application.pessoas_service import pessoas_cache
+from src.infrastructure.admission import admission, configure_admission
+from src.infrastructure.db.session import (
+    create_schema,
+    dispose_engines,
+    get_session,
+    init_engines,
+    prewarm_pool,
 )
-
-# Inclui o router de Pessoas com autenticação e sessão de DB
-app.include_router(
-    pessoas_router,
-    #prefix="/pessoas",
-    tags=["Pessoas"],
-    dependencies=[Depends(get_current_user), Depends(get_session)],
+from src.infrastructure.auth.jwt_utils import (
+    configure_jwt,
+    get_current_user,
+    require_superuser,
+    token_cache_stats,
 )
+from src.infrastructure.observability.metrics import REGISTRY, register_cache
+from src.infrastructure.settings import Settings, get_settings
+
+logger = logging.getLogger(__name__)
+
+
+def mount_mcp(app: FastAPI) -> None:
+    """Registra o MCP server em /mcp (uma vez por app)."""
+    if getattr(app.state, "mcp", None) is not None:
+        return
+    # importado só aqui: fastapi_mcp e o SDK do MCP são a maior parte do
+    # tempo de importação da aplicação
+    from src.presentation.mcp import FinanceiroMCP
+
+    app.state.mcp = FinanceiroMCP(app)
+    app.state.mcp.mount()
+
+
+def create_app(settings: Optional[Settings] = None) -> FastAPI:
+    """
+    Monta a aplicação sem tocar no banco: os engines são criados no
+    startup (lifespan) de cada processo, com o pool pré-aquecido, e
+    fechados no shutdown, depois que o servidor drena as requisições em
+    andamento; o MCP é montado no startup. Sem `settings`, usa as do
+    ambiente.
+    """
+    settings = settings or get_settings()
+    configure_jwt(settings.jwt_secret)
+    configure_admission(settings)
+
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        init_engines(settings)
+        if settings.database_create_schema:
+            await create_schema()
+        try:
+            await prewarm_pool(settings.database_pool_prewarm)
+        except Exception:
+            # banco fora do ar não impede a subida: o pool conecta sob demanda
+            logger.warning("Falha ao pré-aquecer o pool de conexões", exc_info=True)
+        if settings.mcp_enabled:
+            mount_mcp(app)
+        # importações de CSV em segundo plano (retoma as interrompidas)
+        if settings.import_worker_enabled:
+            await importacao_worker.start()
+        try:
+            yield
+        finally:
+            if settings.import_worker_enabled:
+                await importacao_worker.stop()
+            await dispose_engines()
+
+    app = FastAPI(
+        title="API Financeiro",
+        version="0.1.0",
+        docs_url="/docs",
+        openapi_url="/openapi.json",
+        lifespan=lifespan,
+    )
+
+    # Perfil sob demanda (superusuários, X-Profile: 1) dentro das métricas
+    # por rota/SQL; contadores dos caches expostos em /metrics
+    app.add_middleware(ProfilingMiddleware)
+    app.add_middleware(MetricsMiddleware)
+    register_cache("pessoas", pessoas_cache.stats)
+    register_cache("jwt", token_cache_stats)
+
+    # Inclui o router de Pessoas com autenticação, controle de admissão
+    # (antes de qualquer uso do pool) e sessão de DB
+    app.include_router(
+        pessoas_router,
+        #prefix="/pessoas",
+        tags=["Pessoas"],
+        dependencies=[Depends(get_current_user), Depends(admission), Depends(get_session)],
+    )
+
+    app.include_router(
+        importacao_router,
+        dependencies=[Depends(get_current_user), Depends(admission), Depends(get_session)],
+    )
+
+    # Comandos SQL lentos, só para superusuários (sem admissão nem sessão)
+    app.include_router(admin_router, dependencies=[Depends(require_superuser)])
+
+    # Health check sem autenticação
+    @app.get("/health", tags=["Health"])
+    async def health():
+        return {"status": "ok"}
+
+    # Métricas no formato de texto do Prometheus, sem autenticação
+    @app.get("/metrics", tags=["Health"], include_in_schema=False)
+    async def metrics():
+        return PlainTextResponse(REGISTRY.render(), media_type="text/plain; version=0.0.4")
+
+    return app
 
-# Registra o MCP server em /mcp
-mcp = FastApiMCP(app)
-mcp.mount()
 
-# Health check sem autenticação
-@app.get("/health", tags=["Health"])
-async def health():
-    return {"status": "ok"}
+def __getattr__(name: str):
+    # `uvicorn src.main:app` continua valendo: o app é criado no primeiro
+    # acesso ao atributo, não na importação (prefira --factory create_app)
+    if name == "app":
+        globals()["app"] = create_app()
+        return globals()["app"]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 # (Opcional) custom OpenAPI
 # from fastapi.openapi.utils import get_openapi
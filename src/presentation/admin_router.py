@@ -0,0 +1,29 @@
+# src/presentation/admin_router.py
+
+from typing import Optional
+
+from fastapi import APIRouter, Query, Response, status
+
+from src.infrastructure.observability.slow_queries import slow_query_log
+from src.presentation.schemas.admin import SlowQueryLog
+
+# Rotas administrativas (só superusuários: ver create_app)
+router = APIRouter(
+    prefix="/admin",
+    tags=["Admin"],
+)
+
+@router.get("/slow-queries", response_model=SlowQueryLog)
+async def list_slow_queries(
+    limit: Optional[int] = Query(None, ge=1, le=1000, description="Quantos comandos devolver"),
+) -> dict:
+    """
+    Comandos SQL lentos deste processo (buffer circular, sem os valores
+    dos parâmetros), com o plano de execução quando disponível.
+    """
+    return {"threshold_ms": slow_query_log.threshold_ms, "entries": slow_query_log.entries(limit)}
+
+@router.delete("/slow-queries", status_code=status.HTTP_204_NO_CONTENT)
+async def clear_slow_queries() -> Response:
+    slow_query_log.clear()
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
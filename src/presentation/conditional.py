@@ -0,0 +1,102 @@
+# src/presentation/conditional.py
+
+import hashlib
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from fastapi import Response, status
+
+# ETags e Last-Modified derivados do updated_at das pessoas.
+# ETag de uma pessoa: "<id>-<updated_at em µs desde a época>" (forte e
+# reversível, o que permite o UPDATE/DELETE condicional do If-Match).
+# ETag de uma listagem: hash dos pares (id, updated_at) da página.
+
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+
+
+def _version(updated_at: datetime) -> int:
+    return (updated_at.replace(tzinfo=None) - _EPOCH) // _MICROSECOND
+
+
+def pessoa_etag(pessoa_id: int, updated_at: datetime) -> str:
+    return f'"{pessoa_id}-{_version(updated_at)}"'
+
+
+def collection_etag(versions: Iterable[Tuple[int, datetime]]) -> str:
+    digest = hashlib.sha1()
+    for pessoa_id, updated_at in versions:
+        digest.update(f"{pessoa_id}-{_version(updated_at)};".encode())
+    return f'"{digest.hexdigest()}"'
+
+
+def http_date(value: datetime) -> str:
+    # datas do banco são UTC sem fuso (datetime.utcnow)
+    return format_datetime(value.replace(tzinfo=timezone.utc), usegmt=True)
+
+
+def pessoa_headers(pessoa_id: int, updated_at: datetime) -> Dict[str, str]:
+    return {"ETag": pessoa_etag(pessoa_id, updated_at), "Last-Modified": http_date(updated_at)}
+
+
+def collection_headers(versions: List[Tuple[int, datetime]]) -> Dict[str, str]:
+    headers = {"ETag": collection_etag(versions)}
+    if versions:
+        headers["Last-Modified"] = http_date(max(updated_at for _, updated_at in versions))
+    return headers
+
+
+def _entity_tags(header: str) -> List[str]:
+    return [tag.strip() for tag in header.split(",") if tag.strip()]
+
+
+def is_not_modified(
+    headers: Dict[str, str],
+    if_none_match: Optional[str],
+    if_modified_since: Optional[str] = None,
+) -> bool:
+    """
+    Avalia If-None-Match (comparação fraca) e, só na ausência dele,
+    If-Modified-Since, contra os headers que a resposta teria.
+    """
+    if if_none_match is not None:
+        tags = _entity_tags(if_none_match)
+        if "*" in tags:
+            return True
+        return headers["ETag"] in {tag.removeprefix("W/") for tag in tags}
+    if if_modified_since is not None and "Last-Modified" in headers:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+            modified = parsedate_to_datetime(headers["Last-Modified"])
+        except (TypeError, ValueError):
+            return False
+        return modified <= since
+    return False
+
+
+def not_modified_response(headers: Dict[str, str]) -> Response:
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+
+def parse_if_match(if_match: Optional[str], pessoa_id: int) -> Optional[List[datetime]]:
+    """
+    Versões (updated_at) aceitas pelo If-Match de uma pessoa.
+    None quando não há condição (header ausente ou "*"); lista vazia
+    quando nenhuma das tags pode ser desta pessoa (a escrita falha com 412).
+    Tags fracas nunca casam: If-Match usa comparação forte.
+    """
+    if if_match is None:
+        return None
+    tags = _entity_tags(if_match)
+    if "*" in tags:
+        return None
+    versions = []
+    prefix = f'"{pessoa_id}-'
+    for tag in tags:
+        if tag.startswith(prefix) and tag.endswith('"'):
+            try:
+                versions.append(_EPOCH + int(tag[len(prefix):-1]) * _MICROSECOND)
+            except (ValueError, OverflowError):
+                continue
+    return versions
@@ -0,0 +1,44 @@
+# src/presentation/export.py
+
+import csv
+import io
+import json
+from datetime import date, datetime
+from typing import Any, Callable, Dict, Sequence
+
+# Colunas exportadas, na ordem do PessoaRead
+EXPORT_COLUMNS = ("id", "nome", "celular", "cpf", "data_nascimento", "flag", "created_at")
+
+
+def _json_default(value: Any) -> str:
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    raise TypeError(f"Tipo não serializável: {type(value).__name__}")
+
+
+def encode_ndjson(rows: Sequence[Any]) -> bytes:
+    """Um objeto JSON por linha, no mesmo formato do PessoaRead."""
+    dumps = json.JSONEncoder(ensure_ascii=False, separators=(",", ":"), default=_json_default).encode
+    return "".join(dumps(row._asdict()) + "\n" for row in rows).encode()
+
+
+def encode_csv(rows: Sequence[Any]) -> bytes:
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(
+        [v.isoformat() if isinstance(v, (date, datetime)) else v for v in row]
+        for row in rows
+    )
+    return buffer.getvalue().encode()
+
+
+def csv_header() -> bytes:
+    buffer = io.StringIO()
+    csv.writer(buffer).writerow(EXPORT_COLUMNS)
+    return buffer.getvalue().encode()
+
+
+# formato -> (media type, encoder por bloco, cabeçalho)
+FORMATS: Dict[str, tuple[str, Callable[[Sequence[Any]], bytes], bytes]] = {
+    "ndjson": ("application/x-ndjson", encode_ndjson, b""),
+    "csv": ("text/csv; charset=utf-8", encode_csv, csv_header()),
+}
@@ -0,0 +1,49 @@
+# src/presentation/importacao_router.py
+
+from typing import Literal, Optional
+
+from fastapi import APIRouter, Depends, File, HTTPException, Query, UploadFile, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.application.importacao_service import ImportacaoNotFoundError, ImportacaoService, describe
+from src.infrastructure.auth.jwt_utils import get_current_user
+from src.infrastructure.db.session import get_session
+from src.presentation.schemas.pessoas import ImportacaoStatus
+
+router = APIRouter(
+    prefix="/pessoas/import",
+    tags=["Pessoas"],
+)
+
+@router.post("", response_model=ImportacaoStatus, status_code=status.HTTP_202_ACCEPTED)
+async def import_pessoas(
+    file: UploadFile = File(..., description="CSV com cabeçalho (nome, celular, cpf, data_nascimento, flag)"),
+    on_conflict: Optional[Literal["cpf"]] = None,
+    session: AsyncSession = Depends(get_session),
+    current_user: str = Depends(get_current_user),
+) -> dict:
+    """
+    Recebe um CSV e devolve o job na hora; as linhas são validadas e
+    gravadas em segundo plano, em blocos. Acompanhe em
+    GET /pessoas/import/{job_id}.
+    """
+    service = ImportacaoService(session)
+    try:
+        job = await service.create_import(file.filename, file.file, on_conflict=on_conflict)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    return describe(job)
+
+@router.get("/{job_id}", response_model=ImportacaoStatus)
+async def get_import(
+    job_id: str,
+    rejeicoes: int = Query(100, ge=0, le=1000, description="Quantas linhas rejeitadas listar"),
+    session: AsyncSession = Depends(get_session),
+    current_user: str = Depends(get_current_user),
+) -> dict:
+    """Progresso, vazão e linhas rejeitadas de uma importação."""
+    service = ImportacaoService(session)
+    try:
+        return await service.get_import(job_id, rejeicoes_limit=rejeicoes)
+    except ImportacaoNotFoundError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
@@ -0,0 +1,55 @@
+# src/presentation/mcp.py
+
+import os
+import time
+from typing import Any, Dict, List, Optional
+
+import httpx
+from fastapi import FastAPI
+from fastapi_mcp import FastApiMCP
+
+from src.infrastructure.observability.metrics import mcp_tool_calls, mcp_tool_latency
+
+# Tempo máximo de uma chamada de ferramenta (pessoas_batch pode passar
+# dos 10 s do cliente padrão do fastapi-mcp)
+MCP_TOOL_TIMEOUT = float(os.getenv("MCP_TOOL_TIMEOUT", "60"))
+
+
+class FinanceiroMCP(FastApiMCP):
+    """
+    Servidor MCP com as rotas da API como ferramentas. As ferramentas
+    chamam o app no próprio processo (httpx + ASGITransport, sem socket),
+    com um cliente por app, e cada chamada é medida em mcp_tool_* no
+    /metrics; o SQL de cada ferramenta aparece nas métricas da rota.
+    Para sequências longas de operações, use a ferramenta pessoas_batch.
+    """
+
+    def __init__(self, app: FastAPI, **kwargs):
+        kwargs.setdefault("http_client", httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app, raise_app_exceptions=False),
+            base_url="http://apiserver",
+            timeout=MCP_TOOL_TIMEOUT,
+        ))
+        super().__init__(app, **kwargs)
+
+    async def _execute_api_tool(
+        self,
+        client: httpx.AsyncClient,
+        tool_name: str,
+        arguments: Dict[str, Any],
+        operation_map: Dict[str, Dict[str, Any]],
+        http_request_info: Optional[Any] = None,
+    ) -> List[Any]:
+        # nomes fora do mapa não viram séries novas no /metrics
+        label = tool_name if tool_name in operation_map else "desconhecida"
+        start = time.perf_counter()
+        outcome = "error"
+        try:
+            result = await super()._execute_api_tool(
+                client, tool_name, arguments, operation_map, http_request_info
+            )
+            outcome = "ok"
+            return result
+        finally:
+            mcp_tool_latency.observe(time.perf_counter() - start, (label,))
+            mcp_tool_calls.inc((label, outcome))
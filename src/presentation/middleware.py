@@ -0,0 +1,127 @@
+# src/presentation/middleware.py
+
+import json
+import time
+from urllib.parse import parse_qs
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.infrastructure.auth.jwt_utils import peek_superuser
+from src.infrastructure.observability.profiler import RequestProfiler
+from src.infrastructure.observability.metrics import (
+    RequestQueryStats,
+    current_query_stats,
+    db_queries_per_request,
+    db_rows_per_request,
+    db_time_per_request,
+    http_latency,
+    http_requests,
+)
+
+
+class MetricsMiddleware:
+    """
+    Middleware ASGI puro (sem BaseHTTPMiddleware, para custo mínimo) que
+    registra contagem e latência por template de rota e status, além dos
+    totais de SQL da requisição.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        stats = RequestQueryStats(scope)
+        token = current_query_stats.set(stats)
+        status_code = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            current_query_stats.reset(token)
+            # "route" é preenchido pelo roteamento: /pessoas/{pessoa_id}
+            route = scope.get("route")
+            path = getattr(route, "path", "unmatched")
+            method = scope["method"]
+            http_requests.inc((method, path, str(status_code)))
+            http_latency.observe(time.perf_counter() - start, (method, path))
+            db_queries_per_request.observe(stats.queries, (path,))
+            db_time_per_request.observe(stats.seconds, (path,))
+            db_rows_per_request.observe(stats.rows, (path,))
+
+
+class ProfilingMiddleware:
+    """
+    Perfil sob demanda: com o header `X-Profile: 1` (ou `?profile=1`) e um
+    token de superusuário, a requisição roda normalmente sob o profiler por
+    amostragem, e a resposta é trocada pelo perfil em JSON (status
+    original, totais de SQL e pilhas). Sem as duas condições, não faz nada.
+    Fica dentro do MetricsMiddleware, que fornece os totais de SQL.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not self._requested(scope):
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def capture(message: Message) -> None:
+            # a resposta original é descartada; fica só o status
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+
+        profiler = RequestProfiler()
+        profiler.start()
+        try:
+            await self.app(scope, receive, capture)
+        finally:
+            profiler.stop()
+
+        stats = current_query_stats.get()
+        route = scope.get("route")
+        body = json.dumps({
+            "method": scope["method"],
+            "route": getattr(route, "path", None),
+            "status": status_code,
+            "sql": {
+                "queries": stats.queries,
+                "seconds": stats.seconds,
+                "rows": stats.rows,
+            } if stats is not None else None,
+            **profiler.report(),
+        }).encode()
+        await send({
+            "type": "http.response.start",
+            "status": 200,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                (b"cache-control", b"no-store"),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
+
+    @staticmethod
+    def _requested(scope: Scope) -> bool:
+        headers = dict(scope["headers"])
+        flag = headers.get(b"x-profile", b"").decode()
+        if not flag and b"profile" in scope.get("query_string", b""):
+            flag = parse_qs(scope["query_string"].decode()).get("profile", [""])[0]
+        if flag.lower() not in ("1", "true"):
+            return False
+        return peek_superuser(headers.get(b"authorization", b"").decode())
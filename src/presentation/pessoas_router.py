@@ -1,13 +1,51 @@
 # src/presentation/pessoas_router.py
 
-from typing import List
+from typing import Any, Dict, List, Literal, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Body, Depends, Header, HTTPException, Query, Response, status
+from fastapi.responses import StreamingResponse
+from pydantic import ValidationError
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.presentation.schemas.pessoas import PessoaCreate, PessoaRead, PessoaUpdate
-from src.application.pessoas_service import PessoaService
-from src.infrastructure.db.session import get_session
+from src.presentation.schemas.pessoas import (
+    PessoaBatchGet,
+    PessoaBatchItem,
+    PessoaBatchRequest,
+    PessoaBulkResult,
+    PessoaChangesPage,
+    PessoaCreate,
+    PessoaOperation,
+    PessoaOperationResult,
+    PessoaRead,
+    PessoaStats,
+    PessoaUpdate,
+)
+from src.presentation.conditional import (
+    collection_headers,
+    is_not_modified,
+    not_modified_response,
+    parse_if_match,
+    pessoa_etag,
+    pessoa_headers,
+)
+from src.presentation.export import FORMATS
+from src.presentation.serialization import (
+    batch_response,
+    changes_response,
+    operations_response,
+    pessoa_response,
+    pessoas_response,
+)
+from src.application.pessoas_service import (
+    BATCH_MAX_OPERATIONS,
+    BULK_MAX_ITEMS,
+    PessoaNotFoundError,
+    PessoaPreconditionFailedError,
+    PessoaService,
+    pessoas_cache,
+)
+from src.infrastructure.admission import AdmissionSlot, StreamingAdmissionResponse, admission
+from src.infrastructure.db.session import get_read_session, get_session, read_sessionmaker
 from src.infrastructure.auth.jwt_utils import get_current_user
 
 router = APIRouter(
@@ -20,7 +58,7 @@ async def create_pessoa(
     payload: PessoaCreate,
     session: AsyncSession = Depends(get_session),
     current_user: str = Depends(get_current_user),
-) -> PessoaRead:
+) -> Response:
     service = PessoaService(session)
     try:
         pessoa = await service.create_pessoa(
@@ -30,60 +68,371 @@ async def create_pessoa(
             data_nascimento=payload.data_nascimento,
             flag=payload.flag,
         )
-        return pessoa
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    return pessoa_response(
+        pessoa, status.HTTP_201_CREATED, pessoa_headers(pessoa.id, pessoa.updated_at)
+    )
+
+@router.post("/bulk", response_model=List[PessoaBulkResult])
+async def bulk_upsert_pessoas(
+    payload: List[Dict[str, Any]] = Body(..., description="Itens no formato de PessoaCreate"),
+    on_conflict: Optional[Literal["cpf"]] = None,
+    batch_size: Optional[int] = Query(
+        None, ge=1, le=10000, description="Linhas por INSERT (o repositório limita pelo máximo de parâmetros)"
+    ),
+    session: AsyncSession = Depends(get_session),
+    current_user: str = Depends(get_current_user),
+) -> List[Dict[str, Any]]:
+    """
+    Cria (ou, com on_conflict=cpf, atualiza) várias pessoas em uma transação.
+    Cada item é validado sozinho: os inválidos voltam como rejected, com o
+    motivo, e não impedem a gravação dos demais.
+    """
+    if len(payload) > BULK_MAX_ITEMS:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"Máximo de {BULK_MAX_ITEMS} itens por chamada.",
+        )
+    results: List[Dict[str, Any]] = []
+    validos: List[Dict[str, Any]] = []
+    posicoes: List[int] = []
+    for index, item in enumerate(payload):
+        try:
+            validos.append(PessoaCreate.model_validate(item).model_dump())
+        except ValidationError as e:
+            results.append({"index": index, "status": "rejected", "id": None, "motivo": _motivo(e)})
+            continue
+        posicoes.append(index)
+
+    service = PessoaService(session)
+    try:
+        gravados = await service.bulk_upsert(validos, conflict_key=on_conflict, batch_size=batch_size)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    # os índices do serviço contam só os válidos: volta para os do payload
+    results.extend({**result, "index": posicoes[result["index"]]} for result in gravados)
+    return sorted(results, key=lambda result: result["index"])
+
+def _motivo(error: ValidationError) -> str:
+    motivos = []
+    for e in error.errors():
+        campo = ".".join(str(part) for part in e["loc"])
+        motivos.append(f"{campo}: {e['msg']}" if campo else e["msg"])
+    return "; ".join(motivos)
+
+@router.post("/batch-get", response_model=List[PessoaBatchItem])
+async def batch_get_pessoas(
+    payload: PessoaBatchGet,
+    session: AsyncSession = Depends(get_read_session),
+    current_user: str = Depends(get_current_user),
+) -> Response:
+    """
+    Várias pessoas por id em uma requisição (uma consulta para os ids fora
+    do cache). Um resultado por id pedido, na mesma ordem; ids inexistentes
+    vêm com found=false.
+    """
+    service = PessoaService(session)
+    try:
+        pessoas = await service.get_pessoas(payload.ids)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    return batch_response([
+        {"id": pessoa_id, "found": pessoa is not None, "pessoa": pessoa}
+        for pessoa_id, pessoa in zip(payload.ids, pessoas)
+    ])
+
+@router.post("/batch", response_model=List[PessoaOperationResult], operation_id="pessoas_batch")
+async def run_pessoas_batch(
+    payload: PessoaBatchRequest,
+    session: AsyncSession = Depends(get_session),
+    current_user: str = Depends(get_current_user),
+) -> Response:
+    """
+    Executa várias operações de pessoas (get, get_by_cpf, create, update,
+    delete) em ordem, em uma requisição e uma sessão de banco. Cada
+    operação tem o próprio status (o código HTTP que a rota individual
+    daria); uma falha não interrompe as seguintes. Feito para clientes
+    MCP que encadeiam muitas chamadas pequenas.
+    """
+    if len(payload.operations) > BATCH_MAX_OPERATIONS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Máximo de {BATCH_MAX_OPERATIONS} operações por chamada.",
+        )
+    service = PessoaService(session)
+    return operations_response([
+        await _run_operation(service, index, operation)
+        for index, operation in enumerate(payload.operations)
+    ])
+
+async def _run_operation(
+    service: PessoaService, index: int, operation: PessoaOperation
+) -> Dict[str, Any]:
+    result: Dict[str, Any] = {"index": index, "op": operation.op, "status": status.HTTP_200_OK}
+    data = operation.data.model_dump() if operation.data is not None else {}
+    try:
+        _check_operation(operation)
+        if operation.op == "get":
+            pessoa = await service.get_pessoa(operation.id)
+        elif operation.op == "get_by_cpf":
+            pessoa = await service.get_pessoa_by_cpf(operation.cpf)
+        elif operation.op == "create":
+            pessoa = await service.create_pessoa(**data)
+            result["status"] = status.HTTP_201_CREATED
+        elif operation.op == "update":
+            pessoa = await service.update_pessoa(
+                operation.id, **data, expected=parse_if_match(operation.if_match, operation.id)
+            )
+        else:
+            await service.delete_pessoa(
+                operation.id, expected=parse_if_match(operation.if_match, operation.id)
+            )
+            result["status"] = status.HTTP_204_NO_CONTENT
+            return result
+    except PessoaNotFoundError as e:
+        return {**result, "status": status.HTTP_404_NOT_FOUND, "erro": str(e)}
+    except PessoaPreconditionFailedError as e:
+        return {**result, "status": status.HTTP_412_PRECONDITION_FAILED, "erro": str(e)}
+    except ValueError as e:
+        return {**result, "status": status.HTTP_400_BAD_REQUEST, "erro": str(e)}
+    result["pessoa"] = pessoa
+    result["etag"] = pessoa_etag(pessoa.id, pessoa.updated_at)
+    return result
+
+def _check_operation(operation: PessoaOperation) -> None:
+    """Campos obrigatórios de cada operação; a falta vira 400 só nela."""
+    if operation.op in ("get", "update", "delete") and operation.id is None:
+        raise ValueError("Informe o id da pessoa.")
+    if operation.op == "get_by_cpf" and not (operation.cpf or "").strip():
+        raise ValueError("Informe o CPF.")
+    if operation.op == "create" and (operation.data is None or not operation.data.nome):
+        raise ValueError("Informe os dados da pessoa (data.nome).")
+    if operation.op == "update" and operation.data is None:
+        raise ValueError("Informe os campos a alterar (data).")
+
+@router.get("/search", response_model=List[PessoaRead])
+async def search_pessoas(
+    q: str = Query(..., min_length=1, max_length=100),
+    limit: int = Query(20, ge=1, le=100),
+    session: AsyncSession = Depends(get_read_session),
+    current_user: str = Depends(get_current_user),
+) -> Response:
+    """
+    Busca por nome (prefixo e similaridade), ignorando acentos e
+    maiúsculas. Resultados ordenados por relevância.
+    """
+    service = PessoaService(session)
+    try:
+        pessoas = await service.search_pessoas(q, limit=limit)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    return pessoas_response(pessoas)
+
+@router.get("/changes", response_model=PessoaChangesPage)
+async def list_pessoas_changes(
+    since: Optional[str] = None,
+    limit: int = Query(1000, ge=1, le=10000),
+    session: AsyncSession = Depends(get_read_session),
+    current_user: str = Depends(get_current_user),
+) -> Response:
+    """
+    Sincronização incremental: pessoas criadas, alteradas ou removidas
+    depois do token `since` (omita na primeira carga). Chame de novo com
+    `next_token` enquanto `has_more` for verdadeiro.
+    """
+    service = PessoaService(session)
+    try:
+        page = await service.list_changes(since=since, limit=limit)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    return changes_response(page)
+
+@router.get("/export", response_class=StreamingResponse)
+async def export_pessoas(
+    format: Literal["ndjson", "csv"] = "ndjson",
+    chunk_size: int = Query(1000, ge=1, le=10000),
+    current_user: dict = Depends(get_current_user),
+    slot: Optional[AdmissionSlot] = Depends(admission),
+) -> StreamingResponse:
+    """
+    Exporta a tabela inteira em streaming (NDJSON ou CSV), com memória
+    constante: as linhas vêm de um cursor no servidor, bloco a bloco.
+    A vaga de admissão fica presa até o fim do envio.
+    """
+    media_type, encode, header = FORMATS[format]
+
+    async def body():
+        # sessão própria: o streaming continua depois que o endpoint retorna
+        async with read_sessionmaker(current_user["id"])() as session:
+            if header:
+                yield header
+            async for rows in PessoaService(session).stream_pessoas(chunk_size):
+                yield encode(rows)
+
+    return StreamingAdmissionResponse(
+        body(),
+        slot,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="pessoas.{format}"'},
+    )
+
+@router.get("/by-cpf/{cpf}", response_model=PessoaRead)
+async def get_pessoa_by_cpf(
+    cpf: str,
+    session: AsyncSession = Depends(get_read_session),
+    current_user: str = Depends(get_current_user),
+) -> Response:
+    """Busca pelo CPF, com ou sem pontuação."""
+    service = PessoaService(session)
+    try:
+        pessoa = await service.get_pessoa_by_cpf(cpf)
+    except PessoaNotFoundError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    return pessoa_response(pessoa)
+
+@router.get("/by-celular/{celular}", response_model=List[PessoaRead])
+async def list_pessoas_by_celular(
+    celular: str,
+    limit: int = Query(100, ge=1, le=1000),
+    session: AsyncSession = Depends(get_read_session),
+    current_user: str = Depends(get_current_user),
+) -> Response:
+    """Pessoas com o celular informado, com ou sem formatação."""
+    service = PessoaService(session)
+    try:
+        pessoas = await service.list_pessoas_by_celular(celular, limit=limit)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    return pessoas_response(pessoas)
+
+@router.get("/cache/stats")
+async def cache_stats(
+    current_user: str = Depends(get_current_user),
+) -> dict:
+    """Contadores do cache de leituras por id (hits, misses, evictions...)."""
+    return pessoas_cache.stats()
+
+@router.get("/stats", response_model=PessoaStats)
+async def pessoas_stats(
+    dias: int = Query(30, ge=1, le=366),
+    session: AsyncSession = Depends(get_read_session),
+    current_user: str = Depends(get_current_user),
+) -> dict:
+    """
+    Totais geral, por flag, por mês de nascimento e por faixa etária, e
+    pessoas criadas por dia nos últimos `dias` dias. Vem de contadores
+    mantidos a cada escrita: o tempo não depende do tamanho da tabela.
+    """
+    return await PessoaService(session).get_stats(dias=dias)
 
 @router.get("/{pessoa_id}", response_model=PessoaRead)
 async def get_pessoa(
     pessoa_id: int,
-    session: AsyncSession = Depends(get_session),
+    if_none_match: Optional[str] = Header(None),
+    if_modified_since: Optional[str] = Header(None),
+    session: AsyncSession = Depends(get_read_session),
     current_user: str = Depends(get_current_user),
-) -> PessoaRead:
+) -> Response:
+    """
+    Responde com ETag/Last-Modified; If-None-Match/If-Modified-Since
+    ainda válidos recebem 304 sem carregar a pessoa inteira.
+    """
     service = PessoaService(session)
+    if if_none_match is not None or if_modified_since is not None:
+        updated_at = await service.get_pessoa_version(pessoa_id)
+        if updated_at is not None:
+            headers = pessoa_headers(pessoa_id, updated_at)
+            if is_not_modified(headers, if_none_match, if_modified_since):
+                return not_modified_response(headers)
     try:
-        return await service.get_pessoa(pessoa_id)
+        pessoa = await service.get_pessoa(pessoa_id)
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+    return pessoa_response(pessoa, headers=pessoa_headers(pessoa.id, pessoa.updated_at))
 
 @router.get("/", response_model=List[PessoaRead])
 async def list_pessoas(
-    skip: int = 0,
-    limit: int = 100,
-    session: AsyncSession = Depends(get_session),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = None,
+    order_by: Literal["id", "created_at"] = "id",
+    count: Optional[Literal["estimated", "exact"]] = None,
+    if_none_match: Optional[str] = Header(None),
+    session: AsyncSession = Depends(get_read_session),
     current_user: str = Depends(get_current_user),
-) -> List[PessoaRead]:
+) -> Response:
+    """
+    Lista pessoas. Com `cursor` usa paginação keyset; o cursor da
+    próxima página volta no header `X-Next-Cursor`.
+    O ETag da página cobre ids e versões das linhas: com If-None-Match
+    ainda válido responde 304 consultando só (id, updated_at).
+    Com `count`, o total de pessoas vem em `X-Total-Count`: exact lê o
+    contador mantido nas escritas; estimated, as estatísticas do planner.
+    """
     service = PessoaService(session)
-    return await service.list_pessoas(skip=skip, limit=limit)
+    try:
+        if if_none_match is not None:
+            versions = await service.list_pessoas_versions(
+                limit=limit, cursor=cursor, skip=skip, order_by=order_by
+            )
+            headers = collection_headers(versions)
+            if is_not_modified(headers, if_none_match):
+                return not_modified_response(headers)
+        pessoas, next_cursor = await service.list_pessoas_page(
+            limit=limit, cursor=cursor, skip=skip, order_by=order_by
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    headers = collection_headers([(p.id, p.updated_at) for p in pessoas])
+    if next_cursor:
+        headers["X-Next-Cursor"] = next_cursor
+    if count is not None:
+        headers["X-Total-Count"] = str(await service.count_pessoas(count))
+    return pessoas_response(pessoas, headers=headers)
 
 @router.put("/{pessoa_id}", response_model=PessoaRead)
 async def update_pessoa(
     pessoa_id: int,
     payload: PessoaUpdate,
+    if_match: Optional[str] = Header(None),
     session: AsyncSession = Depends(get_session),
     current_user: str = Depends(get_current_user),
-) -> PessoaRead:
+) -> Response:
+    """Com If-Match, só grava se a pessoa ainda estiver na versão do ETag (senão 412)."""
     service = PessoaService(session)
     try:
-        return await service.update_pessoa(
+        pessoa = await service.update_pessoa(
             pessoa_id=pessoa_id,
             nome=payload.nome,
             celular=payload.celular,
             cpf=payload.cpf,
             data_nascimento=payload.data_nascimento,
             flag=payload.flag,
+            expected=parse_if_match(if_match, pessoa_id),
         )
-    except ValueError as e:
+    except PessoaNotFoundError as e:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+    except PessoaPreconditionFailedError as e:
+        raise HTTPException(status_code=status.HTTP_412_PRECONDITION_FAILED, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    return pessoa_response(pessoa, headers=pessoa_headers(pessoa.id, pessoa.updated_at))
 
 @router.delete("/{pessoa_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_pessoa(
     pessoa_id: int,
+    if_match: Optional[str] = Header(None),
     session: AsyncSession = Depends(get_session),
     current_user: str = Depends(get_current_user),
 ) -> None:
+    """Com If-Match, só remove se a pessoa ainda estiver na versão do ETag (senão 412)."""
     service = PessoaService(session)
     try:
-        await service.delete_pessoa(pessoa_id)
+        await service.delete_pessoa(pessoa_id, expected=parse_if_match(if_match, pessoa_id))
+    except PessoaPreconditionFailedError as e:
+        raise HTTPException(status_code=status.HTTP_412_PRECONDITION_FAILED, detail=str(e))
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
@@ -0,0 +1,21 @@
+from typing import Any, List, Optional
+from pydantic import BaseModel, Field
+
+
+class SlowQuery(BaseModel):
+    """Um comando SQL acima de SLOW_QUERY_MS."""
+    id: int = Field(..., description="Sequencial no processo")
+    at: str = Field(..., description="Quando terminou (UTC, ISO 8601)")
+    engine: str = Field(..., description="primary ou replicaN")
+    route: Optional[str] = Field(None, description="Rota da requisição que executou o comando")
+    duration_ms: float = Field(..., description="Duração do comando")
+    statement: str = Field(..., description="SQL com placeholders")
+    parameters: Any = Field(None, description="Tipos dos parâmetros (sem os valores)")
+    plan: Optional[str] = Field(None, description="Saída do EXPLAIN (ANALYZE, BUFFERS só em leituras)")
+    plan_error: Optional[str] = Field(None, description="Por que não há plano")
+
+
+class SlowQueryLog(BaseModel):
+    """Comandos lentos deste processo, do mais recente para o mais antigo."""
+    threshold_ms: float = Field(..., description="Limite de SLOW_QUERY_MS (0 = desligado)")
+    entries: List[SlowQuery]
@@ -1,6 +1,6 @@
 from datetime import date, datetime
-from typing import Optional
-from pydantic import BaseModel, Field
+from typing import Dict, List, Literal, Optional
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class PessoaBase(BaseModel):
@@ -27,8 +27,105 @@ class PessoaUpdate(BaseModel):
 
 class PessoaRead(PessoaBase):
     """Schema para leitura de Pessoa."""
+    model_config = ConfigDict(from_attributes=True)
+
     id: int = Field(..., description="ID da pessoa")
     created_at: datetime = Field(..., description="Timestamp de criação")
 
-    class Config:
-        orm_mode = True
+
+class PessoaBulkResult(BaseModel):
+    """Resultado de um item do upsert em massa."""
+    index: int = Field(..., description="Posição do item no lote enviado")
+    status: Literal["created", "updated", "rejected"] = Field(..., description="Resultado do item")
+    id: Optional[int] = Field(None, description="ID da pessoa gravada")
+    motivo: Optional[str] = Field(None, description="Motivo da rejeição")
+
+
+class PessoaChange(BaseModel):
+    """Uma mudança do feed de sincronização."""
+    op: Literal["upsert", "delete"] = Field(..., description="upsert: criada/alterada; delete: removida")
+    id: int = Field(..., description="ID da pessoa")
+    pessoa: Optional[PessoaRead] = Field(None, description="Estado atual (ausente em delete)")
+
+
+class PessoaChangesPage(BaseModel):
+    """Página do feed de mudanças."""
+    changes: List[PessoaChange] = Field(..., description="Mudanças na ordem em que foram gravadas")
+    next_token: str = Field(..., description="Token para a próxima chamada (since)")
+    has_more: bool = Field(..., description="Há mais mudanças após esta página")
+
+
+class PessoaBatchGet(BaseModel):
+    """Ids pedidos em POST /pessoas/batch-get."""
+    ids: List[int] = Field(..., description="IDs das pessoas, na ordem desejada", min_length=1)
+
+
+class PessoaBatchItem(BaseModel):
+    """Um resultado do batch-get, na posição do id pedido."""
+    id: int = Field(..., description="ID pedido")
+    found: bool = Field(..., description="Falso se a pessoa não existe")
+    pessoa: Optional[PessoaRead] = Field(None, description="A pessoa, quando encontrada")
+
+
+class PessoaOperation(BaseModel):
+    """Uma operação de POST /pessoas/batch."""
+    op: Literal["get", "get_by_cpf", "create", "update", "delete"] = Field(..., description="Operação")
+    id: Optional[int] = Field(None, description="ID da pessoa (get, update, delete)")
+    cpf: Optional[str] = Field(None, description="CPF, com ou sem pontuação (get_by_cpf)")
+    data: Optional[PessoaUpdate] = Field(None, description="Campos da pessoa (create, update)")
+    if_match: Optional[str] = Field(None, description="ETag esperado, como o header If-Match (update, delete)")
+
+
+class PessoaBatchRequest(BaseModel):
+    """Operações executadas em ordem, na mesma sessão de banco."""
+    operations: List[PessoaOperation] = Field(..., description="Operações, na ordem de execução", min_length=1)
+
+
+class PessoaOperationResult(BaseModel):
+    """Resultado de uma operação do batch, na posição dela."""
+    index: int = Field(..., description="Posição da operação no lote")
+    op: str = Field(..., description="Operação executada")
+    status: int = Field(..., description="Código HTTP equivalente (200, 201, 204, 400, 404, 412)")
+    pessoa: Optional[PessoaRead] = Field(None, description="A pessoa lida ou gravada")
+    etag: Optional[str] = Field(None, description="ETag da pessoa (para if_match)")
+    erro: Optional[str] = Field(None, description="Motivo da falha")
+
+
+class PessoaCriadasNoDia(BaseModel):
+    """Pessoas criadas em um dia (UTC)."""
+    dia: date = Field(..., description="Dia da criação")
+    total: int = Field(..., description="Pessoas criadas no dia (ainda cadastradas)")
+
+
+class PessoaStats(BaseModel):
+    """Estatísticas das pessoas cadastradas."""
+    total: int = Field(..., description="Total de pessoas")
+    por_flag: Dict[str, int] = Field(..., description="Total por flag (sem_flag para as sem flag)")
+    por_mes_nascimento: Dict[str, int] = Field(..., description="Total por mês de nascimento (01 a 12, sem_data)")
+    por_faixa_etaria: Dict[str, int] = Field(..., description="Total por faixa etária, com precisão de mês")
+    criadas_por_dia: List[PessoaCriadasNoDia] = Field(..., description="Criadas por dia no período pedido")
+
+
+class ImportacaoRejeicao(BaseModel):
+    """Linha rejeitada de uma importação."""
+    linha: int = Field(..., description="Linha do arquivo (o cabeçalho é a linha 1)")
+    motivo: str = Field(..., description="Motivo da rejeição")
+
+
+class ImportacaoStatus(BaseModel):
+    """Estado de um job de importação de CSV."""
+    id: str = Field(..., description="ID do job")
+    status: Literal["pending", "running", "done", "failed"] = Field(..., description="Situação do job")
+    arquivo: str = Field(..., description="Nome do arquivo enviado")
+    total_estimado: Optional[int] = Field(None, description="Linhas de dados estimadas no arquivo")
+    processadas: int = Field(..., description="Linhas já gravadas (ponto de retomada)")
+    criadas: int = Field(..., description="Pessoas criadas")
+    atualizadas: int = Field(..., description="Pessoas atualizadas (on_conflict=cpf)")
+    rejeitadas: int = Field(..., description="Linhas rejeitadas")
+    progresso: Optional[float] = Field(None, description="Fração concluída (0 a 1), estimada")
+    linhas_por_segundo: Optional[float] = Field(None, description="Vazão desde o início do job")
+    erro: Optional[str] = Field(None, description="Erro que interrompeu o job")
+    created_at: datetime = Field(..., description="Envio do arquivo")
+    started_at: Optional[datetime] = Field(None, description="Início do processamento")
+    finished_at: Optional[datetime] = Field(None, description="Fim do processamento")
+    rejeicoes: List[ImportacaoRejeicao] = Field(default_factory=list, description="Primeiras linhas rejeitadas")
@@ -0,0 +1,64 @@
+# src/presentation/serialization.py
+
+from typing import Any, Iterable, List, Mapping, Optional
+
+from fastapi import Response
+from pydantic import TypeAdapter
+
+from src.presentation.schemas.pessoas import (
+    PessoaBatchItem,
+    PessoaChangesPage,
+    PessoaOperationResult,
+    PessoaRead,
+)
+
+# Adapters pré-compilados: lêem os atributos das linhas/objetos ORM e geram
+# os bytes JSON em uma passada (no pydantic-core), sem o caminho padrão do
+# FastAPI (validação do response_model + jsonable_encoder + json.dumps).
+# O JSON gerado é idêntico ao do caminho padrão.
+_pessoa_adapter = TypeAdapter(PessoaRead)
+_pessoas_adapter = TypeAdapter(List[PessoaRead])
+_changes_adapter = TypeAdapter(PessoaChangesPage)
+_batch_adapter = TypeAdapter(List[PessoaBatchItem])
+_operations_adapter = TypeAdapter(List[PessoaOperationResult])
+
+
+def render_pessoa(pessoa: Any) -> bytes:
+    return _pessoa_adapter.dump_json(
+        _pessoa_adapter.validate_python(pessoa, from_attributes=True)
+    )
+
+
+def render_pessoas(pessoas: Iterable[Any]) -> bytes:
+    return _pessoas_adapter.dump_json(
+        _pessoas_adapter.validate_python(pessoas, from_attributes=True)
+    )
+
+
+def pessoa_response(
+    pessoa: Any, status_code: int = 200, headers: Optional[Mapping[str, str]] = None
+) -> Response:
+    return Response(render_pessoa(pessoa), status_code, headers, media_type="application/json")
+
+
+def pessoas_response(
+    pessoas: Iterable[Any], status_code: int = 200, headers: Optional[Mapping[str, str]] = None
+) -> Response:
+    return Response(render_pessoas(pessoas), status_code, headers, media_type="application/json")
+
+
+def changes_response(page: Mapping[str, Any]) -> Response:
+    body = _changes_adapter.dump_json(_changes_adapter.validate_python(page, from_attributes=True))
+    return Response(body, media_type="application/json")
+
+
+def batch_response(items: Iterable[Mapping[str, Any]]) -> Response:
+    body = _batch_adapter.dump_json(_batch_adapter.validate_python(items, from_attributes=True))
+    return Response(body, media_type="application/json")
+
+
+def operations_response(results: Iterable[Mapping[str, Any]]) -> Response:
+    body = _operations_adapter.dump_json(
+        _operations_adapter.validate_python(results, from_attributes=True)
+    )
+    return Response(body, media_type="application/json")
@@ -0,0 +1,65 @@
+# src/serve.py
+
+"""
+Servidor de produção: python -m src.serve
+
+Sobe WEB_CONCURRENCY processos do uvicorn (padrão: as CPUs disponíveis
+para o container), cada um com o próprio app, engines e pool, criados no
+lifespan depois do spawn. Usa uvloop e httptools quando instalados. No
+SIGTERM, cada processo para de aceitar conexões, espera as requisições
+em andamento (até SERVER_GRACEFUL_TIMEOUT) e fecha o pool.
+"""
+
+import math
+import os
+from typing import Optional
+
+import uvicorn
+
+from src.infrastructure.settings import get_settings
+
+CGROUP_CPU_MAX = "/sys/fs/cgroup/cpu.max"
+
+
+def cgroup_cpu_limit(cpu_max: str) -> Optional[int]:
+    """CPUs da cota do cgroup v2 ("<quota> <período>" ou "max <período>")."""
+    parts = cpu_max.split()
+    if len(parts) != 2 or parts[0] == "max":
+        return None
+    return max(1, math.ceil(int(parts[0]) / int(parts[1])))
+
+
+def available_cpus() -> int:
+    """CPUs utilizáveis: afinidade do processo, limitada pela cota do container."""
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:
+        cpus = os.cpu_count() or 1
+    try:
+        with open(CGROUP_CPU_MAX) as f:
+            limit = cgroup_cpu_limit(f.read())
+    except (OSError, ValueError):
+        limit = None
+    return min(cpus, limit) if limit else cpus
+
+
+def main() -> None:
+    settings = get_settings()
+    uvicorn.run(
+        "src.main:create_app",
+        factory=True,
+        host=settings.server_host,
+        port=settings.server_port,
+        workers=settings.web_concurrency or available_cpus(),
+        # "auto": uvloop e httptools se instalados, senão asyncio e h11
+        loop="auto",
+        http="auto",
+        lifespan="on",
+        timeout_graceful_shutdown=settings.server_graceful_timeout,
+        access_log=settings.server_access_log,
+        proxy_headers=True,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -8,15 +8,18 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..",
 
 import pytest
 import pytest_asyncio
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import NullPool
 
 from src.core.pessoas.model import Base
+from src.infrastructure.db.session import _async_url, _sqlite_pragmas_listener
+from src.infrastructure.settings import Settings
 
 @pytest.fixture(scope="session")
 def test_database_url():
+    # Postgres ou SQLite (ex.: TEST_DATABASE_URL=sqlite:////tmp/financeiro.db)
     return (
         os.getenv("TEST_DATABASE_URL")
         or os.getenv("DATABASE_URL")
@@ -26,20 +29,19 @@ def test_database_url():
 @pytest.fixture(scope="session")
 def sync_engine(test_database_url):
     # para o teste de migrações, sem alterar pool
-    engine = create_engine(test_database_url, poolclass=NullPool, echo=False)
+    url = test_database_url.replace("+asyncpg", "", 1).replace("+aiosqlite", "", 1)
+    engine = create_engine(url, poolclass=NullPool, echo=False)
     Base.metadata.create_all(engine)
     return engine
 
 @pytest_asyncio.fixture(scope="session")
 async def async_engine(test_database_url):
-    # ajusta URL para asyncpg
-    url = (
-        test_database_url
-        if test_database_url.startswith("postgresql+asyncpg://")
-        else test_database_url.replace("postgresql://", "postgresql+asyncpg://", 1)
-    )
+    # ajusta URL para asyncpg/aiosqlite, com os PRAGMAs da aplicação no SQLite
+    url = _async_url(test_database_url)
     # NÃO especificar poolclass aqui: usar o padrão
     engine = create_async_engine(url, echo=False)
+    if engine.dialect.name == "sqlite":
+        event.listen(engine.sync_engine, "connect", _sqlite_pragmas_listener(Settings()))
     yield engine
     await engine.dispose()
 
@@ -0,0 +1,150 @@
+# tests/test_admission.py
+
+import asyncio
+import time
+
+import httpx
+import jwt
+import pytest
+
+from src.infrastructure import admission
+from src.infrastructure.admission import (
+    AdmissionRejected,
+    AdmissionSlot,
+    ConcurrencyLimiter,
+    StreamingAdmissionResponse,
+    TokenBuckets,
+)
+from src.infrastructure.auth import jwt_utils
+from src.infrastructure.settings import Settings
+from src.main import create_app
+
+@pytest.mark.asyncio
+async def test_limiter_queues_then_sheds():
+    limiter = ConcurrencyLimiter(limit=1, queue_size=1, timeout=1)
+    assert await limiter.acquire() is False
+
+    waiting = asyncio.create_task(limiter.acquire())
+    await asyncio.sleep(0)
+    assert limiter.queued == 1
+    with pytest.raises(AdmissionRejected) as e:
+        await limiter.acquire()
+    assert e.value.outcome == "shed"
+
+    # a vaga passa direto para quem esperava
+    limiter.release()
+    assert await waiting is True
+    assert limiter.active == 1 and limiter.queued == 0
+    limiter.release()
+    assert limiter.active == 0
+
+@pytest.mark.asyncio
+async def test_limiter_wait_times_out_and_cancel_keeps_slots():
+    limiter = ConcurrencyLimiter(limit=1, queue_size=5, timeout=0.01)
+    await limiter.acquire()
+    with pytest.raises(AdmissionRejected) as e:
+        await limiter.acquire()
+    assert e.value.outcome == "timeout"
+
+    limiter.timeout = 5
+    waiting = asyncio.create_task(limiter.acquire())
+    await asyncio.sleep(0)
+    waiting.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiting
+    assert limiter.queued == 0
+    limiter.release()
+    assert limiter.active == 0
+
+def test_token_bucket_per_user():
+    buckets = TokenBuckets(rate=1, burst=2)
+    buckets.take(1, now=0)
+    buckets.take(1, now=0)
+    with pytest.raises(AdmissionRejected) as e:
+        buckets.take(1, now=0.5)
+    assert e.value.retry_after == 1
+    buckets.take(2, now=0.5)  # outro usuário não é afetado
+    buckets.take(1, now=1.5)
+
+@pytest.mark.asyncio
+async def test_rejections_carry_retry_after(test_database_url):
+    app = create_app(Settings(
+        database_url=test_database_url,
+        database_create_schema=True,
+        jwt_secret="segredo-de-teste",
+        database_pool_prewarm=0,
+        mcp_enabled=False,
+        import_worker_enabled=False,
+        # escritas sem vaga nem fila; leituras com rajada de 1 por usuário
+        admission_write_concurrency=0,
+        admission_write_queue=0,
+        admission_read_user_rate=0.001,
+        admission_read_user_burst=1,
+    ))
+    payload = {"id": 4242, "email": "a@b.com", "isSuperUser": False, "exp": int(time.time()) + 60}
+    headers = {"Authorization": "Bearer " + jwt.encode(payload, jwt_utils.jwt_secret(), algorithm="HS256")}
+
+    transport = httpx.ASGITransport(app=app)
+    async with app.router.lifespan_context(app), httpx.AsyncClient(
+        transport=transport, base_url="http://test", headers=headers
+    ) as client:
+        response = await client.post("/pessoas/", json={"nome": "Sem vaga"})
+        assert response.status_code == 503
+        assert response.headers["Retry-After"] == "1"
+
+        # batch-get conta como leitura: o bucket do usuário (rajada 1) esgota
+        assert (await client.post("/pessoas/batch-get", json={"ids": [0]})).status_code == 200
+        response = await client.get("/pessoas/0")
+        assert response.status_code == 429
+        assert int(response.headers["Retry-After"]) >= 1
+    assert admission.ROUTE_CLASSES["read"].limiter.active == 0
+
+def test_route_classes_follow_settings():
+    # réplicas só nas Settings (nem no ambiente): leituras com o pool inteiro
+    admission.configure_admission(Settings(database_url="postgresql://h/db", database_read_urls="postgresql://r/db"))
+    capacidade = admission.pool_capacity(Settings(database_url="postgresql://h/db"))
+    assert admission.ROUTE_CLASSES["read"].limiter.limit == capacidade
+    admission.configure_admission(Settings(database_url="postgresql://h/db", admission_write_concurrency=2))
+    assert admission.ROUTE_CLASSES["write"].limiter.limit == 2
+    assert admission.ROUTE_CLASSES["write"].limiter.queue_size == 4
+    assert admission.ROUTE_CLASSES["read"].limiter.limit == capacidade - capacidade // 3
+
+@pytest.mark.asyncio
+async def test_slot_released_when_wait_times_out_after_handoff(monkeypatch):
+    limiter = ConcurrencyLimiter(limit=1, queue_size=1, timeout=1)
+    await limiter.acquire()
+
+    async def handoff_then_timeout(future, timeout):
+        # a vaga chega (release) no mesmo instante em que a espera esgota
+        limiter.release()
+        raise asyncio.TimeoutError
+
+    monkeypatch.setattr(asyncio, "wait_for", handoff_then_timeout)
+    with pytest.raises(AdmissionRejected):
+        await limiter.acquire()
+    assert limiter.active == 0 and limiter.queued == 0
+
+@pytest.mark.asyncio
+async def test_streaming_response_holds_slot_until_sent():
+    limiter = ConcurrencyLimiter(limit=1, queue_size=0, timeout=1)
+    await limiter.acquire()
+    slot = AdmissionSlot(limiter)
+    durante = []
+
+    async def body():
+        yield b"a"
+        durante.append(limiter.active)
+        yield b"b"
+
+    response = StreamingAdmissionResponse(body(), slot)
+    assert slot.detached  # a dependência não devolve a vaga no fim do endpoint
+
+    async def receive():
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        pass
+
+    await response({"type": "http", "asgi": {"spec_version": "2.4"}}, receive, send)
+    assert durante == [1]
+    assert limiter.active == 0
@@ -0,0 +1,79 @@
+# tests/test_app_factory.py
+
+import os
+import subprocess
+import sys
+
+import httpx
+import pytest
+
+from src.infrastructure.db import session as db_session
+from src.infrastructure.settings import Settings
+from src.main import create_app
+from src.serve import cgroup_cpu_limit
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+def test_import_needs_no_configuration():
+    env = {k: v for k, v in os.environ.items() if k not in ("DATABASE_URL", "JWT_SECRET")}
+    code = (
+        "import sys, src.main, src.infrastructure.db.session as s; "
+        "assert s.engine is None; assert 'fastapi_mcp' not in sys.modules"
+    )
+    # roda fora da raiz para o .env não entrar
+    subprocess.run(
+        [sys.executable, "-c", f"import sys; sys.path.insert(0, {ROOT!r}); {code}"],
+        env=env, cwd="/", check=True,
+    )
+
+@pytest.mark.asyncio
+async def test_lifespan_creates_and_disposes_engines(test_database_url):
+    settings = Settings(
+        database_url=test_database_url,
+        jwt_secret="segredo-de-teste",
+        mcp_enabled=False,
+        import_worker_enabled=False,
+    )
+    app = create_app(settings)
+    await db_session.dispose_engines()
+    async with app.router.lifespan_context(app):
+        assert db_session.engine is not None
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            assert (await client.get("/health")).json() == {"status": "ok"}
+            assert (await client.get("/pessoas/")).status_code in (401, 403)
+    assert db_session.engine is None
+    assert not any(route.path.startswith("/mcp") for route in app.routes)
+
+@pytest.mark.asyncio
+async def test_prewarm_fills_the_pool(test_database_url):
+    await db_session.dispose_engines()
+    db_session.init_engines(Settings(database_url=test_database_url))
+    try:
+        assert await db_session.prewarm_pool(3) == 3
+        assert db_session.engine.sync_engine.pool.checkedin() >= 3
+    finally:
+        await db_session.dispose_engines()
+
+def test_engine_options_come_from_settings():
+    settings = Settings(
+        database_url="postgresql://h/db",
+        database_pool_size=7,
+        database_max_overflow=3,
+        database_read_pool_size=2,
+        database_statement_cache_size=0,
+    )
+    primario = db_session._engine_options(settings, settings.database_url)
+    assert (primario["pool_size"], primario["max_overflow"]) == (7, 3)
+    assert primario["connect_args"]["statement_cache_size"] == 0
+    # réplica: o que não tem valor próprio vem do primário
+    replica = db_session._engine_options(settings, "postgresql://r/db", "database_read")
+    assert (replica["pool_size"], replica["max_overflow"]) == (2, 3)
+    assert db_session.pool_capacity(settings) == 10
+    assert db_session._sqlite_pragmas(Settings(database_sqlite_busy_timeout=100))["busy_timeout"] == 100
+
+def test_cgroup_cpu_limit():
+    assert cgroup_cpu_limit("max 100000\n") is None
+    assert cgroup_cpu_limit("200000 100000\n") == 2
+    assert cgroup_cpu_limit("150000 100000") == 2
+    assert cgroup_cpu_limit("10000 100000") == 1
@@ -0,0 +1,41 @@
+# tests/test_batch_loader.py
+
+import asyncio
+
+import pytest
+
+from src.application.batch_loader import BatchLoader
+
+@pytest.mark.asyncio
+async def test_concurrent_loads_become_one_batch():
+    calls = []
+
+    async def load_many(keys):
+        calls.append(list(keys))
+        return [f"p{key}" for key in keys]
+
+    loader = BatchLoader(load_many)
+    results = await asyncio.gather(loader.load(1), loader.load(2), loader.load(1))
+    assert results == ["p1", "p2", "p1"]
+    assert calls == [[1, 2]]
+
+    # já carregadas não voltam ao banco; clear() força nova carga
+    assert await loader.load_many([2, 3]) == ["p2", "p3"]
+    loader.clear(2)
+    assert await loader.load(2) == "p2"
+    assert calls == [[1, 2], [3], [2]]
+
+@pytest.mark.asyncio
+async def test_failed_batch_is_not_memoized():
+    falhar = True
+
+    async def load_many(keys):
+        if falhar:
+            raise RuntimeError("banco fora")
+        return list(keys)
+
+    loader = BatchLoader(load_many)
+    with pytest.raises(RuntimeError):
+        await loader.load_many([1, 2])
+    falhar = False
+    assert await loader.load(1) == 1
@@ -0,0 +1,79 @@
+# tests/test_cache.py
+
+import asyncio
+
+import pytest
+
+from src.infrastructure.cache.backends import MISSING, MemoryLRUCache
+from src.infrastructure.cache.read_through import ReadThroughCache
+
+@pytest.mark.asyncio
+async def test_lru_evicts_least_recently_used():
+    cache = MemoryLRUCache(maxsize=2, ttl=60)
+    await cache.set(1, "a")
+    await cache.set(2, "b")
+    assert await cache.get(1) == "a"  # 1 passa a ser o mais recente
+    await cache.set(3, "c")
+
+    assert await cache.get(2) is MISSING
+    assert await cache.get(1) == "a"
+    assert cache.stats()["evictions"] == 1
+
+@pytest.mark.asyncio
+async def test_ttl_expires_entries():
+    cache = MemoryLRUCache(maxsize=10, ttl=60)
+    await cache.set(1, "a", ttl=0.01)
+    await asyncio.sleep(0.02)
+    assert await cache.get(1) is MISSING
+    assert cache.stats()["expirations"] == 1
+
+@pytest.mark.asyncio
+async def test_concurrent_misses_are_coalesced():
+    cache = ReadThroughCache(MemoryLRUCache())
+    chamadas = []
+
+    async def loader(key):
+        chamadas.append(key)
+        await asyncio.sleep(0.01)
+        return f"pessoa {key}"
+
+    valores = await asyncio.gather(*(cache.get_or_load(7, loader) for _ in range(10)))
+    assert valores == ["pessoa 7"] * 10
+    assert chamadas == [7]
+    assert cache.stats()["coalesced"] == 9
+
+    # segunda leitura vem do cache
+    assert await cache.get_or_load(7, loader) == "pessoa 7"
+    assert chamadas == [7]
+
+@pytest.mark.asyncio
+async def test_invalidate_during_load_is_not_cached():
+    cache = ReadThroughCache(MemoryLRUCache())
+
+    async def loader(key):
+        await cache.invalidate(key)  # escrita concorrente durante a leitura
+        return "antigo"
+
+    assert await cache.get_or_load(1, loader) == "antigo"
+    assert await cache.backend.get(1) is MISSING
+
+@pytest.mark.asyncio
+async def test_replica_loads_do_not_fill_the_cache():
+    cache = ReadThroughCache(MemoryLRUCache())
+    liberar = asyncio.Event()
+
+    async def replica(key):
+        await liberar.wait()
+        return "antigo"
+
+    async def primario(key):
+        return "novo"
+
+    # leitura na réplica em andamento: a do primário não se junta a ela
+    atrasada = asyncio.ensure_future(cache.get_or_load(1, replica, store=False))
+    await asyncio.sleep(0)
+    assert await cache.get_or_load(1, primario) == "novo"
+    await cache.invalidate(1)
+    liberar.set()
+    assert await atrasada == "antigo"
+    assert await cache.backend.get(1) is MISSING
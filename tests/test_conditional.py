@@ -0,0 +1,39 @@
+# tests/test_conditional.py
+
+from datetime import datetime
+
+from src.presentation.conditional import (
+    collection_headers,
+    is_not_modified,
+    parse_if_match,
+    pessoa_etag,
+    pessoa_headers,
+)
+
+UPDATED_AT = datetime(2025, 6, 17, 10, 30, 0, 123456)
+
+def test_etag_round_trips_through_if_match():
+    etag = pessoa_etag(7, UPDATED_AT)
+    assert parse_if_match(etag, 7) == [UPDATED_AT]
+    # tag de outra pessoa, fraca ou inválida não casa
+    assert parse_if_match(f'W/{etag}, "8-1", "7-x"', 7) == []
+    assert parse_if_match("*", 7) is None
+    assert parse_if_match(None, 7) is None
+
+def test_if_none_match_and_if_modified_since():
+    headers = pessoa_headers(7, UPDATED_AT)
+    assert is_not_modified(headers, headers["ETag"])
+    assert is_not_modified(headers, f'"outra", W/{headers["ETag"]}')
+    assert not is_not_modified(headers, '"outra"')
+    # If-Modified-Since tem resolução de segundos
+    assert is_not_modified(headers, None, "Tue, 17 Jun 2025 10:30:00 GMT")
+    assert not is_not_modified(headers, None, "Tue, 17 Jun 2025 10:29:59 GMT")
+    # If-None-Match prevalece sobre If-Modified-Since
+    assert not is_not_modified(headers, '"outra"', "Tue, 17 Jun 2025 10:30:00 GMT")
+
+def test_collection_etag_tracks_membership_and_versions():
+    page = [(1, UPDATED_AT), (2, UPDATED_AT)]
+    etag = collection_headers(page)["ETag"]
+    assert collection_headers(list(page))["ETag"] == etag
+    assert collection_headers(page[:1])["ETag"] != etag
+    assert collection_headers([(1, UPDATED_AT), (2, datetime(2025, 6, 18))])["ETag"] != etag
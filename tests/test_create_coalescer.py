@@ -0,0 +1,93 @@
+# tests/test_create_coalescer.py
+
+import asyncio
+import random
+import time
+
+import pytest
+from sqlalchemy.exc import DataError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import sessionmaker
+
+from src.application import pessoas_service
+from src.application.create_coalescer import CreateCoalescer
+from src.application.pessoas_service import PessoaService
+from src.core.pessoas.entity import Pessoa
+from src.infrastructure.db import session as db_session
+from src.infrastructure.db.repositories.pessoas import PessoaRepository
+
+def _cpf() -> str:
+    return f"{random.randrange(10**10, 10**11)}"
+
+@pytest.mark.asyncio
+async def test_concurrent_creates_share_one_commit(async_engine, async_session):
+    factory = sessionmaker(bind=async_engine, class_=AsyncSession, expire_on_commit=False)
+    coalescer = CreateCoalescer(window=0.05, max_rows=100, session_factory=factory)
+    repo = PessoaRepository(async_session)
+    existente = await repo.create(Pessoa(nome="Já Existe", cpf=_cpf()))
+    cpf = _cpf()
+    pessoas = [
+        Pessoa(nome="Agrupada A", cpf=cpf),
+        Pessoa(nome="Agrupada B"),
+        Pessoa(nome="Agrupada C", cpf=cpf),  # repetido: grupo seguinte
+        Pessoa(nome="Agrupada D", cpf=existente.cpf),
+        Pessoa(nome="Agrupada E", celular="11999990000"),
+    ]
+
+    rows = await asyncio.gather(*(coalescer.create(p) for p in pessoas))
+
+    assert coalescer.batches == 2
+    a, b, c, d, e = rows
+    assert (a.nome, a.cpf) == ("Agrupada A", cpf)
+    assert b.nome == "Agrupada B" and b.cpf is None
+    assert c is None and d is None
+    assert (e.nome, e.celular) == ("Agrupada E", "11999990000")
+    assert len({a.id, b.id, e.id}) == 3
+    assert await repo.get_by_id(b.id) == b
+
+    for pessoa_id in (existente.id, a.id, b.id, e.id):
+        await repo.delete(pessoa_id)
+
+@pytest.mark.asyncio
+async def test_failed_batch_falls_back_to_single_rows(async_engine, async_session, monkeypatch):
+    factory = sessionmaker(bind=async_engine, class_=AsyncSession, expire_on_commit=False)
+    coalescer = CreateCoalescer(window=0.05, max_rows=3, session_factory=factory)
+    create_many = PessoaRepository.create_many
+
+    async def failing_create_many(self, pessoas):
+        # uma linha inválida derruba o INSERT inteiro do grupo
+        if any(p.nome == "Falha" for p in pessoas):
+            raise RuntimeError("linha inválida")
+        return await create_many(self, pessoas)
+
+    monkeypatch.setattr(PessoaRepository, "create_many", failing_create_many)
+    pessoas = [Pessoa(nome="Fallback A"), Pessoa(nome="Falha"), Pessoa(nome="Fallback C")]
+
+    a, erro, c = await asyncio.gather(*(coalescer.create(p) for p in pessoas), return_exceptions=True)
+
+    assert isinstance(erro, RuntimeError)
+    assert a.nome == "Fallback A" and c.nome == "Fallback C"
+    repo = PessoaRepository(async_session)
+    for pessoa_id in (a.id, c.id):
+        await repo.delete(pessoa_id)
+
+@pytest.mark.asyncio
+async def test_coalesced_create_marks_writer_and_maps_data_errors(async_engine, monkeypatch):
+    factory = sessionmaker(bind=async_engine, class_=AsyncSession, expire_on_commit=False)
+    monkeypatch.setattr(pessoas_service, "CREATE_COALESCE_ENABLED", True)
+    monkeypatch.setattr(pessoas_service, "create_coalescer", CreateCoalescer(window=0.01, session_factory=factory))
+
+    async with factory(info={"user_id": "coalescida"}) as session:
+        criada = await PessoaService(session).create_pessoa(nome="Lida em seguida")
+    # a criação foi gravada em outra sessão, mas o usuário lê do primário
+    assert db_session._recent_writers["coalescida"] > time.monotonic()
+
+    async def data_error(self, pessoas):
+        raise DataError("INSERT", {}, Exception("valor longo demais"))
+
+    monkeypatch.setattr(PessoaRepository, "create_many", data_error)
+    async with factory(info={"user_id": "coalescida"}) as session:
+        with pytest.raises(ValueError):
+            await PessoaService(session).create_pessoa(nome="Recusada")
+        monkeypatch.undo()
+        await PessoaRepository(session).delete(criada.id)
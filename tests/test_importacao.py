@@ -0,0 +1,137 @@
+# tests/test_importacao.py
+
+import io
+import random
+from datetime import date
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import sessionmaker
+
+from src.application import importacao_service
+from src.application.importacao_service import (
+    ImportacaoService,
+    ImportacaoWorker,
+    iter_chunks,
+    parse_row,
+    save_upload,
+)
+from src.core.pessoas.model import PessoaModel
+from src.infrastructure.db.repositories.importacoes import ImportacaoRepository
+
+def _csv(*linhas: str) -> bytes:
+    return ("\n".join(linhas) + "\n").encode()
+
+def test_parse_row_accepts_brazilian_dates():
+    assert parse_row({"nome": " Ana ", "data_nascimento": "17/06/1990", "cpf": ""}) == {
+        "nome": "Ana",
+        "celular": None,
+        "cpf": None,
+        "data_nascimento": date(1990, 6, 17),
+        "flag": None,
+    }
+    with pytest.raises(ValueError):
+        parse_row({"nome": "Ana", "data_nascimento": "31/02/1990"})
+
+def test_iter_chunks_skips_imported_rows(tmp_path):
+    path = tmp_path / "pessoas.csv"
+    total = save_upload(io.BytesIO(_csv("Nome;CPF", "A;1", "B;2", "C;3")), str(path))
+    assert total == 3
+    chunks = list(iter_chunks(str(path), skip=1, chunk_size=1))
+    assert chunks == [[(3, {"nome": "B", "cpf": "2"})], [(4, {"nome": "C", "cpf": "3"})]]
+
+@pytest.mark.asyncio
+async def test_import_job_end_to_end(async_engine, async_session, tmp_path, monkeypatch):
+    monkeypatch.setattr(importacao_service, "IMPORT_DIR", str(tmp_path))
+    monkeypatch.setattr(importacao_service, "IMPORT_CHUNK_SIZE", 2)
+    worker = ImportacaoWorker(sessionmaker(bind=async_engine, class_=AsyncSession, expire_on_commit=False))
+    sufixo = random.randrange(10**6)
+    cpf = f"{random.randrange(10**10, 10**11)}"
+    conteudo = _csv(
+        "nome,cpf,data_nascimento",
+        f"Importada A {sufixo},{cpf},1990-06-17",
+        f"Importada B {sufixo},,17/06/1991",
+        ",,",  # sem nome
+        f"Importada C {sufixo},{cpf},",  # CPF repetido (bloco seguinte)
+        f"Importada D {sufixo},,data",
+    )
+
+    service = ImportacaoService(async_session, worker=worker)
+    job = await service.create_import("pessoas.csv", io.BytesIO(conteudo))
+    assert job.status == "pending"
+    await worker.join()
+
+    status = await service.get_import(job.id)
+    assert status["status"] == "done"
+    assert (status["processadas"], status["criadas"], status["rejeitadas"]) == (5, 2, 3)
+    assert [r["linha"] for r in status["rejeicoes"]] == [4, 5, 6]
+    nomes = (await async_session.execute(
+        select(PessoaModel.nome).where(PessoaModel.nome.like(f"Importada % {sufixo}"))
+    )).scalars().all()
+    assert sorted(nomes) == [f"Importada A {sufixo}", f"Importada B {sufixo}"]
+
+    with pytest.raises(ValueError):
+        await service.create_import("sem-nome.csv", io.BytesIO(_csv("cpf", "1")))
+
+@pytest.mark.asyncio
+async def test_import_resumes_after_last_committed_chunk(async_engine, async_session, tmp_path):
+    worker = ImportacaoWorker(sessionmaker(bind=async_engine, class_=AsyncSession, expire_on_commit=False))
+    sufixo = random.randrange(10**6)
+    path = tmp_path / "retomada.csv"
+    save_upload(io.BytesIO(_csv("nome", *[f"Retomada {i} {sufixo}" for i in range(4)])), str(path))
+    # job interrompido com 2 linhas já gravadas e posse expirada
+    job = await ImportacaoRepository(async_session).create(
+        id=f"retomada{sufixo}", arquivo="retomada.csv", caminho=str(path),
+        status="running", processadas=2,
+    )
+    assert job.id in await ImportacaoRepository(async_session).claimable()
+
+    await worker.run(job.id)
+    nomes = (await async_session.execute(
+        select(PessoaModel.nome).where(PessoaModel.nome.like(f"Retomada % {sufixo}"))
+    )).scalars().all()
+    assert sorted(nomes) == [f"Retomada 2 {sufixo}", f"Retomada 3 {sufixo}"]
+
+@pytest.mark.asyncio
+async def test_import_rejects_long_values_and_converts_windows_1252(async_engine, async_session, tmp_path, monkeypatch):
+    monkeypatch.setattr(importacao_service, "IMPORT_DIR", str(tmp_path))
+    worker = ImportacaoWorker(sessionmaker(bind=async_engine, class_=AsyncSession, expire_on_commit=False))
+    sufixo = random.randrange(10**6)
+    # exportação do Excel em português: Windows-1252, não UTF-8
+    conteudo = "\n".join((
+        "nome;flag",
+        f"Conceição {sufixo};S",
+        f"Bia {sufixo};SIM",  # flag maior que a coluna
+        f"Caio {sufixo};N",
+    )).encode("cp1252")
+
+    service = ImportacaoService(async_session, worker=worker)
+    job = await service.create_import("excel.csv", io.BytesIO(conteudo))
+    await worker.join()
+
+    status = await service.get_import(job.id)
+    assert status["status"] == "done"
+    assert (status["criadas"], status["rejeitadas"]) == (2, 1)
+    assert [r["linha"] for r in status["rejeicoes"]] == [3]
+    nomes = (await async_session.execute(
+        select(PessoaModel.nome).where(PessoaModel.nome.like(f"% {sufixo}"))
+    )).scalars().all()
+    assert sorted(nomes) == [f"Caio {sufixo}", f"Conceição {sufixo}"]
+
+    with pytest.raises(ValueError):
+        await service.create_import("binario.csv", io.BytesIO(b"nome\n\x81\x8d\n"))
+    # nada do upload recusado fica no diretório (o CSV aceito já foi removido)
+    assert list(tmp_path.iterdir()) == []
+
+def test_interrupted_upload_leaves_no_partial_file(tmp_path):
+    class Interrompido(io.BytesIO):
+        def read(self, size=-1):
+            if self.tell():
+                raise OSError("conexão caiu")
+            return super().read(4)
+
+    path = tmp_path / "parcial.csv"
+    with pytest.raises(OSError):
+        save_upload(Interrompido(b"nome\nAna\n"), str(path))
+    assert not path.exists()
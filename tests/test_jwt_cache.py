@@ -0,0 +1,54 @@
+# tests/test_jwt_cache.py
+
+import os
+import time
+
+os.environ.setdefault("JWT_SECRET", "segredo-de-teste")
+
+import jwt
+import pytest
+from fastapi import HTTPException
+
+from src.infrastructure.auth import jwt_utils
+
+def _token(**claims):
+    payload = {"id": 1, "email": "a@b.com", "isSuperUser": False, **claims}
+    return jwt.encode(payload, jwt_utils.jwt_secret(), algorithm=jwt_utils.ALGORITHM)
+
+def test_valid_token_is_cached():
+    token = _token(exp=int(time.time()) + 60)
+    hits = jwt_utils.token_cache.hits
+
+    primeiro = jwt_utils.decode_access_token(token)
+    segundo = jwt_utils.decode_access_token(token)
+
+    assert primeiro == segundo == {"id": 1, "email": "a@b.com", "is_superuser": False}
+    assert jwt_utils.token_cache.hits == hits + 1
+
+def test_invalid_token_is_negatively_cached():
+    token = _token()[:-2] + "xx"
+    for _ in range(2):
+        with pytest.raises(HTTPException) as exc:
+            jwt_utils.decode_access_token(token)
+        assert exc.value.status_code == 401
+        assert exc.value.detail == "Token inválido"
+
+def test_expired_token_is_never_served_from_cache():
+    token = _token(exp=int(time.time()) + 1)
+    jwt_utils.decode_access_token(token)
+    time.sleep(1.1)
+    with pytest.raises(HTTPException) as exc:
+        jwt_utils.decode_access_token(token)
+    assert exc.value.status_code == 401
+
+def test_changing_the_secret_drops_cached_tokens():
+    token = _token(exp=int(time.time()) + 60)
+    jwt_utils.decode_access_token(token)
+    anterior = jwt_utils.jwt_secret()
+    try:
+        jwt_utils.configure_jwt("outro-segredo")
+        with pytest.raises(HTTPException) as exc:
+            jwt_utils.decode_access_token(token)
+        assert exc.value.status_code == 401
+    finally:
+        jwt_utils.configure_jwt(anterior)
@@ -0,0 +1,82 @@
+# tests/test_mcp.py
+
+import json
+import time
+
+import httpx
+import jwt
+import pytest
+import pytest_asyncio
+from fastapi_mcp.types import HTTPRequestInfo
+
+from src.infrastructure.auth import jwt_utils
+from src.infrastructure.observability.metrics import mcp_tool_calls
+from src.infrastructure.settings import Settings
+from src.main import create_app
+
+SECRET = "segredo-de-teste"
+
+def _auth() -> str:
+    payload = {"id": 1, "email": "mcp@b.com", "isSuperUser": False, "exp": int(time.time()) + 60}
+    return "Bearer " + jwt.encode(payload, SECRET, algorithm=jwt_utils.ALGORITHM)
+
+@pytest_asyncio.fixture
+async def app(test_database_url):
+    app = create_app(Settings(
+        database_url=test_database_url,
+        database_create_schema=True,
+        jwt_secret=SECRET,
+        database_pool_prewarm=0,
+        import_worker_enabled=False,
+    ))
+    async with app.router.lifespan_context(app):
+        yield app
+
+@pytest.mark.asyncio
+async def test_batch_runs_operations_in_order(app):
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        async def batch(*operations):
+            response = await client.post(
+                "/pessoas/batch", json={"operations": list(operations)}, headers={"Authorization": _auth()}
+            )
+            assert response.status_code == 200
+            return response.json()
+
+        criada, = await batch({"op": "create", "data": {"nome": "Batch MCP", "flag": "C"}})
+        assert criada["status"] == 201
+        pessoa_id, etag = criada["pessoa"]["id"], criada["etag"]
+
+        results = await batch(
+            {"op": "get", "id": pessoa_id},
+            {"op": "update", "id": pessoa_id, "data": {"nome": "Batch MCP 2"}, "if_match": etag},
+            {"op": "update", "id": pessoa_id, "data": {"nome": "Batch MCP 3"}, "if_match": etag},
+            {"op": "create", "data": {}},
+            {"op": "delete"},
+            {"op": "delete", "id": pessoa_id},
+            {"op": "get", "id": pessoa_id},
+        )
+        assert [r["status"] for r in results] == [200, 200, 412, 400, 400, 204, 404]
+        assert results[1]["pessoa"]["nome"] == "Batch MCP 2"
+        assert results[1]["etag"] != etag
+        assert [r["index"] for r in results] == list(range(7))
+
+@pytest.mark.asyncio
+async def test_mcp_tool_calls_are_dispatched_in_process_and_measured(app):
+    mcp = app.state.mcp
+    assert "pessoas_batch" in mcp.operation_map
+    antes = mcp_tool_calls._values.get(("pessoas_batch", "ok"), 0)
+
+    content = await mcp._execute_api_tool(
+        client=mcp._http_client,
+        tool_name="pessoas_batch",
+        arguments={"operations": [{"op": "get", "id": 0}]},
+        operation_map=mcp.operation_map,
+        http_request_info=HTTPRequestInfo(
+            method="POST", path="/mcp/messages/", headers={"authorization": _auth()},
+            cookies={}, query_params={}, body=None,
+        ),
+    )
+    assert json.loads(content[0].text)[0]["status"] == 404
+    assert isinstance(mcp._http_client._transport, httpx.ASGITransport)
+    assert mcp_tool_calls._values[("pessoas_batch", "ok")] == antes + 1
@@ -0,0 +1,20 @@
+# tests/test_metrics.py
+
+from src.infrastructure.observability.metrics import Counter, Histogram, Registry
+
+def test_render_text_exposition():
+    registry = Registry()
+    requests = registry.register(Counter("reqs_total", "Requisições.", ("route",)))
+    latency = registry.register(Histogram("lat_seconds", "Latência.", ("route",), buckets=(0.1, 1.0)))
+
+    requests.inc(("/pessoas/{pessoa_id}",))
+    requests.inc(("/pessoas/{pessoa_id}",))
+    latency.observe(0.05, ("/pessoas/",))
+    latency.observe(0.5, ("/pessoas/",))
+
+    lines = registry.render().splitlines()
+    assert 'reqs_total{route="/pessoas/{pessoa_id}"} 2.0' in lines
+    assert 'lat_seconds_bucket{route="/pessoas/",le="0.1"} 1.0' in lines
+    assert 'lat_seconds_bucket{route="/pessoas/",le="1.0"} 2.0' in lines
+    assert 'lat_seconds_bucket{route="/pessoas/",le="+Inf"} 2.0' in lines
+    assert 'lat_seconds_count{route="/pessoas/"} 2.0' in lines
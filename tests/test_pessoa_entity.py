@@ -0,0 +1,25 @@
+# tests/test_pessoa_entity.py
+
+import pytest
+
+from src.core.pessoas.entity import Pessoa
+
+def test_documents_are_stored_as_digits():
+    pessoa = Pessoa(nome="Maria", cpf="123.456.789-00", celular="(11) 98765-4321")
+    assert pessoa.cpf == "12345678900"
+    assert pessoa.celular == "11987654321"
+
+def test_blank_documents_become_none():
+    pessoa = Pessoa(nome="Maria", cpf="  ", celular="")
+    assert pessoa.cpf is None
+    assert pessoa.celular is None
+
+@pytest.mark.parametrize("cpf", ["123", "123.456.789-001", "abc"])
+def test_invalid_cpf_is_rejected(cpf):
+    with pytest.raises(ValueError):
+        Pessoa(nome="Maria", cpf=cpf)
+
+@pytest.mark.parametrize("campos", [{"nome": "x" * 101}, {"nome": "Maria", "flag": "SIM"}])
+def test_values_longer_than_columns_are_rejected(campos):
+    with pytest.raises(ValueError):
+        Pessoa(**campos)
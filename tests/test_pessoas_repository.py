@@ -1,11 +1,19 @@
 # tests/test_pessoas_repository.py
 
+import asyncio
+import random
 import pytest
 from datetime import date
 
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import sessionmaker
+
+from src.application.pagination import encode_change_token
+from src.application.pessoas_service import PessoaService
 from src.infrastructure.db.repositories.pessoas import PessoaRepository
-from src.core.pessoas.entity import Pessoa
+from src.core.pessoas.entity import Pessoa, PessoaRow
 from src.core.pessoas.model import PessoaModel
+from src.core.pessoas.normalization import normalize_nome
 
 @pytest.mark.asyncio
 async def test_create_and_get(async_session):
@@ -48,3 +56,303 @@ async def test_list_update_delete(async_session):
     assert ok
     none = await repo.get_by_id(p2.id)
     assert none is None
+
+@pytest.mark.asyncio
+async def test_list_keyset(async_session):
+    repo = PessoaRepository(async_session)
+
+    criados = [await repo.create(Pessoa(nome=f"Keyset {i}", flag="C")) for i in range(5)]
+
+    # percorre a partir do primeiro criado, duas linhas por página
+    vistos = []
+    after = (criados[0].id - 1,)
+    while True:
+        pagina = await repo.list_keyset(limit=2, after=after)
+        if not pagina:
+            break
+        vistos.extend(p.id for p in pagina)
+        after = (pagina[-1].id,)
+
+    ids = [p.id for p in criados]
+    assert vistos[: len(ids)] == ids
+    assert len(vistos) == len(set(vistos))
+
+    # ordenação por (created_at, id) também não repete linhas
+    pagina = await repo.list_keyset(limit=3, order_by="created_at")
+    seguinte = await repo.list_keyset(
+        limit=3, after=(pagina[-1].created_at, pagina[-1].id), order_by="created_at"
+    )
+    assert not {p.id for p in pagina} & {p.id for p in seguinte}
+
+@pytest.mark.asyncio
+async def test_bulk_upsert(async_session):
+    repo = PessoaRepository(async_session)
+    cpf = f"{random.randrange(10**10, 10**11)}"
+
+    # insere: com CPF e sem CPF
+    gravadas = await repo.bulk_upsert(
+        [Pessoa(nome="Lote A", cpf=cpf, flag="C"), Pessoa(nome="Lote B")],
+        batch_size=1,
+    )
+    assert all(criada for _, criada in gravadas)
+    id_a, id_b = (pessoa_id for pessoa_id, _ in gravadas)
+
+    # sem chave de upsert o CPF repetido é ignorado
+    ignoradas = await repo.bulk_upsert([Pessoa(nome="Lote A2", cpf=cpf)])
+    assert ignoradas == [None]
+
+    # com upsert por CPF a pessoa existente é atualizada
+    atualizadas = await repo.bulk_upsert([Pessoa(nome="Lote A3", cpf=cpf)], conflict_key="cpf")
+    assert atualizadas == [(id_a, False)]
+    buscado = await repo.get_by_id(id_a)
+    assert buscado.nome == "Lote A3"
+    assert buscado.flag == "C"
+
+@pytest.mark.asyncio
+async def test_bulk_upsert_splits_by_parameter_limit(async_session):
+    # 4000 linhas em um INSERT passariam do limite de parâmetros do driver
+    repo = PessoaRepository(async_session)
+    base = random.randrange(10**10, 10**11 - 4000)
+    pessoas = [Pessoa(nome=f"Limite {i}", cpf=str(base + i)) for i in range(4000)]
+    gravadas = await repo.bulk_upsert(pessoas, conflict_key="cpf", batch_size=10000, commit=False)
+    assert len(gravadas) == 4000 and all(criada for _, criada in gravadas)
+    await async_session.rollback()
+
+@pytest.mark.asyncio
+async def test_bulk_upsert_rejects_values_longer_than_columns(async_session):
+    service = PessoaService(async_session)
+    results = await service.bulk_upsert(
+        [{"nome": "Coluna " + "x" * 100}, {"nome": "Flag Longa", "flag": "SIM"}, {"nome": "Flag Curta", "flag": "S"}]
+    )
+    assert [r["status"] for r in results] == ["rejected", "rejected", "created"]
+    await service.delete_pessoa(results[2]["id"])
+
+@pytest.mark.asyncio
+async def test_stream(async_session):
+    repo = PessoaRepository(async_session)
+    criado = await repo.create(Pessoa(nome="Exportada", flag="C"))
+
+    blocos = [bloco async for bloco in repo.stream(chunk_size=2)]
+    assert all(len(bloco) <= 2 for bloco in blocos)
+    linhas = {row.id: row for bloco in blocos for row in bloco}
+    assert linhas[criado.id].nome == "Exportada"
+
+@pytest.mark.asyncio
+async def test_search_by_normalized_prefix(async_session):
+    repo = PessoaRepository(async_session)
+    sufixo = random.randrange(10**6)
+    criado = await repo.create(Pessoa(nome=f"Joaquím Ávila {sufixo}"))
+    assert criado.nome_busca == f"joaquim avila {sufixo}"
+
+    encontrados = await repo.search(normalize_nome(f"JOAQUIM ávila {sufixo}"))
+    assert [p.id for p in encontrados] == [criado.id]
+
+    # curingas do LIKE no termo são tratados como texto
+    assert await repo.search("%") == []
+
+@pytest.mark.asyncio
+async def test_lookup_by_normalized_documents(async_session):
+    repo = PessoaRepository(async_session)
+    digits = f"{random.randrange(10**10, 10**11)}"
+    cpf = f"{digits[:3]}.{digits[3:6]}.{digits[6:9]}-{digits[9:]}"
+    celular = f"(11) 9{random.randrange(10**7, 10**8)}"
+    criado = await repo.create(Pessoa(nome="Documentada", cpf=cpf, celular=celular))
+
+    assert criado.cpf == digits
+    assert (await repo.get_by_cpf(digits)).id == criado.id
+    assert [p.id for p in await repo.list_by_celular(criado.celular)] == [criado.id]
+
+    service = PessoaService(async_session)
+    assert (await service.get_pessoa_by_cpf(cpf)).id == criado.id
+    for vazio in ("", "  ", None):
+        with pytest.raises(ValueError, match="Informe o CPF"):
+            await service.get_pessoa_by_cpf(vazio)
+
+@pytest.mark.asyncio
+async def test_reads_return_rows_outside_identity_map(async_session):
+    repo = PessoaRepository(async_session)
+    cpf = f"{random.randrange(10**10, 10**11)}"
+    criado = await repo.create(Pessoa(nome="Linha Leve", cpf=cpf, flag="C"))
+    async_session.expunge_all()
+
+    buscado = await repo.get_by_id(criado.id)
+    assert isinstance(buscado, PessoaRow)
+    assert buscado.nome == "Linha Leve"
+    assert isinstance(await repo.get_by_cpf(cpf), PessoaRow)
+    assert all(isinstance(p, PessoaRow) for p in await repo.list(limit=5))
+    # leituras não registram nada na sessão
+    assert len(async_session.identity_map) == 0
+
+    atualizado = await repo.update_fields(criado.id, {"flag": "U"})
+    assert isinstance(atualizado, PessoaRow)
+    assert atualizado.flag == "U"
+    await repo.delete(criado.id)
+
+@pytest.mark.asyncio
+async def test_versioned_writes(async_session):
+    repo = PessoaRepository(async_session)
+    criado = await repo.create(Pessoa(nome="Versionada", flag="C"))
+    versao = await repo.get_version(criado.id)
+    assert versao == criado.updated_at
+
+    # If-Match com a versão atual grava e avança o updated_at
+    atualizado = await repo.update_fields(criado.id, {"flag": "U"}, expected=[versao])
+    assert atualizado.flag == "U"
+    assert atualizado.updated_at > versao
+    assert [row for row in await repo.list_versions(limit=1, after=(criado.id - 1,))] == [
+        (criado.id, atualizado.updated_at)
+    ]
+
+    # versão antiga: nada é gravado nem removido
+    assert await repo.update_fields(criado.id, {"flag": "X"}, expected=[versao]) is None
+    assert not await repo.delete(criado.id, expected=[versao])
+    assert await repo.delete(criado.id, expected=[atualizado.updated_at])
+
+@pytest.mark.asyncio
+async def test_change_feed(async_session):
+    repo = PessoaRepository(async_session)
+    marco = await repo.create(Pessoa(nome="Marco do feed"))
+    a = await repo.create(Pessoa(nome="Feed A"))
+    b = await repo.create(Pessoa(nome="Feed B"))
+    await repo.update_fields(a.id, {"flag": "U"})
+    await repo.delete(b.id)
+
+    # só o que mudou depois do marco: a (alterada) e depois b (removida)
+    changes = await repo.list_changes(after=(marco.versao, marco.id))
+    assert [(pessoa_id, row is None) for _, pessoa_id, row in changes] == [
+        (a.id, False),
+        (b.id, True),
+    ]
+    assert changes[0][2].flag == "U"
+
+    # paginação pelo token devolvido pelo serviço
+    service = PessoaService(async_session)
+    token = encode_change_token(marco.versao, marco.id)
+    primeira = await service.list_changes(since=token, limit=1)
+    assert primeira["has_more"]
+    assert [c["id"] for c in primeira["changes"]] == [a.id]
+    segunda = await service.list_changes(since=primeira["next_token"], limit=1)
+    assert [(c["op"], c["id"]) for c in segunda["changes"]] == [("delete", b.id)]
+    assert not segunda["has_more"]
+
+@pytest.mark.asyncio
+async def test_get_many_keeps_request_order(async_session):
+    repo = PessoaRepository(async_session)
+    a = await repo.create(Pessoa(nome="Lote Get A"))
+    b = await repo.create(Pessoa(nome="Lote Get B"))
+
+    encontrados = await repo.get_many([b.id, -1, a.id, b.id])
+    assert [p.id if p else None for p in encontrados] == [b.id, None, a.id, b.id]
+    assert await repo.get_many([]) == []
+
+@pytest.mark.asyncio
+async def test_stats_follow_writes(async_session):
+    service = PessoaService(async_session)
+    hoje = date.today()
+
+    async def stats():
+        return await service.get_stats(dias=2, hoje=hoje)
+
+    antes = await stats()
+    criada = await service.create_pessoa(nome="Stats A", flag="X", data_nascimento=date(1990, 3, 5))
+    cpf = "".join(random.choice("0123456789") for _ in range(11))
+    await service.bulk_upsert([{"nome": "Stats B", "cpf": cpf}])
+    depois = await stats()
+    assert depois["total"] == antes["total"] + 2
+    assert depois["por_flag"]["X"] == antes["por_flag"].get("X", 0) + 1
+    assert depois["por_mes_nascimento"]["03"] == antes["por_mes_nascimento"]["03"] + 1
+    assert depois["por_mes_nascimento"]["sem_data"] == antes["por_mes_nascimento"]["sem_data"] + 1
+    assert depois["criadas_por_dia"][-1]["total"] >= antes["criadas_por_dia"][-1]["total"]
+
+    # upsert pelo CPF move a pessoa de contador sem mudar o total
+    await service.bulk_upsert(
+        [{"nome": "Stats B", "cpf": cpf, "flag": "X", "data_nascimento": date(1990, 3, 1)}],
+        conflict_key="cpf",
+    )
+    await service.update_pessoa(criada.id, flag="Y", data_nascimento=date(hoje.year - 10, 1, 1))
+    movidas = await stats()
+    assert movidas["total"] == depois["total"]
+    assert movidas["por_flag"]["X"] == depois["por_flag"]["X"]
+    assert movidas["por_flag"]["Y"] == depois["por_flag"].get("Y", 0) + 1
+    assert movidas["por_faixa_etaria"]["0-17"] == depois["por_faixa_etaria"]["0-17"] + 1
+    assert movidas["por_mes_nascimento"]["sem_data"] == antes["por_mes_nascimento"]["sem_data"]
+
+    await service.delete_pessoa(criada.id)
+    final = await stats()
+    assert final["total"] == antes["total"] + 1
+    assert final["por_flag"].get("Y", 0) == movidas["por_flag"]["Y"] - 1
+    assert await service.count_pessoas("exact") == final["total"]
+    assert await service.count_pessoas("estimated") >= 0
+
+@pytest.mark.asyncio
+async def test_bulk_and_put_run_concurrently(async_session, async_engine):
+    if async_engine.dialect.name != "postgresql":
+        pytest.skip("SQLite tem um escritor por vez")
+    Factory = sessionmaker(bind=async_engine, class_=AsyncSession, expire_on_commit=False)
+    alvo = await PessoaRepository(async_session).create(Pessoa(nome="Concorrente", flag="A"))
+    marco = (alvo.versao, alvo.id)
+    antes = await PessoaRepository(async_session).count()
+    base = random.randrange(10**10, 10**11 - 100)
+    no_meio, continua = asyncio.Event(), asyncio.Event()
+
+    async with Factory() as bulk_session, Factory() as put_session:
+        bulk = PessoaRepository(bulk_session)
+        execute_upsert = bulk._execute_upsert
+
+        async def pausa_no_meio(*args):
+            rows = await execute_upsert(*args)
+            no_meio.set()
+            await continua.wait()
+            return rows
+
+        # lote parado no meio da transação, depois do primeiro bloco
+        bulk._execute_upsert = pausa_no_meio
+        lote = asyncio.create_task(bulk.bulk_upsert(
+            [Pessoa(nome=f"Lote Concorrente {i}", cpf=str(base + i), flag="A") for i in range(100)],
+            conflict_key="cpf",
+            batch_size=50,
+        ))
+        await asyncio.wait_for(no_meio.wait(), 5)
+        try:
+            # as escritas de outras pessoas não esperam pelo lote
+            put = PessoaRepository(put_session)
+            await asyncio.wait_for(put.update_fields(alvo.id, {"flag": "B"}), 5)
+            criada = await asyncio.wait_for(put.create(Pessoa(nome="Concorrente 2", flag="A")), 5)
+            # o feed segura as versões posteriores ao lote ainda aberto
+            assert await PessoaRepository(async_session).list_changes(after=marco) == []
+        finally:
+            continua.set()
+            await lote
+
+    changes = await PessoaRepository(async_session).list_changes(after=marco)
+    ids = [pessoa_id for _, pessoa_id, _ in changes]
+    assert len(ids) == 102 and ids[-2:] == [alvo.id, criada.id]
+    assert await PessoaRepository(async_session).count() == antes + 101
+
+@pytest.mark.asyncio
+async def test_bulk_upsert_retries_cpf_inserted_concurrently(async_session, async_engine, monkeypatch):
+    if async_engine.dialect.name != "postgresql":
+        pytest.skip("SQLite tem um escritor por vez")
+    Factory = sessionmaker(bind=async_engine, class_=AsyncSession, expire_on_commit=False)
+    service = PessoaService(async_session)
+    cpf = f"{random.randrange(10**10, 10**11)}"
+    antes = await service.get_stats(dias=1)
+    current_by_cpf = PessoaRepository._current_by_cpf
+
+    async def insert_after_read(self, chunk):
+        old = await current_by_cpf(self, chunk)
+        if not old:
+            # outra transação cria o CPF entre a leitura e o upsert
+            async with Factory() as other:
+                await asyncio.wait_for(
+                    PessoaRepository(other).create(Pessoa(nome="Corrida", cpf=cpf, flag="X")), 5
+                )
+        return old
+
+    monkeypatch.setattr(PessoaRepository, "_current_by_cpf", insert_after_read)
+    results = await service.bulk_upsert([{"nome": "Corrida 2", "cpf": cpf, "flag": "Z"}], conflict_key="cpf")
+    assert results[0]["status"] == "updated"
+    depois = await service.get_stats(dias=1)
+    assert depois["total"] == antes["total"] + 1
+    assert depois["por_flag"].get("X", 0) == antes["por_flag"].get("X", 0)
+    assert depois["por_flag"]["Z"] == antes["por_flag"].get("Z", 0) + 1
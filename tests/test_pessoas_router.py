@@ -0,0 +1,84 @@
+# tests/test_pessoas_router.py
+
+import time
+
+import httpx
+import jwt
+import pytest
+import pytest_asyncio
+
+from src.infrastructure.admission import AdmissionSlot
+from src.infrastructure.auth import jwt_utils
+from src.infrastructure.settings import Settings
+from src.main import create_app
+
+SECRET = "segredo-de-teste"
+
+@pytest_asyncio.fixture
+async def client(test_database_url):
+    app = create_app(Settings(
+        database_url=test_database_url,
+        database_create_schema=True,
+        jwt_secret=SECRET,
+        database_pool_prewarm=0,
+        mcp_enabled=False,
+        import_worker_enabled=False,
+    ))
+    payload = {"id": 11, "email": "rotas@b.com", "isSuperUser": False, "exp": int(time.time()) + 60}
+    headers = {"Authorization": "Bearer " + jwt.encode(payload, SECRET, algorithm=jwt_utils.ALGORITHM)}
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test", headers=headers) as client:
+            yield client
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("params", [{"limit": -1}, {"limit": 0}, {"limit": 100000}, {"skip": -1}])
+async def test_list_rejects_out_of_range_pagination(client, params):
+    assert (await client.get("/pessoas/", params=params)).status_code == 422
+
+@pytest.mark.asyncio
+async def test_export_releases_admission_slot_after_stream(client, monkeypatch):
+    liberadas = []
+    monkeypatch.setattr(AdmissionSlot, "release", lambda self: liberadas.append(self.detached))
+    response = await client.get("/pessoas/export", params={"format": "csv"})
+    assert response.status_code == 200
+    # uma vaga só, tomada pela resposta e devolvida no fim do envio
+    assert liberadas == [True]
+
+@pytest.mark.asyncio
+async def test_batch_reports_missing_fields_per_operation(client):
+    response = await client.post("/pessoas/batch", json={"operations": [
+        {"op": "create"},
+        {"op": "create", "data": {"celular": "11999999999"}},
+        {"op": "update", "id": 1},
+        {"op": "get_by_cpf"},
+        {"op": "create", "data": {"nome": "Batch Válida"}},
+    ]})
+    assert response.status_code == 200
+    results = response.json()
+    assert [r["status"] for r in results] == [400, 400, 400, 400, 201]
+    assert results[0]["erro"] == "Informe os dados da pessoa (data.nome)."
+    assert results[2]["erro"] == "Informe os campos a alterar (data)."
+    assert results[3]["erro"] == "Informe o CPF."
+
+@pytest.mark.asyncio
+async def test_bulk_rejects_invalid_items_individually(client):
+    response = await client.post("/pessoas/bulk", json=[
+        {"nome": "Bulk Válida"},
+        {"nome": ""},
+        {"nome": "Bulk Data", "data_nascimento": "ontem"},
+        {"celular": "11999999999"},
+        {"nome": "Bulk Válida 2"},
+    ])
+    assert response.status_code == 200
+    results = response.json()
+    assert [r["index"] for r in results] == list(range(5))
+    assert [r["status"] for r in results] == ["created", "rejected", "rejected", "rejected", "created"]
+    assert results[2]["motivo"].startswith("data_nascimento:")
+    assert results[3]["motivo"].startswith("nome:")
+
+@pytest.mark.asyncio
+async def test_bulk_limits_item_count(client, monkeypatch):
+    monkeypatch.setattr("src.presentation.pessoas_router.BULK_MAX_ITEMS", 2)
+    response = await client.post("/pessoas/bulk", json=[{"nome": f"Bulk {i}"} for i in range(3)])
+    assert response.status_code == 413
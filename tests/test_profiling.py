@@ -0,0 +1,98 @@
+# tests/test_profiling.py
+
+import asyncio
+import time
+
+import httpx
+import jwt
+import pytest
+import pytest_asyncio
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from src.infrastructure.auth import jwt_utils
+from src.infrastructure.observability.slow_queries import SlowQueryLog, parameters_shape, slow_query_log
+from src.infrastructure.settings import Settings
+from src.main import create_app
+
+SECRET = "segredo-de-teste"
+
+def _auth(superuser: bool) -> dict:
+    payload = {"id": 3, "email": "admin@b.com", "isSuperUser": superuser, "exp": int(time.time()) + 60}
+    return {"Authorization": "Bearer " + jwt.encode(payload, SECRET, algorithm=jwt_utils.ALGORITHM)}
+
+@pytest_asyncio.fixture
+async def client(test_database_url):
+    app = create_app(Settings(
+        database_url=test_database_url,
+        database_create_schema=True,
+        jwt_secret=SECRET,
+        database_pool_prewarm=0,
+        mcp_enabled=False,
+        import_worker_enabled=False,
+    ))
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            yield client
+
+def test_parameters_shape_hides_values():
+    assert parameters_shape(("12345678901", [1, 2, 3], None)) == ["str", "list[3]", "NoneType"]
+    assert parameters_shape({"cpf": "123"}) == {"cpf": "str"}
+    assert parameters_shape([{"a": 1}, {"a": 2}], executemany=True) == {"executemany": 2, "row": {"a": "int"}}
+
+@pytest.mark.asyncio
+async def test_profile_only_for_superusers(client):
+    criada = await client.post("/pessoas/", json={"nome": "Perfilada"}, headers=_auth(False))
+    pessoa_id = criada.json()["id"]
+
+    comum = await client.get(f"/pessoas/{pessoa_id}", params={"profile": "1"}, headers=_auth(False))
+    assert comum.json()["nome"] == "Perfilada"
+
+    perfil = await client.get(f"/pessoas/{pessoa_id}", headers={**_auth(True), "X-Profile": "1"})
+    assert perfil.status_code == 200
+    report = perfil.json()
+    assert report["route"] == "/pessoas/{pessoa_id}" and report["status"] == 200
+    # a leitura anterior deixou a pessoa no cache: nenhum SQL
+    assert report["sql"]["queries"] == 0 and report["duration_ms"] > 0
+    assert {"samples", "functions_self", "functions_total", "stacks"} <= report.keys()
+
+    await client.delete(f"/pessoas/{pessoa_id}", headers=_auth(False))
+
+@pytest.mark.asyncio
+async def test_slow_queries_are_captured_with_plan(client, monkeypatch):
+    # qualquer comando conta como lento
+    monkeypatch.setattr(slow_query_log, "threshold_ms", 1e-9)
+    monkeypatch.setattr(slow_query_log, "explain_interval", 0)
+    slow_query_log.clear()
+
+    await client.get("/pessoas/by-cpf/98765432199", headers=_auth(False))
+    if slow_query_log._explain_task is not None:
+        await slow_query_log._explain_task
+    monkeypatch.setattr(slow_query_log, "threshold_ms", 0)
+
+    assert (await client.get("/admin/slow-queries", headers=_auth(False))).status_code == 403
+    entries = (await client.get("/admin/slow-queries", headers=_auth(True))).json()["entries"]
+    entry = next(e for e in entries if "FROM pessoas" in e["statement"] and "cpf" in e["statement"])
+    assert entry["route"] == "/pessoas/by-cpf/{cpf}"
+    assert "98765432199" not in str(entry["parameters"])
+    assert entry["plan"]
+
+    assert (await client.delete("/admin/slow-queries", headers=_auth(True))).status_code == 204
+    assert (await client.get("/admin/slow-queries", headers=_auth(True))).json()["entries"] == []
+
+@pytest.mark.asyncio
+async def test_explain_skips_single_connection_engine():
+    # SQLite em memória: o EXPLAIN usaria a conexão da própria transação
+    engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+    log = SlowQueryLog(threshold_ms=1e-9, explain_interval=0)
+    log.watch(engine, "primary")
+    async with engine.connect() as conn:
+        await conn.exec_driver_sql("CREATE TABLE t (x INTEGER)")
+        await conn.exec_driver_sql("INSERT INTO t VALUES (1)")
+        await asyncio.sleep(0.01)
+        await conn.commit()
+        assert (await conn.exec_driver_sql("SELECT count(*) FROM t")).scalar() == 1
+    assert log._explain_task is None
+    assert all(e["plan_error"] for e in log.entries())
+    await engine.dispose()
@@ -0,0 +1,34 @@
+# tests/test_serialization.py
+
+from datetime import date, datetime
+from typing import List
+
+import pytest
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+
+from src.core.pessoas.model import PessoaModel
+from src.presentation.schemas.pessoas import PessoaRead
+from src.presentation.serialization import render_pessoa, render_pessoas
+
+def _pessoas():
+    return [
+        PessoaModel(
+            id=1, nome="João Ávila", celular="11987654321", cpf="12345678900",
+            data_nascimento=date(1990, 5, 17), flag="C",
+            created_at=datetime(2025, 6, 17, 10, 30, 0, 123456),
+        ),
+        PessoaModel(id=2, nome="Ana", created_at=datetime(2025, 6, 17)),
+    ]
+
+@pytest.mark.asyncio
+async def test_fast_path_matches_fastapi_wire_format():
+    # caminho padrão: response_model + jsonable_encoder + JSONResponse
+    field = create_model_field(name="Response", type_=List[PessoaRead], mode="serialization")
+    content = await serialize_response(field=field, response_content=_pessoas())
+    assert render_pessoas(_pessoas()) == JSONResponse(content).body
+
+    field = create_model_field(name="Response", type_=PessoaRead, mode="serialization")
+    content = await serialize_response(field=field, response_content=_pessoas()[0])
+    assert render_pessoa(_pessoas()[0]) == JSONResponse(content).body
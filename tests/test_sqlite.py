@@ -0,0 +1,65 @@
+# tests/test_sqlite.py
+
+import time
+
+import httpx
+import jwt
+import pytest
+
+from src.infrastructure.auth import jwt_utils
+from src.infrastructure.db import session as db_session
+from src.infrastructure.settings import Settings
+from src.main import create_app
+
+SECRET = "segredo-de-teste"
+
+def _auth() -> dict:
+    payload = {"id": 7, "email": "sqlite@b.com", "isSuperUser": False, "exp": int(time.time()) + 60}
+    return {"Authorization": "Bearer " + jwt.encode(payload, SECRET, algorithm=jwt_utils.ALGORITHM)}
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("memory", [True, False])
+async def test_app_runs_on_sqlite(tmp_path, memory):
+    url = "sqlite+aiosqlite://" if memory else f"sqlite:///{tmp_path / 'financeiro.db'}"
+    app = create_app(Settings(
+        database_url=url,
+        database_create_schema=True,
+        jwt_secret=SECRET,
+        mcp_enabled=False,
+        import_worker_enabled=False,
+    ))
+    async with app.router.lifespan_context(app):
+        async with db_session.get_engine().connect() as conn:
+            journal = (await conn.exec_driver_sql("PRAGMA journal_mode")).scalar()
+        assert journal == ("memory" if memory else "wal")
+
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test", headers=_auth()) as client:
+            criada = await client.post("/pessoas/", json={"nome": "Ana Souza", "cpf": "123.456.789-01", "flag": "A"})
+            assert criada.status_code == 201
+            ana = criada.json()
+            assert ana["cpf"] == "12345678901"
+            assert (await client.post("/pessoas/", json={"nome": "Outra", "cpf": "12345678901"})).status_code == 400
+
+            # upsert: a existente é atualizada, a nova é criada
+            bulk = await client.post(
+                "/pessoas/bulk",
+                params={"on_conflict": "cpf"},
+                json=[{"nome": "Ana Souza", "cpf": "12345678901", "flag": "B"}, {"nome": "Bruno", "cpf": "98765432100"}],
+            )
+            assert [r["status"] for r in bulk.json()] == ["updated", "created"]
+            bruno_id = bulk.json()[1]["id"]
+
+            lidas = await client.post("/pessoas/batch-get", json={"ids": [bruno_id, ana["id"], 999]})
+            assert [item["found"] for item in lidas.json()] == [True, True, False]
+            assert (await client.get("/pessoas/search", params={"q": "ana"})).json()[0]["id"] == ana["id"]
+
+            stats = (await client.get("/pessoas/stats")).json()
+            assert stats["total"] == 2 and stats["por_flag"] == {"B": 1, "sem_flag": 1}
+
+            # ids não são reaproveitados depois de uma remoção
+            assert (await client.delete(f"/pessoas/{bruno_id}")).status_code == 204
+            nova = await client.post("/pessoas/", json={"nome": "Carla"})
+            assert nova.json()["id"] > bruno_id
+            changes = (await client.get("/pessoas/changes")).json()
+            assert {"op": "delete", "id": bruno_id, "pessoa": None} in changes["changes"]